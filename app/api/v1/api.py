@@ -1,5 +1,5 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import users, health, contests, otp, league_joins
+from app.api.v1.endpoints import users, health, contests, otp, league_joins, admin, batch
 
 api_router = APIRouter()
 
@@ -8,4 +8,6 @@ api_router.include_router(health.router, prefix="/health", tags=["health"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(contests.router, prefix="/contests", tags=["contests"])
 api_router.include_router(otp.router, prefix="/otp", tags=["otp"])
-api_router.include_router(league_joins.router, prefix="/league-joins", tags=["league_joins"]) 
\ No newline at end of file
+api_router.include_router(league_joins.router, prefix="/league-joins", tags=["league_joins"]) 
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(batch.router, prefix="/batch", tags=["batch"])
\ No newline at end of file
@@ -0,0 +1,68 @@
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import settings
+from app.core.dependencies import require_admin
+from app.core.profiler import ProfilerBusyError, ProfilerDisabledError, profiler_controller
+from app.core.slow_query_log import slow_query_log
+from app.core.timing import TimedRoute
+from app.schemas.admin import SlowQueryLogResponse
+
+router = APIRouter(route_class=TimedRoute, dependencies=[Depends(require_admin)])
+
+
+@router.get("/slow-queries", response_model=SlowQueryLogResponse)
+async def get_slow_queries(limit: int = Query(50, ge=1, le=1000)):
+    """Recent statements slower than the slow-query threshold"""
+    return SlowQueryLogResponse(
+        enabled=slow_query_log.enabled,
+        threshold_ms=settings.SLOW_QUERY_THRESHOLD_MS,
+        trace_sample_rate=settings.SLOW_QUERY_TRACE_SAMPLE_RATE,
+        records=slow_query_log.recent(limit)
+    )
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def clear_slow_queries():
+    """Clear the in-memory slow-query buffer (the log file is kept)"""
+    slow_query_log.clear()
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile_worker(seconds: float = Query(10.0, gt=0)):
+    """Sample this worker's event loop for N seconds; returns collapsed stacks"""
+    if seconds > settings.PROFILER_MAX_SECONDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"seconds must not exceed {settings.PROFILER_MAX_SECONDS}"
+        )
+    try:
+        profiler = profiler_controller.begin()
+    except ProfilerDisabledError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        profiler_controller.end(profiler)
+    return PlainTextResponse(
+        profiler.collapsed(),
+        headers={"X-Profile-Samples": str(profiler.samples), "X-Profile-Truncated": str(profiler.truncated)}
+    )
+
+
+@router.delete("/profile", status_code=status.HTTP_204_NO_CONTENT)
+async def kill_profile():
+    """Stop a running profile in this worker"""
+    profiler_controller.kill()
+
+
+@router.get("/profile/requests/{profile_id}", response_class=PlainTextResponse)
+async def get_request_profile(profile_id: str):
+    """Collapsed stacks recorded for a request sent with the X-Profile header"""
+    result = profiler_controller.get(profile_id)
+    if not result:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(result["collapsed"], headers={"X-Profile-Samples": str(result["samples"])})
@@ -0,0 +1,26 @@
+from fastapi import APIRouter, HTTPException, Request, status
+
+from app.core.batch import BatchError, is_sub_request, run_batch
+from app.core.timing import TimedRoute
+from app.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter(route_class=TimedRoute)
+
+
+@router.post("", response_model=BatchResponse)
+async def run_batch_requests(batch: BatchRequest, request: Request):
+    """Run several API calls in one request; see app.core.batch for references"""
+    if is_sub_request(request.scope):
+        # However the path was spelled, a batch never runs another batch
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Batches cannot be nested"
+        )
+    try:
+        responses = await run_batch(request.app, request.scope, batch.requests)
+    except BatchError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    return {"responses": responses}
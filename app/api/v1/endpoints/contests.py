@@ -1,44 +1,52 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import List, Optional, Tuple
 
 from app.services.contest_service import ContestService
 from app.schemas.contest import ContestCreate, ContestResponse, ContestUpdate
-from app.core.dependencies import get_contest_service
+from app.core.dependencies import field_selection, get_contest_service
+from app.core.responses import rows_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[ContestResponse])
 async def get_contests(
     limit: int = 100,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(ContestResponse)),
+    if_none_match: Optional[str] = Header(None),
     contest_service: ContestService = Depends(get_contest_service)
 ):
     """Get all contests with pagination"""
-    return await contest_service.get_contests(limit=limit)
+    return rows_response(ContestResponse, await contest_service.get_contests(limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/active", response_model=List[ContestResponse])
 async def get_active_contests(
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(ContestResponse)),
+    if_none_match: Optional[str] = Header(None),
     contest_service: ContestService = Depends(get_contest_service)
 ):
     """Get active contests"""
-    return await contest_service.get_active_contests(limit=limit)
+    return rows_response(ContestResponse, await contest_service.get_active_contests(limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/{contest_id}", response_model=ContestResponse)
 async def get_contest(
     contest_id: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(ContestResponse)),
+    if_none_match: Optional[str] = Header(None),
     contest_service: ContestService = Depends(get_contest_service)
 ):
     """Get a specific contest by ID"""
-    contest = await contest_service.get_contest_by_id(contest_id)
+    contest = await contest_service.get_contest_by_id(contest_id, fields=fields)
     if not contest:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Contest not found"
         )
-    return contest
+    return rows_response(ContestResponse, contest, fields=fields, if_none_match=if_none_match)
 
 
 @router.post("/", response_model=ContestResponse, status_code=status.HTTP_201_CREATED)
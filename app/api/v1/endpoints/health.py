@@ -1,8 +1,11 @@
-from fastapi import APIRouter, Depends
+from datetime import datetime
+from fastapi import APIRouter, Depends, Response, status
+from app.core.query_metrics import query_metrics
 from app.services.health_service import HealthService
-from app.schemas.health import HealthResponse, DetailedHealthResponse
+from app.schemas.health import HealthResponse, DetailedHealthResponse, QueryMetricsResponse
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=HealthResponse)
@@ -14,7 +17,18 @@ async def health_check():
 
 @router.get("/detailed", response_model=DetailedHealthResponse)
 async def detailed_health_check(
+    response: Response,
     health_service: HealthService = Depends(HealthService)
 ):
-    """Detailed health check with system information"""
-    return await health_service.get_detailed_health() 
\ No newline at end of file
+    """Detailed health check with system information (served from cached probes)"""
+    health = await health_service.get_detailed_health()
+    if health.status == "unhealthy":
+        # Lets the load balancer stop routing to a worker whose database pool is dead
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return health
+
+
+@router.get("/queries", response_model=QueryMetricsResponse)
+async def query_metrics_snapshot():
+    """Cassandra query statistics per repository operation"""
+    return QueryMetricsResponse(timestamp=datetime.utcnow(), operations=query_metrics.snapshot())
\ No newline at end of file
@@ -1,30 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import List, Optional, Tuple
 
 from app.services.league_join_service import LeagueJoinService
 from app.schemas.league_join import LeagueJoinCreate, LeagueJoinResponse, LeagueJoinUpdate
-from app.core.dependencies import get_league_join_service
+from app.core.dependencies import field_selection, get_league_join_service
+from app.core.responses import rows_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[LeagueJoinResponse])
 async def get_league_joins(
     limit: int = 100,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get all league joins with pagination"""
-    return await league_join_service.get_league_joins(limit=limit)
+    return rows_response(LeagueJoinResponse, await league_join_service.get_league_joins(limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/league/{league_id}", response_model=List[LeagueJoinResponse])
 async def get_league_joins_by_league_id(
     league_id: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get all joins for a specific league"""
-    return await league_join_service.get_league_joins_by_league_id(league_id, limit=limit)
+    return rows_response(LeagueJoinResponse, await league_join_service.get_league_joins_by_league_id(league_id, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/league/{league_id}/status/{status}", response_model=List[LeagueJoinResponse])
@@ -32,46 +38,54 @@ async def get_league_joins_by_status(
     league_id: str,
     status: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get league joins by status for a specific league"""
-    return await league_join_service.get_league_joins_by_status(league_id, status, limit=limit)
+    return rows_response(LeagueJoinResponse, await league_join_service.get_league_joins_by_status(league_id, status, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/user/{user_id}", response_model=List[LeagueJoinResponse])
 async def get_user_league_joins(
     user_id: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get all league joins for a specific user"""
-    return await league_join_service.get_user_league_joins(user_id, limit=limit)
+    return rows_response(LeagueJoinResponse, await league_join_service.get_user_league_joins(user_id, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/invite-code/{invite_code}", response_model=List[LeagueJoinResponse])
 async def get_league_joins_by_invite_code(
     invite_code: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get league joins by invite code"""
-    return await league_join_service.get_league_joins_by_invite_code(invite_code, limit=limit)
+    return rows_response(LeagueJoinResponse, await league_join_service.get_league_joins_by_invite_code(invite_code, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/league/{league_id}/user/{user_id}", response_model=LeagueJoinResponse)
 async def get_league_join_by_user_and_league(
     league_id: str,
     user_id: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(LeagueJoinResponse)),
+    if_none_match: Optional[str] = Header(None),
     league_join_service: LeagueJoinService = Depends(get_league_join_service)
 ):
     """Get specific league join by user and league"""
-    join = await league_join_service.get_league_join_by_user_and_league(user_id, league_id)
+    join = await league_join_service.get_league_join_by_user_and_league(user_id, league_id, fields=fields)
     if not join:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="League join not found"
         )
-    return join
+    return rows_response(LeagueJoinResponse, join, fields=fields, if_none_match=if_none_match)
 
 
 @router.post("/", response_model=LeagueJoinResponse, status_code=status.HTTP_201_CREATED)
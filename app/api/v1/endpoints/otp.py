@@ -1,56 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import List, Optional, Tuple
 
 from app.services.otp_service import OTPService
 from app.schemas.otp import OTPCreate, OTPResponse, OTPUpdate, OTPVerify
-from app.core.dependencies import get_otp_service
+from app.core.dependencies import field_selection, get_otp_service
+from app.core.responses import rows_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/phone-email/{phone_or_email}", response_model=List[OTPResponse])
 async def get_otps_by_phone_email(
     phone_or_email: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(OTPResponse)),
+    if_none_match: Optional[str] = Header(None),
     otp_service: OTPService = Depends(get_otp_service)
 ):
     """Get all OTPs for a phone/email"""
-    return await otp_service.get_otps_by_phone_email(phone_or_email, limit=limit)
+    return rows_response(OTPResponse, await otp_service.get_otps_by_phone_email(phone_or_email, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/purpose/{purpose}", response_model=List[OTPResponse])
 async def get_otps_by_purpose(
     purpose: str,
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(OTPResponse)),
+    if_none_match: Optional[str] = Header(None),
     otp_service: OTPService = Depends(get_otp_service)
 ):
     """Get all OTPs by purpose"""
-    return await otp_service.get_otps_by_purpose(purpose, limit=limit)
+    return rows_response(OTPResponse, await otp_service.get_otps_by_purpose(purpose, limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/verified", response_model=List[OTPResponse])
 async def get_verified_otps(
     limit: int = 50,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(OTPResponse)),
+    if_none_match: Optional[str] = Header(None),
     otp_service: OTPService = Depends(get_otp_service)
 ):
     """Get all verified OTPs"""
-    return await otp_service.get_verified_otps(limit=limit)
+    return rows_response(OTPResponse, await otp_service.get_verified_otps(limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/{phone_or_email}/{purpose}", response_model=OTPResponse)
 async def get_otp_by_phone_email_and_purpose(
     phone_or_email: str,
     purpose: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(OTPResponse)),
+    if_none_match: Optional[str] = Header(None),
     otp_service: OTPService = Depends(get_otp_service)
 ):
     """Get OTP by phone/email and purpose"""
-    otp = await otp_service.get_otp_by_phone_email_and_purpose(phone_or_email, purpose)
+    otp = await otp_service.get_otp_by_phone_email_and_purpose(phone_or_email, purpose, fields=fields)
     if not otp:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="OTP not found"
         )
-    return otp
+    return rows_response(OTPResponse, otp, fields=fields, if_none_match=if_none_match)
 
 
 @router.post("/", response_model=OTPResponse, status_code=status.HTTP_201_CREATED)
@@ -1,65 +1,75 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from typing import List, Optional, Tuple
 
 from app.services.user_service import UserService
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.core.dependencies import get_user_service
+from app.core.dependencies import field_selection, get_user_service
+from app.core.responses import rows_response
+from app.core.timing import TimedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=TimedRoute)
 
 
 @router.get("/", response_model=List[UserResponse])
 async def get_users(
     limit: int = 100,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(UserResponse)),
+    if_none_match: Optional[str] = Header(None),
     user_service: UserService = Depends(get_user_service)
 ):
     """Get all users with pagination"""
-    return await user_service.get_users(limit=limit)
+    return rows_response(UserResponse, await user_service.get_users(limit=limit, fields=fields), fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(UserResponse)),
+    if_none_match: Optional[str] = Header(None),
     user_service: UserService = Depends(get_user_service)
 ):
     """Get a specific user by ID"""
-    user = await user_service.get_user_by_id(user_id)
+    user = await user_service.get_user_by_id(user_id, fields=fields)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    return rows_response(UserResponse, user, fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/mobile/{mobile_no}", response_model=UserResponse)
 async def get_user_by_mobile(
     mobile_no: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(UserResponse)),
+    if_none_match: Optional[str] = Header(None),
     user_service: UserService = Depends(get_user_service)
 ):
     """Get a specific user by mobile number"""
-    user = await user_service.get_user_by_mobile(mobile_no)
+    user = await user_service.get_user_by_mobile(mobile_no, fields=fields)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    return rows_response(UserResponse, user, fields=fields, if_none_match=if_none_match)
 
 
 @router.get("/email/{email}", response_model=UserResponse)
 async def get_user_by_email(
     email: str,
+    fields: Optional[Tuple[str, ...]] = Depends(field_selection(UserResponse)),
+    if_none_match: Optional[str] = Header(None),
     user_service: UserService = Depends(get_user_service)
 ):
     """Get a specific user by email"""
-    user = await user_service.get_user_by_email(email)
+    user = await user_service.get_user_by_email(email, fields=fields)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    return user
+    return rows_response(UserResponse, user, fields=fields, if_none_match=if_none_match)
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
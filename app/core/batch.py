@@ -0,0 +1,241 @@
+"""
+In-process batch dispatch
+
+Each sub-request of POST /api/v1/batch is run through the application's own
+ASGI stack (middleware, routers, dependencies) without a network hop, at
+most BATCH_MAX_CONCURRENCY at a time per batch. A sub-request may reference
+the result of an earlier one with ${<id>.status} or ${<id>.body.<field>...}
+in its path, headers or body; it waits for those and the rest run
+concurrently. A reference that stands alone as a JSON string keeps the
+referenced value's type. When a referenced sub-request failed (status >= 400)
+the dependent one is not run and gets 424.
+"""
+import asyncio
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set, Tuple
+from urllib.parse import quote, unquote
+from starlette.types import ASGIApp, Message, Scope
+from app.core.config import settings
+from app.core.responses import dumps
+from app.schemas.batch import SubRequest
+
+logger = logging.getLogger(__name__)
+
+REFERENCE = re.compile(r"\$\{([A-Za-z0-9_\-]+)((?:\.[A-Za-z0-9_\-]+)*)\}")
+METHODS = {"GET", "POST", "PUT", "PATCH", "DELETE"}
+# Characters left as they are when a sub-request's path or query is percent-encoded
+_PATH_SAFE = "/%:@!$&'()*+,;=-._~"
+_QUERY_SAFE = _PATH_SAFE + "?"
+# Key set in a sub-request's scope["state"]; the batch endpoint refuses requests carrying it
+SUB_REQUEST_STATE = "batch_sub_request"
+# Parent headers that describe the batch request itself, not a sub-request
+_DROPPED_HEADERS = {
+    b"content-length", b"content-type", b"transfer-encoding", b"accept-encoding",
+    b"idempotency-key", b"x-profile", b"if-none-match", b"if-match",
+}
+
+
+class BatchError(ValueError):
+    """Raised for a batch that cannot be run as a whole"""
+
+
+class UnresolvedReference(LookupError):
+    """Raised when a reference names a value the earlier result does not have"""
+
+
+def batch_path() -> str:
+    """Path of the batch endpoint, which sub-requests may not call"""
+    return f"{settings.API_V1_STR}/batch"
+
+
+def is_sub_request(scope: Scope) -> bool:
+    """Whether a request was dispatched from inside a batch"""
+    return bool(scope.get("state", {}).get(SUB_REQUEST_STATE))
+
+
+def normalize_path(path: str) -> str:
+    """Path as routing will see it: decoded, without the query and repeated or trailing slashes"""
+    return re.sub(r"/{2,}", "/", unquote(path.partition("?")[0])).rstrip("/")
+
+
+def find_references(value: Any) -> Set[str]:
+    """IDs of the sub-requests a path, header or body refers to"""
+    if isinstance(value, str):
+        return {match.group(1) for match in REFERENCE.finditer(value)}
+    if isinstance(value, dict):
+        return set().union(*(find_references(item) for item in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(find_references(item) for item in value)) if value else set()
+    return set()
+
+
+def _lookup(results: Dict[str, dict], request_id: str, fields: str) -> Any:
+    value: Any = results[request_id]
+    for field in fields.split(".")[1:]:
+        try:
+            value = value[int(field)] if isinstance(value, list) else value[field]
+        except (KeyError, IndexError, TypeError, ValueError):
+            raise UnresolvedReference(f"${{{request_id}{fields}}}")
+    return value
+
+
+def resolve_references(value: Any, results: Dict[str, dict], in_path: bool = False) -> Any:
+    """Substitute references to earlier results into a path, header or body"""
+    if isinstance(value, str):
+        whole = REFERENCE.fullmatch(value)
+        if whole and not in_path:
+            return _lookup(results, whole.group(1), whole.group(2))
+
+        def substitute(match: re.Match) -> str:
+            found = _lookup(results, match.group(1), match.group(2))
+            text = found if isinstance(found, str) else json.dumps(found)
+            return quote(text, safe="") if in_path else text
+
+        return REFERENCE.sub(substitute, value)
+    if isinstance(value, dict):
+        return {key: resolve_references(item, results, in_path) for key, item in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(item, results, in_path) for item in value]
+    return value
+
+
+def validate_batch(requests: List[SubRequest]):
+    """Reject batches that are too large, reuse IDs or reference later requests"""
+    if len(requests) > settings.BATCH_MAX_REQUESTS:
+        raise BatchError(f"A batch may contain at most {settings.BATCH_MAX_REQUESTS} requests")
+    seen: Set[str] = set()
+    for sub in requests:
+        if sub.id in seen:
+            raise BatchError(f"Duplicate request id: {sub.id}")
+        if sub.method.upper() not in METHODS:
+            raise BatchError(f"Unsupported method for {sub.id}: {sub.method}")
+        if not sub.path.startswith("/"):
+            raise BatchError(f"Path for {sub.id} must start with /")
+        unknown = find_references([sub.path, sub.headers, sub.body]) - seen
+        if unknown:
+            raise BatchError(f"{sub.id} references {', '.join(sorted(unknown))}, which is not an earlier request")
+        seen.add(sub.id)
+
+
+async def dispatch(
+    app: ASGIApp,
+    parent: Scope,
+    method: str,
+    path: str,
+    body: Any = None,
+    headers: Optional[Dict[str, str]] = None
+) -> Tuple[int, Any]:
+    """Run one request through the ASGI app and return its status and decoded body"""
+    path, _, query = path.partition("?")
+    raw_body = b"" if body is None else dumps(body)
+    request_headers = [(name, value) for name, value in parent.get("headers", []) if name not in _DROPPED_HEADERS]
+    extra = {name.lower(): value for name, value in (headers or {}).items()}
+    request_headers = [(name, value) for name, value in request_headers if name.decode("latin-1") not in extra]
+    request_headers += [(name.encode("latin-1"), value.encode("latin-1")) for name, value in extra.items()]
+    if body is not None:
+        request_headers.append((b"content-type", b"application/json"))
+    request_headers.append((b"content-length", str(len(raw_body)).encode("latin-1")))
+
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": method.upper(),
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": unquote(path),
+        # Non-ASCII characters are sent percent-encoded, as a client would
+        "raw_path": quote(path, safe=_PATH_SAFE).encode("ascii"),
+        "query_string": quote(query, safe=_QUERY_SAFE).encode("ascii"),
+        "headers": request_headers,
+    }
+    scope["state"] = dict(parent.get("state", {}))
+    scope["state"][SUB_REQUEST_STATE] = True
+
+    finished = asyncio.Event()
+    body_sent = False
+
+    async def receive() -> Message:
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": raw_body, "more_body": False}
+        # Nothing more to read; the "client" goes away once the response is complete
+        await finished.wait()
+        return {"type": "http.disconnect"}
+
+    status_code = 500
+    content_type = b""
+    chunks: List[bytes] = []
+
+    async def send(message: Message):
+        nonlocal status_code, content_type
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+
+    try:
+        await app(scope, receive, send)
+    except Exception as e:
+        # The error middleware has already answered 500; keep the batch going
+        logger.error("Batch sub-request %s %s failed: %s", method, path, e)
+    finally:
+        finished.set()
+
+    raw = b"".join(chunks)
+    if not raw:
+        return status_code, None
+    if content_type.startswith(b"application/json"):
+        return status_code, json.loads(raw)
+    return status_code, raw.decode("utf-8", errors="replace")
+
+
+async def run_batch(app: ASGIApp, parent: Scope, requests: List[SubRequest]) -> List[Dict[str, Any]]:
+    """Run a validated batch; results come back in request order"""
+    validate_batch(requests)
+    semaphore = asyncio.Semaphore(settings.BATCH_MAX_CONCURRENCY)
+    tasks: Dict[str, asyncio.Task] = {}
+
+    async def run(sub: SubRequest) -> Dict[str, Any]:
+        # References only point backwards, so every awaited task already exists
+        results = {}
+        for request_id in sorted(find_references([sub.path, sub.headers, sub.body])):
+            results[request_id] = await tasks[request_id]
+        failed = sorted(request_id for request_id, result in results.items() if result["status"] >= 400)
+        if failed:
+            return {"id": sub.id, "status": 424, "body": {"detail": f"Depends on failed request(s): {', '.join(failed)}"}}
+        try:
+            path = resolve_references(sub.path, results, in_path=True)
+            headers = {
+                name: value if isinstance(value, str) else json.dumps(value)
+                for name, value in resolve_references(sub.headers, results).items()
+            }
+            body = resolve_references(sub.body, results)
+        except UnresolvedReference as e:
+            return {"id": sub.id, "status": 422, "body": {"detail": f"Unresolved reference {e}"}}
+        try:
+            for name, value in headers.items():
+                name.encode("latin-1")
+                value.encode("latin-1")
+        except UnicodeEncodeError:
+            return {"id": sub.id, "status": 400, "body": {"detail": "Header names and values must be latin-1"}}
+        if normalize_path(path) == batch_path():
+            return {"id": sub.id, "status": 400, "body": {"detail": "Batches cannot be nested"}}
+
+        async with semaphore:
+            status_code, content = await dispatch(app, parent, sub.method, path, body, headers)
+        return {"id": sub.id, "status": status_code, "body": content}
+
+    for sub in requests:
+        tasks[sub.id] = asyncio.ensure_future(run(sub))
+    try:
+        return list(await asyncio.gather(*tasks.values()))
+    finally:
+        for task in tasks.values():
+            task.cancel()
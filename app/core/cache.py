@@ -0,0 +1,95 @@
+"""
+In-process caches for small, hot, read-mostly data
+
+Each worker keeps its own copy, so a value can be up to its ttl stale after
+a write made by another worker; writes made through this worker invalidate
+it immediately.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable, Generic, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class RefreshingValue(Generic[T]):
+    """A value produced by an async loader and reused for ttl seconds
+
+    Concurrent callers share a single load.
+    """
+
+    def __init__(self, loader: Callable[[], Awaitable[T]], ttl: float):
+        self._loader = loader
+        self.ttl = ttl
+        self._value: Optional[T] = None
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the cached value may still be served"""
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    async def get(self) -> T:
+        """The cached value, loading it first when missing or expired"""
+        if not self.fresh:
+            async with self._lock:
+                if not self.fresh:
+                    await self._load()
+        return self._value
+
+    async def load(self) -> T:
+        """Load the value now, whether or not the cached one is fresh"""
+        async with self._lock:
+            await self._load()
+        return self._value
+
+    def invalidate(self):
+        """Force the next get() to reload"""
+        self._generation += 1
+        self._loaded_at = None
+
+    async def _load(self):
+        generation = self._generation
+        value = await self._loader()
+        self._value = value
+        # An invalidate() during the load means the value may already be stale
+        if generation == self._generation:
+            self._loaded_at = time.monotonic()
+
+
+class ExpiringLRU(Generic[T]):
+    """A bounded mapping whose entries expire ttl seconds after they are set"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, T]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[T]:
+        """The value for key, or None when missing or expired"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: T):
+        """Store value, evicting the least recently used entry when full"""
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def pop(self, key: str):
+        """Drop key if present"""
+        self._entries.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,162 @@
+"""
+Response content-coding
+
+gzip is always available; brotli ("br") and zstandard ("zstd") are used when
+their packages are installed. negotiate() picks the client's most preferred
+coding, breaking ties by COMPRESSION_ENCODINGS order. Streaming compressors
+flush after every chunk, so a streamed export reaches the client as it is
+produced rather than when the compressor's buffer fills.
+"""
+import gzip
+import importlib
+import zlib
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
+from app.core.config import settings
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+ZSTD_LEVEL = 3
+
+# Media types worth compressing; everything else (images, archives) already is
+COMPRESSIBLE_TYPES = ("application/json", "application/javascript", "application/xml", "image/svg+xml", "text/")
+
+# Every coding a variant ETag may name, installed here or not
+KNOWN_CODINGS = ("zstd", "br", "gzip")
+
+
+class Stream(ABC):
+    """Incremental compressor for one response"""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Compress a chunk and flush it, so the output can be sent right away"""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """End the compressed stream"""
+
+
+class GzipStream(Stream):
+    def __init__(self):
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliStream(Stream):
+    def __init__(self, brotli):
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class ZstdStream(Stream):
+    def __init__(self, zstandard):
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class Codec:
+    """A content-coding: one-shot compression and a streaming compressor factory"""
+
+    def __init__(self, name: str, compress: Callable[[bytes], bytes], stream: Callable[[], Stream]):
+        self.name = name
+        self.compress = compress
+        self.stream = stream
+
+
+def _optional_module(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=None)
+def available_codecs() -> Dict[str, Codec]:
+    """Codecs whose libraries are installed, imported on first use"""
+    # mtime=0 keeps the output identical for identical input
+    codecs = {"gzip": Codec("gzip", lambda data: gzip.compress(data, GZIP_LEVEL, mtime=0), GzipStream)}
+    brotli = _optional_module("brotli")
+    if brotli is not None:
+        codecs["br"] = Codec("br", lambda data: brotli.compress(data, quality=BROTLI_QUALITY), lambda: BrotliStream(brotli))
+    zstandard = _optional_module("zstandard")
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data: zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data),
+            lambda: ZstdStream(zstandard)
+        )
+    return codecs
+
+
+def parse_accept_encoding(header: str) -> List[Tuple[str, float]]:
+    """Codings and q-values from an Accept-Encoding header"""
+    accepted = []
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted.append((coding, quality))
+    return accepted
+
+
+def negotiate(accept_encoding: Optional[str]) -> Optional[Codec]:
+    """The codec to use for a request, or None to send the body as is"""
+    if not accept_encoding:
+        return None
+    accepted = dict(parse_accept_encoding(accept_encoding))
+    codecs = available_codecs()
+    best = None
+    best_quality = 0.0
+    for name in settings.COMPRESSION_ENCODINGS:
+        if name not in codecs:
+            continue
+        quality = accepted.get(name, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = codecs[name], quality
+    return best
+
+
+def is_compressible(content_type: str) -> bool:
+    """Whether a response of this media type is worth compressing"""
+    return content_type.lower().startswith(COMPRESSIBLE_TYPES)
+
+
+def variant_etag(etag: str, coding: str) -> str:
+    """ETag of the coding's variant of a representation, e.g. "abc" -> "abc-gzip" """
+    return f'{etag[:-1]}-{coding}"' if etag.endswith('"') else etag
+
+
+def base_etag(etag: str) -> str:
+    """ETag of the representation a variant's tag was made from"""
+    for coding in KNOWN_CODINGS:
+        suffix = f'-{coding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import os
 
 
@@ -15,7 +15,17 @@ class Settings(BaseSettings):
     # Server Configuration
     HOST: str = "0.0.0.0"
     PORT: int = 8000
-    RELOAD: bool = True
+    RELOAD: bool = True  # honoured only when ENVIRONMENT is development
+    ENVIRONMENT: str = "development"  # development or production
+
+    # Production launcher (python run.py --production)
+    WORKERS: Optional[int] = None  # default: one per available CPU
+    KEEP_ALIVE_SECONDS: int = 75  # keep above the load balancer's idle timeout
+    BACKLOG: int = 2048
+    LIMIT_MAX_REQUESTS: Optional[int] = 50000  # recycle a worker after this many requests
+    LIMIT_MAX_REQUESTS_JITTER: int = 5000  # random extra requests per worker
+    LIMIT_CONCURRENCY: Optional[int] = None  # per-worker connections before 503
+    TIMEOUT_GRACEFUL_SHUTDOWN_SECONDS: int = 30
     
     # Security
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -33,10 +43,131 @@ class Settings(BaseSettings):
     CASSANDRA_PASSWORD: str = "cassandra"
     CASSANDRA_KEYSPACE: str = "myapp"
     CASSANDRA_PORT: int = 9042
+    CASSANDRA_LOCAL_DC: str = "datacenter1"
+    CASSANDRA_PROTOCOL_VERSION: int = 5
+    CASSANDRA_CONNECT_TIMEOUT: float = 5.0
+    CASSANDRA_TOKEN_AWARE: bool = True
+    CASSANDRA_COMPRESSION: Optional[str] = "lz4"  # lz4, snappy, or empty to disable
+    # Pool sizing; the driver only honors these for protocol versions 1 and 2,
+    # v3+ multiplexes up to 32k streams over one connection per host and the
+    # connection logs a warning if any of them is set
+    CASSANDRA_CORE_CONNECTIONS_PER_HOST: int = 2
+    CASSANDRA_MAX_CONNECTIONS_PER_HOST: int = 8
+    CASSANDRA_MAX_REQUESTS_PER_CONNECTION: int = 100
+    # Named execution profiles; unspecified keys inherit from "default"
+    CASSANDRA_EXECUTION_PROFILES: Dict[str, Dict[str, Any]] = {
+        "default": {"request_timeout": 10.0, "consistency_level": "LOCAL_ONE"},
+        "fast_read": {
+            "request_timeout": 2.0,
+            "consistency_level": "LOCAL_ONE",
+            "speculative_delay": 0.05,
+            "speculative_attempts": 2,
+        },
+        # Conditional writes (idempotency claims, user lookups) run Paxos within the local DC
+        "durable_write": {
+            "request_timeout": 10.0,
+            "consistency_level": "LOCAL_QUORUM",
+            "serial_consistency_level": "LOCAL_SERIAL",
+        },
+        "bulk_scan": {"request_timeout": 60.0, "consistency_level": "LOCAL_ONE"},
+    }
+    # Consistency per repository operation ("<table>.<method>" or a glob such as "games.get_*"),
+    # overriding the execution profile's level; an exact key wins, then the longest pattern
+    CASSANDRA_CONSISTENCY_POLICY: Dict[str, str] = {
+        # Auth paths need read-your-writes against QUORUM writes
+        "otp_store.*": "LOCAL_QUORUM",
+        "sessions.*": "LOCAL_QUORUM",
+        "users.get_user_by_mobile": "LOCAL_QUORUM",
+        "users.get_user_by_email": "LOCAL_QUORUM",
+        # Catalog and admin list reads favour latency
+        "games.get_*": "LOCAL_ONE",
+        "users.get_all_users": "LOCAL_ONE",
+        "contests.get_all_contests": "LOCAL_ONE",
+        "league_joins.get_all_league_joins": "LOCAL_ONE",
+    }
+    
+    # Response encoding
+    JSON_ENCODER: str = "orjson"  # orjson or json (stdlib)
+    JSON_STREAM_MIN_ROWS: int = 1000  # larger lists are sent with chunked encoding
+    JSON_STREAM_CHUNK_ROWS: int = 500
+    FIELD_PROJECTION_MAX_STATEMENTS: int = 64  # distinct fields= column lists prepared per table
+
+    # Readiness: /ready flips once pools are open, statements prepared and caches loaded
+    READINESS_POOL_TIMEOUT_SECONDS: float = 10.0
+    READINESS_RETRY_SECONDS: float = 5.0
+
+    # In-process caches (per worker)
+    GAME_CATALOG_SIZE: int = 500  # active games kept in memory
+    GAME_CATALOG_TTL_SECONDS: float = 60.0
+    LIVE_CONTESTS_SIZE: int = 200
+    LIVE_CONTESTS_TTL_SECONDS: float = 5.0  # join/active counters may lag by this much
+
+    # POST /api/v1/batch
+    BATCH_MAX_REQUESTS: int = 50
+    BATCH_MAX_CONCURRENCY: int = 8  # sub-requests of one batch running at once
+
+    # Idempotency-Key support: "<METHOD> <path glob>" of the requests that honour the header
+    IDEMPOTENCY_ROUTES: List[str] = [
+        "POST /api/v1/contests/*/increment-join",
+        "POST /api/v1/league-joins/",
+        "POST /api/v1/otp/",
+    ]
+    IDEMPOTENCY_TTL_SECONDS: int = 86400  # how long a key's response is replayed
+    IDEMPOTENCY_LEASE_SECONDS: int = 60  # a claim not completed by then (crashed worker) expires
+    IDEMPOTENCY_CACHE_SIZE: int = 10000  # completed responses kept in memory per worker
+    IDEMPOTENCY_MAX_BODY_BYTES: int = 65536  # larger responses are not stored
+
+    # Response compression
+    COMPRESSION_ENCODINGS: List[str] = ["zstd", "br", "gzip"]  # preference order; uninstalled codecs are skipped
+    COMPRESSION_MIN_BYTES: int = 1024  # smaller bodies are sent uncompressed
+    COMPRESSION_CACHE_SIZE: int = 256  # compressed variants of ETagged responses kept per worker
+    COMPRESSION_CACHE_TTL_SECONDS: int = 300
+    COMPRESSION_CACHE_MAX_BYTES: int = 262144  # larger compressed bodies are not cached
+
+    # Typed timestamp migration (dual_write -> read_typed -> typed); advance only after the backfill
+    TIMESTAMP_MIGRATION_PHASE: str = "dual_write"
     
     # Logging
     LOG_LEVEL: str = "INFO"
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    LOG_JSON: bool = True  # structured JSON lines; LOG_FORMAT is used when false
+    LOG_QUEUE_SIZE: int = 10000  # records buffered for the writer thread before dropping
+    ACCESS_LOG_SAMPLE_RATE: float = 0.1  # fraction of 2xx/3xx access lines kept; errors are always kept
+    
+    # Slow-query log (statements over the threshold go to logs/slow_queries.log)
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_TRACE_SAMPLE_RATE: float = 0.01  # fraction of statements run with tracing
+    SLOW_QUERY_TRACE_WAIT_SECONDS: float = 2.0
+    SLOW_QUERY_BUFFER_SIZE: int = 200
+    
+    # Event-loop lag monitor; blocked-loop stacks go to logs/diagnostics.log
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_MS: float = 100.0
+    LOOP_BLOCK_THRESHOLD_MS: float = 100.0
+    
+    # Background health probes (database and external API)
+    HEALTH_PROBE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_PROBE_TIMEOUT_SECONDS: float = 2.0
+    HEALTH_PROBE_WINDOW: int = 120  # probe latencies kept for percentiles
+    HEALTH_PROBE_FAILURE_THRESHOLD: int = 3  # consecutive failures before unhealthy
+    
+    # Background system sampler (health reads the ring buffer only)
+    SYSTEM_SAMPLE_INTERVAL_SECONDS: float = 10.0
+    SYSTEM_SAMPLE_HISTORY: int = 60  # samples kept for trends
+    
+    # Sampling profiler (admin endpoint and X-Profile request header)
+    PROFILER_ENABLED: bool = True  # kill switch
+    PROFILER_INTERVAL_MS: float = 5.0
+    PROFILER_MAX_SECONDS: int = 60
+    PROFILER_MAX_STACKS: int = 5000  # distinct stacks kept per profile
+    PROFILER_KEEP_RESULTS: int = 20  # per-request profiles kept for retrieval
+    
+    # Admin API; endpoints are disabled unless a token is set (sent as X-Admin-Token)
+    ADMIN_API_TOKEN: Optional[str] = None
+    
+    # Metrics; set to a directory shared by all workers when running more than one
+    PROMETHEUS_MULTIPROC_DIR: Optional[str] = None
     
     # External Services
     EXTERNAL_API_URL: Optional[str] = None
@@ -1,80 +1,164 @@
+import asyncio
+import concurrent.futures
 import logging
-from cassandra.cluster import Cluster
+import os
+import threading
+from typing import Dict
+from cassandra.cluster import Cluster, ResultSet
 from cassandra.auth import PlainTextAuthProvider
-from cassandra.policies import DCAwareRoundRobinPolicy
-from cassandra.cqlengine import connection
+from cassandra.policies import HostDistance
+from cassandra.query import PreparedStatement
 from app.core.config import settings
+from app.core.execution_profiles import build_execution_profiles
+from app.migrations.runner import check_schema_version
 
 logger = logging.getLogger(__name__)
 
+POOL_SETTINGS = (
+    "CASSANDRA_CORE_CONNECTIONS_PER_HOST",
+    "CASSANDRA_MAX_CONNECTIONS_PER_HOST",
+    "CASSANDRA_MAX_REQUESTS_PER_CONNECTION",
+)
+
 
 class CassandraManager:
-    """Cassandra database connection manager"""
+    """Cassandra database connection manager
+
+    Owns the single Cluster/Session pair of the current process. Forked
+    workers never reuse a parent's connections: the owning pid is recorded
+    and a new cluster is built on first use in the child.
+    """
     
     def __init__(self):
         self.cluster = None
         self.session = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._cqlengine_registered = False
+        self._prepared: Dict[str, PreparedStatement] = {}
     
-    def connect(self):
+    def connect(self, use_keyspace: bool = True):
         """Connect to Cassandra cluster"""
-        try:
-            # Set up authentication
-            auth_provider = PlainTextAuthProvider(
-                username=settings.CASSANDRA_USERNAME,
-                password=settings.CASSANDRA_PASSWORD
-            )
-            
-            # Connect to the Cassandra cluster
-            self.cluster = Cluster(
-                [settings.CASSANDRA_HOST],
-                port=settings.CASSANDRA_PORT,
-                auth_provider=auth_provider,
-                load_balancing_policy=DCAwareRoundRobinPolicy(local_dc='datacenter1'),
-                protocol_version=5
-            )
-            
-            self.session = self.cluster.connect()
-            
-            # Create keyspace if not exists
-            self.session.execute(f"""
-                CREATE KEYSPACE IF NOT EXISTS {settings.CASSANDRA_KEYSPACE}
-                WITH REPLICATION = {{
-                    'class': 'SimpleStrategy',
-                    'replication_factor': 1
-                }}
-            """)
-            
-            # Use the keyspace
-            self.session.set_keyspace(settings.CASSANDRA_KEYSPACE)
-            
-            # Set up CQL engine connection
-            connection.setup(
-                [settings.CASSANDRA_HOST],
-                settings.CASSANDRA_KEYSPACE,
-                auth_provider=auth_provider,
-                load_balancing_policy=DCAwareRoundRobinPolicy(local_dc='datacenter1'),
-                protocol_version=5
-            )
-            
-            logger.info("Successfully connected to Cassandra cluster")
+        with self._lock:
+            if self.session is not None and self._pid == os.getpid():
+                if use_keyspace and self.session.keyspace != settings.CASSANDRA_KEYSPACE:
+                    self.session.set_keyspace(settings.CASSANDRA_KEYSPACE)
+                return self.session
             
-        except Exception as e:
-            logger.error(f"Failed to connect to Cassandra: {e}")
-            raise
+            try:
+                # Set up authentication
+                auth_provider = PlainTextAuthProvider(
+                    username=settings.CASSANDRA_USERNAME,
+                    password=settings.CASSANDRA_PASSWORD
+                )
+                
+                # Connect to the Cassandra cluster
+                self.cluster = Cluster(
+                    [settings.CASSANDRA_HOST],
+                    port=settings.CASSANDRA_PORT,
+                    auth_provider=auth_provider,
+                    execution_profiles=build_execution_profiles(),
+                    protocol_version=settings.CASSANDRA_PROTOCOL_VERSION,
+                    compression=settings.CASSANDRA_COMPRESSION or False,
+                    connect_timeout=settings.CASSANDRA_CONNECT_TIMEOUT
+                )
+                self._configure_pools()
+                
+                self.session = self.cluster.connect()
+                self._pid = os.getpid()
+                self._cqlengine_registered = False
+                self._prepared = {}
+                
+                # Use the keyspace (created by `python -m app.migrations upgrade`)
+                if use_keyspace:
+                    self.session.set_keyspace(settings.CASSANDRA_KEYSPACE)
+                
+                logger.info("Successfully connected to Cassandra cluster")
+                return self.session
+                
+            except Exception as e:
+                logger.error(f"Failed to connect to Cassandra: {e}")
+                raise
+    
+    def _configure_pools(self):
+        """Apply pool sizing where the protocol version supports it"""
+        if settings.CASSANDRA_PROTOCOL_VERSION >= 3:
+            # One multiplexed connection per host; the driver rejects these settings
+            ignored = [name for name in POOL_SETTINGS if name in settings.model_fields_set]
+            if ignored:
+                logger.warning(
+                    "Ignoring %s: protocol version %d uses one connection per host",
+                    ", ".join(ignored), settings.CASSANDRA_PROTOCOL_VERSION
+                )
+            return
+        self.cluster.set_core_connections_per_host(HostDistance.LOCAL, settings.CASSANDRA_CORE_CONNECTIONS_PER_HOST)
+        self.cluster.set_max_connections_per_host(HostDistance.LOCAL, settings.CASSANDRA_MAX_CONNECTIONS_PER_HOST)
+        self.cluster.set_max_requests_per_connection(HostDistance.LOCAL, settings.CASSANDRA_MAX_REQUESTS_PER_CONNECTION)
+    
+    def prepare(self, query: str) -> PreparedStatement:
+        """Prepare a statement once per process and cache it by query text"""
+        statement = self._prepared.get(query)
+        if statement is None:
+            statement = self.get_session().prepare(query)
+            # Reads are safe to retry or speculatively execute
+            statement.is_idempotent = query.lstrip().upper().startswith("SELECT")
+            self._prepared[query] = statement
+        return statement
+    
+    def open_pools(self, timeout: float) -> Dict[str, int]:
+        """Open connection pools to every host the load-balancing policies use
+
+        Blocks for up to timeout seconds; call it off the event loop. Returns
+        open connections per host, including hosts left at zero.
+        """
+        session = self.get_session()
+        # Creates pools for hosts that have none, e.g. after a failed first connect
+        futures = session.update_created_pools()
+        if futures:
+            concurrent.futures.wait(futures, timeout=timeout)
+        pools = session.get_pool_state()
+        return {
+            str(host.endpoint): pools.get(host, {}).get("open_count", 0)
+            for host in session.cluster.metadata.all_hosts()
+            if host.is_up is not False and self.cluster.profile_manager.distance(host) != HostDistance.IGNORED
+        }
     
     def get_session(self):
         """Get Cassandra session"""
-        if not self.session:
+        if not self.session or self._pid != os.getpid():
             self.connect()
         return self.session
     
+    def register_cqlengine(self):
+        """Register the existing session with cqlengine for object-mapper models
+
+        Call this from code that uses cqlengine models; it reuses this
+        manager's session instead of opening a second connection pool.
+        """
+        from cassandra.cqlengine import connection, models
+        
+        session = self.get_session()
+        with self._lock:
+            if not self._cqlengine_registered:
+                connection.register_connection("default", session=session, default=True)
+                models.DEFAULT_KEYSPACE = settings.CASSANDRA_KEYSPACE
+                self._cqlengine_registered = True
+        return session
+    
     def close(self):
         """Close Cassandra connection"""
         try:
+            if self._pid != os.getpid():
+                # Inherited across fork: the parent still owns these sockets
+                self.cluster = self.session = None
+                return
             if self.session:
                 self.session.shutdown()
             if self.cluster:
                 self.cluster.shutdown()
+            self.cluster = self.session = None
+            self._cqlengine_registered = False
+            self._prepared = {}
             logger.info("Cassandra connection closed")
         except Exception as e:
             logger.error(f"Error closing Cassandra connection: {e}")
@@ -89,127 +173,44 @@ def get_cassandra_session():
     return cassandra_manager.get_session()
 
 
+async def execute_async(session, statement, params=None, **kwargs) -> ResultSet:
+    """Execute a statement without blocking the event loop
+
+    The driver completes the request on its I/O thread; the callbacks hand
+    the first page back to the loop. Iterating past the first page still
+    fetches synchronously.
+    """
+    loop = asyncio.get_running_loop()
+    result = loop.create_future()
+    response_future = session.execute_async(statement, params, **kwargs)
+
+    def on_success(rows):
+        if not result.done():
+            result.set_result(ResultSet(response_future, rows))
+
+    def on_error(error):
+        if not result.done():
+            result.set_exception(error)
+
+    response_future.add_callbacks(
+        lambda rows: loop.call_soon_threadsafe(on_success, rows),
+        lambda error: loop.call_soon_threadsafe(on_error, error)
+    )
+    return await result
+
+
 def init_database():
-    """Initialize database tables"""
+    """Verify the database schema is current
+
+    DDL is applied out of band by `python -m app.migrations upgrade`; startup
+    only reads the recorded schema version, so workers boot without schema
+    round trips or agreement waits.
+    """
     try:
         session = cassandra_manager.get_session()
-        
-        # Create tables
-        create_tables(session)
-        logger.info("Database tables initialized successfully")
+        version = check_schema_version(session)
+        logger.info(f"Database schema is at version {version}")
         
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
-        raise
-
-
-def create_tables(session):
-    """Create all required tables"""
-    
-    # Sessions table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS sessions (
-            mobile_no TEXT,
-            device_id TEXT,
-            session_token TEXT,
-            user_id TEXT,
-            jwt_token TEXT,
-            fcm_token TEXT,
-            created_at TIMESTAMP,
-            expires_at TIMESTAMP,
-            is_active BOOLEAN,
-            updated_at TIMESTAMP,
-            PRIMARY KEY ((mobile_no, device_id), created_at)
-        ) WITH CLUSTERING ORDER BY (created_at DESC)
-    """)
-    
-    # Users table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS users (
-            id TEXT PRIMARY KEY,
-            mobile_no TEXT,
-            email TEXT,
-            full_name TEXT,
-            state TEXT,
-            referral_code TEXT,
-            referred_by TEXT,
-            profile_data TEXT,
-            language_code TEXT,
-            language_name TEXT,
-            region_code TEXT,
-            timezone TEXT,
-            user_preferences TEXT,
-            status TEXT,
-            created_at TIMESTAMP,
-            updated_at TIMESTAMP
-        )
-    """)
-    
-    # Games table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS games (
-            id TEXT PRIMARY KEY,
-            name TEXT,
-            description TEXT,
-            category TEXT,
-            icon TEXT,
-            banner TEXT,
-            min_players INT,
-            max_players INT,
-            difficulty TEXT,
-            rating DOUBLE,
-            is_active BOOLEAN,
-            is_featured BOOLEAN,
-            tags LIST<TEXT>,
-            metadata MAP<TEXT, TEXT>,
-            created_at TEXT,
-            updated_at TEXT
-        )
-    """)
-    
-    # Contests table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS contests (
-            contest_id TEXT PRIMARY KEY,
-            contest_name TEXT,
-            contest_win_price TEXT,
-            contest_entryfee TEXT,
-            contest_joinuser INT,
-            contest_activeuser INT,
-            contest_starttime TEXT,
-            contest_endtime TEXT
-        )
-    """)
-    
-
-    
-    # OTP store table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS otp_store(
-            phone_or_email text,      
-            otp_code text,           
-            created_at TEXT,     
-            expires_at TEXT,     
-            purpose text,            
-            is_verified boolean,      
-            attempt_count int,         
-            PRIMARY KEY ((phone_or_email), purpose, created_at)
-        ) WITH CLUSTERING ORDER BY (purpose ASC, created_at DESC)
-    """)
-    
-    # League joins table
-    session.execute("""
-        CREATE TABLE IF NOT EXISTS league_joins (
-            league_id TEXT,
-            status TEXT,
-            user_id TEXT,
-            id UUID,
-            joined_at TEXT,
-            updated_at TEXT,
-            invite_code TEXT,
-            role TEXT,
-            extra_data TEXT,
-            status_id TEXT,
-            PRIMARY KEY ((league_id, status), user_id, joined_at)
-        ) WITH CLUSTERING ORDER BY (user_id ASC, joined_at DESC)
-    """) 
\ No newline at end of file
+        raise
\ No newline at end of file
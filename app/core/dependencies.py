@@ -1,3 +1,9 @@
+import secrets
+from typing import Callable, Optional, Tuple, Type
+from fastapi import Header, HTTPException, Query, Request, status
+from pydantic import BaseModel
+from app.core.config import settings
+from app.core.responses import schema_fields
 from app.services.user_service import UserService
 from app.services.health_service import HealthService
 from app.services.session_service import SessionService
@@ -5,39 +11,94 @@ from app.services.game_service import GameService
 from app.services.contest_service import ContestService
 from app.services.otp_service import OTPService
 from app.services.league_join_service import LeagueJoinService
+from app.services.registry import ServiceRegistry
 
+# Health only reads background probe state, so it is served even before the
+# database-backed registry exists
+_health_service = HealthService()
 
-def get_user_service() -> UserService:
+
+def get_services(request: Request) -> ServiceRegistry:
+    """Dependency to get the worker's ServiceRegistry (built in the lifespan)"""
+    services = getattr(request.app.state, "services", None)
+    if services is None:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Service is starting")
+    return services
+
+
+def get_user_service(request: Request) -> UserService:
     """Dependency to get UserService instance"""
-    return UserService()
+    return get_services(request).users
 
 
 
 def get_health_service() -> HealthService:
     """Dependency to get HealthService instance"""
-    return HealthService()
+    return _health_service
 
 
-def get_session_service() -> SessionService:
+def get_session_service(request: Request) -> SessionService:
     """Dependency to get SessionService instance"""
-    return SessionService()
+    return get_services(request).sessions
 
 
-def get_game_service() -> GameService:
+def get_game_service(request: Request) -> GameService:
     """Dependency to get GameService instance"""
-    return GameService()
+    return get_services(request).games
 
 
-def get_contest_service() -> ContestService:
+def get_contest_service(request: Request) -> ContestService:
     """Dependency to get ContestService instance"""
-    return ContestService()
+    return get_services(request).contests
 
 
-def get_otp_service() -> OTPService:
+def get_otp_service(request: Request) -> OTPService:
     """Dependency to get OTPService instance"""
-    return OTPService()
+    return get_services(request).otp
 
 
-def get_league_join_service() -> LeagueJoinService:
+def get_league_join_service(request: Request) -> LeagueJoinService:
     """Dependency to get LeagueJoinService instance"""
-    return LeagueJoinService() 
\ No newline at end of file
+    return get_services(request).league_joins 
+
+
+def field_selection(model: Type[BaseModel]) -> Callable[..., Optional[Tuple[str, ...]]]:
+    """Dependency factory parsing a fields= query parameter against a response schema
+
+    The selection comes back in schema order, so every spelling of the same
+    set shares one projected statement; None means all fields.
+    """
+    allowed = schema_fields(model)
+
+    def parse_fields(
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return; all fields when omitted")
+    ) -> Optional[Tuple[str, ...]]:
+        if fields is None:
+            return None
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        if not requested:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="fields must name at least one field")
+        unknown = requested - allowed
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field(s): {', '.join(sorted(unknown))}"
+            )
+        return tuple(name for name in model.model_fields if name in requested)
+
+    return parse_fields
+
+
+def is_admin_token(token: Optional[str]) -> bool:
+    """Check a token against ADMIN_API_TOKEN in constant time"""
+    if not settings.ADMIN_API_TOKEN or not token:
+        return False
+    return secrets.compare_digest(token, settings.ADMIN_API_TOKEN)
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)) -> None:
+    """Dependency guarding admin endpoints with the X-Admin-Token header"""
+    if not settings.ADMIN_API_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Admin API is disabled")
+    if not is_admin_token(x_admin_token):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid admin token")
\ No newline at end of file
@@ -0,0 +1,99 @@
+import fnmatch
+import logging
+from functools import lru_cache
+from typing import Any, Dict, Optional
+from cassandra import ConsistencyLevel
+from cassandra.cluster import EXEC_PROFILE_DEFAULT, ExecutionProfile
+from cassandra.policies import (
+    ConstantSpeculativeExecutionPolicy,
+    DCAwareRoundRobinPolicy,
+    TokenAwarePolicy,
+)
+from cassandra.query import dict_factory
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Profile names selectable per repository call
+DEFAULT = EXEC_PROFILE_DEFAULT
+FAST_READ = "fast_read"
+DURABLE_WRITE = "durable_write"
+BULK_SCAN = "bulk_scan"
+
+_PROFILE_KEYS = {
+    "request_timeout",
+    "consistency_level",
+    "serial_consistency_level",
+    "speculative_delay",
+    "speculative_attempts",
+}
+
+
+def parse_consistency_level(name: str) -> int:
+    """Map a consistency level name such as LOCAL_QUORUM to the driver constant"""
+    try:
+        return ConsistencyLevel.name_to_value[name.upper()]
+    except KeyError:
+        raise ValueError(f"Unknown consistency level: {name}")
+
+
+def build_load_balancing_policy():
+    """DC-aware round robin, wrapped for token-aware routing when enabled"""
+    policy = DCAwareRoundRobinPolicy(local_dc=settings.CASSANDRA_LOCAL_DC)
+    if settings.CASSANDRA_TOKEN_AWARE:
+        policy = TokenAwarePolicy(policy, shuffle_replicas=True)
+    return policy
+
+
+def _build_profile(name: str, options: Dict[str, Any]) -> ExecutionProfile:
+    """Build one ExecutionProfile from its settings entry"""
+    unknown = set(options) - _PROFILE_KEYS
+    if unknown:
+        raise ValueError(f"Unknown options for execution profile {name}: {', '.join(sorted(unknown))}")
+
+    speculative_policy = None
+    if options.get("speculative_attempts"):
+        # Only statements marked idempotent are ever speculatively retried
+        speculative_policy = ConstantSpeculativeExecutionPolicy(
+            delay=float(options.get("speculative_delay", 0.1)),
+            max_attempts=int(options["speculative_attempts"])
+        )
+
+    serial = options.get("serial_consistency_level")
+    return ExecutionProfile(
+        load_balancing_policy=build_load_balancing_policy(),
+        request_timeout=float(options.get("request_timeout", 10.0)),
+        consistency_level=parse_consistency_level(options.get("consistency_level", "LOCAL_ONE")),
+        serial_consistency_level=parse_consistency_level(serial) if serial else None,
+        speculative_execution_policy=speculative_policy,
+        # Plain dicts feed the response serializers without a per-column copy
+        row_factory=dict_factory
+    )
+
+
+def build_execution_profiles() -> Dict[Any, ExecutionProfile]:
+    """Build all configured execution profiles, keyed as the Cluster expects"""
+    configured = settings.CASSANDRA_EXECUTION_PROFILES
+    base = configured.get("default", {})
+    profiles = {}
+    for name in {"default", FAST_READ, DURABLE_WRITE, BULK_SCAN} | set(configured):
+        options = {**base, **configured.get(name, {})}
+        key = DEFAULT if name == "default" else name
+        profiles[key] = _build_profile(name, options)
+    # Fail at startup rather than on the first query for a mistyped level
+    for level in settings.CASSANDRA_CONSISTENCY_POLICY.values():
+        parse_consistency_level(level)
+    return profiles
+
+
+@lru_cache(maxsize=None)
+def resolve_consistency(operation: str) -> Optional[int]:
+    """Consistency level configured for a repository operation, or None to use the profile's"""
+    policy = settings.CASSANDRA_CONSISTENCY_POLICY
+    name = policy.get(operation)
+    if name is None:
+        patterns = [pattern for pattern in policy if fnmatch.fnmatchcase(operation, pattern)]
+        if not patterns:
+            return None
+        name = policy[max(patterns, key=len)]
+    return parse_consistency_level(name)
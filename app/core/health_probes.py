@@ -0,0 +1,189 @@
+"""
+Background health probes
+
+The probes run on their own schedule in each worker and keep the latest
+result in memory, so health endpoints only read cached state and never
+touch Cassandra or external services on the request path.
+"""
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Deque, Dict, Optional
+from app.core.config import settings
+from app.core.database import cassandra_manager, execute_async
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+PROBE_QUERY = "SELECT release_version FROM system.local"
+
+
+def percentile(values, fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a sequence (None when empty)"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return round(ordered[rank - 1], 3)
+
+
+class DatabaseProbe:
+    """Periodically runs a cheap prepared query and tracks latency and pool state"""
+
+    def __init__(self, window: int = 120):
+        self.latencies_ms: Deque[float] = deque(maxlen=window)
+        self.consecutive_failures = 0
+        self.release_version: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self.last_checked: Optional[datetime] = None
+
+    async def run_once(self):
+        """Probe Cassandra once and record the outcome"""
+        started = time.perf_counter()
+        try:
+            session = cassandra_manager.get_session()
+            statement = cassandra_manager.prepare(PROBE_QUERY)
+            rows = await asyncio.wait_for(
+                execute_async(session, statement),
+                timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS
+            )
+            row = rows.one()
+            self.release_version = row['release_version'] if row else None
+            self.latencies_ms.append((time.perf_counter() - started) * 1000)
+            self.consecutive_failures = 0
+            self.last_error = None
+        except Exception as e:
+            self.consecutive_failures += 1
+            self.last_error = str(e) or type(e).__name__
+            logger.warning("Database health probe failed: %s", self.last_error)
+        self.last_checked = datetime.utcnow()
+
+    def hosts(self) -> Dict[str, Dict[str, Any]]:
+        """Per-host up/down state, open connections and in-flight requests"""
+        session = cassandra_manager.session
+        if session is None:
+            return {}
+        pools = session.get_pool_state()
+        result = {}
+        for host in session.cluster.metadata.all_hosts():
+            state = pools.get(host, {})
+            result[str(host.endpoint)] = {
+                "up": bool(host.is_up),
+                "datacenter": host.datacenter,
+                "open_connections": state.get("open_count", 0),
+                "in_flight": sum(state.get("in_flights", [])),
+                "pool_shutdown": state.get("shutdown", True),
+            }
+        return result
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached database health"""
+        if self.last_checked is None:
+            return {"status": "unknown", "detail": "No probe has completed yet"}
+
+        hosts = self.hosts()
+        connection_open = any(host["open_connections"] for host in hosts.values())
+        if self.consecutive_failures >= settings.HEALTH_PROBE_FAILURE_THRESHOLD or not connection_open:
+            status = "unhealthy"
+        elif self.consecutive_failures:
+            status = "degraded"
+        else:
+            status = "healthy"
+
+        latencies = list(self.latencies_ms)
+        return {
+            "status": status,
+            "connection": "open" if connection_open else "closed",
+            "release_version": self.release_version,
+            "last_checked": self.last_checked.isoformat(),
+            "last_error": self.last_error,
+            "consecutive_failures": self.consecutive_failures,
+            "latency_ms": {
+                "last": round(latencies[-1], 3) if latencies else None,
+                "p50": percentile(latencies, 0.50),
+                "p95": percentile(latencies, 0.95),
+                "p99": percentile(latencies, 0.99),
+                "samples": len(latencies),
+            },
+            "hosts": hosts,
+        }
+
+
+class ExternalApiProbe:
+    """Periodically calls the configured external API"""
+
+    def __init__(self):
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._client: Optional["httpx.AsyncClient"] = None
+
+    async def run_once(self):
+        """Call EXTERNAL_API_URL once and record status and latency"""
+        if not settings.EXTERNAL_API_URL:
+            return
+        if self._client is None:
+            # Deferred: httpx is only needed when an external API is configured
+            import httpx
+            headers = {"Authorization": f"Bearer {settings.EXTERNAL_API_KEY}"} if settings.EXTERNAL_API_KEY else {}
+            self._client = httpx.AsyncClient(timeout=settings.HEALTH_PROBE_TIMEOUT_SECONDS, headers=headers)
+        started = time.perf_counter()
+        try:
+            response = await self._client.get(settings.EXTERNAL_API_URL)
+            self.last_result = {
+                "status": "healthy" if response.status_code < 500 else "unhealthy",
+                "status_code": response.status_code,
+                "response_time": round(time.perf_counter() - started, 4),
+            }
+        except Exception as e:
+            self.last_result = {"status": "unhealthy", "error": str(e) or type(e).__name__}
+        self.last_result["last_checked"] = datetime.utcnow().isoformat()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Cached external API health"""
+        if not settings.EXTERNAL_API_URL:
+            return {"status": "not_configured"}
+        return self.last_result or {"status": "unknown", "detail": "No probe has completed yet"}
+
+    async def close(self):
+        """Close the HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+class HealthProbes:
+    """Runs all probes on a fixed interval in the background"""
+
+    def __init__(self):
+        self.database = DatabaseProbe(window=settings.HEALTH_PROBE_WINDOW)
+        self.external_api = ExternalApiProbe()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the probe loop on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="health-probes")
+
+    async def stop(self):
+        """Stop the probe loop and release clients"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.external_api.close()
+
+    async def _run(self):
+        """Probe forever; each probe records its own failures"""
+        while True:
+            await asyncio.gather(self.database.run_once(), self.external_api.run_once())
+            await asyncio.sleep(settings.HEALTH_PROBE_INTERVAL_SECONDS)
+
+
+health_probes = HealthProbes()
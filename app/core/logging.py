@@ -1,76 +1,211 @@
+import atexit
+import json
 import logging
-import logging.config
+import logging.handlers
+import queue
+import random
 import sys
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import List, Optional
 from app.core.config import settings
 
+SLOW_QUERY_LOGGER = "app.slow_queries"
+DIAGNOSTICS_LOGGER = "app.diagnostics"
+
+# Attributes every LogRecord has; anything else was passed through `extra`
+_RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        elif record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that drops records instead of blocking when the queue is full
+
+    Records below ERROR are dropped straight away; errors wait briefly for
+    room. Dropped records are counted and reported once the queue drains.
+    """
+
+    def __init__(self, log_queue: queue.Queue, error_put_timeout: float = 0.05):
+        super().__init__(log_queue)
+        self.error_put_timeout = error_put_timeout
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Render exception text now; the record is formatted on the listener thread
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            if record.levelno >= logging.ERROR:
+                self.queue.put(record, timeout=self.error_put_timeout)
+            else:
+                self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            return
+        if self.dropped and self.queue.qsize() < self.queue.maxsize // 2:
+            dropped, self.dropped = self.dropped, 0
+            self.queue.put_nowait(logging.makeLogRecord({
+                "name": __name__,
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Log queue full, dropped {dropped} records",
+            }))
+
+
+class LoggerNameFilter(logging.Filter):
+    """Pass (or with exclude=True, reject) records from one logger subtree"""
+
+    def __init__(self, name: str, exclude: bool = False):
+        super().__init__(name)
+        self.exclude = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return super().filter(record) != self.exclude
+
+
+class AccessLogSampler(logging.Filter):
+    """Keep a sample of successful access log lines and every 4xx/5xx"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        # uvicorn access records carry (client, method, path, http_version, status)
+        args = record.args
+        if isinstance(args, tuple) and len(args) == 5 and isinstance(args[4], int) and args[4] >= 400:
+            return True
+        return self.rate >= 1 or random.random() < self.rate
+
+
+def _build_handlers() -> List[logging.Handler]:
+    """Handlers that do the actual I/O, run on the listener thread"""
+    if settings.LOG_JSON:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter(settings.LOG_FORMAT, datefmt="%Y-%m-%d %H:%M:%S")
+    dedicated = (LoggerNameFilter(SLOW_QUERY_LOGGER, exclude=True), LoggerNameFilter(DIAGNOSTICS_LOGGER, exclude=True))
+
+    console = logging.StreamHandler(sys.stdout)
+    console.setLevel(settings.LOG_LEVEL)
+
+    app_file = logging.handlers.RotatingFileHandler(
+        "logs/app.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    app_file.setLevel(settings.LOG_LEVEL)
+
+    error_file = logging.handlers.RotatingFileHandler(
+        "logs/error.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5
+    )
+    error_file.setLevel(logging.ERROR)
+
+    for handler in (console, app_file, error_file):
+        handler.setFormatter(formatter)
+        for log_filter in dedicated:
+            handler.addFilter(log_filter)
+
+    # Slow-query records are already JSON
+    slow_query_file = logging.handlers.RotatingFileHandler(
+        "logs/slow_queries.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5,
+        delay=True  # only create the file once something is slow
+    )
+    slow_query_file.setFormatter(logging.Formatter("%(message)s"))
+    slow_query_file.addFilter(LoggerNameFilter(SLOW_QUERY_LOGGER))
+
+    # Blocked-loop stack dumps
+    diagnostics_file = logging.handlers.RotatingFileHandler(
+        "logs/diagnostics.log",
+        maxBytes=10485760,  # 10MB
+        backupCount=5,
+        delay=True
+    )
+    diagnostics_file.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    diagnostics_file.addFilter(LoggerNameFilter(DIAGNOSTICS_LOGGER))
+
+    return [console, app_file, error_file, slow_query_file, diagnostics_file]
+
 
 def setup_logging():
-    """Setup application logging configuration"""
-    
+    """Setup application logging configuration
+
+    Loggers only put records on a bounded queue; a QueueListener thread
+    formats them and does the console and file I/O, so request handlers never
+    wait on disk.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
     # Create logs directory if it doesn't exist
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
-    
-    logging_config = {
-        "version": 1,
-        "disable_existing_loggers": False,
-        "formatters": {
-            "default": {
-                "format": settings.LOG_FORMAT,
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-            "detailed": {
-                "format": "%(asctime)s - %(name)s - %(levelname)s - %(module)s - %(funcName)s - %(lineno)d - %(message)s",
-                "datefmt": "%Y-%m-%d %H:%M:%S",
-            },
-        },
-        "handlers": {
-            "console": {
-                "class": "logging.StreamHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "default",
-                "stream": sys.stdout,
-            },
-            "file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": settings.LOG_LEVEL,
-                "formatter": "detailed",
-                "filename": "logs/app.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-            },
-            "error_file": {
-                "class": "logging.handlers.RotatingFileHandler",
-                "level": "ERROR",
-                "formatter": "detailed",
-                "filename": "logs/error.log",
-                "maxBytes": 10485760,  # 10MB
-                "backupCount": 5,
-            },
-        },
-        "loggers": {
-            "": {  # Root logger
-                "handlers": ["console", "file", "error_file"],
-                "level": settings.LOG_LEVEL,
-                "propagate": False,
-            },
-            "app": {
-                "handlers": ["console", "file", "error_file"],
-                "level": settings.LOG_LEVEL,
-                "propagate": False,
-            },
-            "uvicorn": {
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": False,
-            },
-            "uvicorn.access": {
-                "handlers": ["console", "file"],
-                "level": "INFO",
-                "propagate": False,
-            },
-        },
+
+    log_queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = BoundedQueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, *_build_handlers(), respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+
+    levels = {
+        "": settings.LOG_LEVEL,
+        "app": settings.LOG_LEVEL,
+        SLOW_QUERY_LOGGER: "WARNING",
+        DIAGNOSTICS_LOGGER: "WARNING",
+        "uvicorn": "INFO",
+        "uvicorn.access": "INFO",
     }
-    
-    logging.config.dictConfig(logging_config) 
\ No newline at end of file
+    for name, level in levels.items():
+        logger = logging.getLogger(name)
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+        logger.setLevel(level)
+        logger.propagate = False
+
+    access_logger = logging.getLogger("uvicorn.access")
+    for existing in list(access_logger.filters):
+        if isinstance(existing, AccessLogSampler):
+            access_logger.removeFilter(existing)
+    access_logger.addFilter(AccessLogSampler(settings.ACCESS_LOG_SAMPLE_RATE))
+
+
+def stop_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
\ No newline at end of file
@@ -0,0 +1,104 @@
+"""
+Event-loop lag and blocking-call detector
+
+A coroutine on the loop wakes every LOOP_MONITOR_INTERVAL_MS and records how
+late it was scheduled. A watchdog thread checks that heartbeat; when the loop
+has not run for LOOP_BLOCK_THRESHOLD_MS it captures the loop thread's stack,
+which shows the code blocking the loop (e.g. a synchronous driver call inside
+a repository method), and writes it to logs/diagnostics.log.
+"""
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+from app.core.config import settings
+from app.core.metrics import EVENT_LOOP_BLOCKED, EVENT_LOOP_LAG
+
+logger = logging.getLogger(__name__)
+diagnostics_logger = logging.getLogger("app.diagnostics")
+
+
+class LoopMonitor:
+    """Measures event-loop scheduling lag and captures stacks of blocking code"""
+
+    def __init__(self, interval: float = 0.1, block_threshold: float = 0.1):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat = time.monotonic()
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+
+    def start(self):
+        """Start monitoring the running event loop"""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.get_running_loop().create_task(self._measure(), name="loop-monitor")
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self):
+        """Stop the monitor coroutine and watchdog thread"""
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=self.interval * 2)
+            self._watchdog = None
+
+    def take_max_lag(self) -> float:
+        """Largest lag since the previous call, then reset it"""
+        lag, self.max_lag = self.max_lag, 0.0
+        return lag
+
+    async def _measure(self):
+        """Sleep for the interval and record how late the loop woke us"""
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._heartbeat = now
+            lag = max(now - expected, 0.0)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            EVENT_LOOP_LAG.observe(lag)
+
+    def _watch(self):
+        """Watchdog thread: capture the loop thread's stack while it is blocked"""
+        reported_heartbeat = None
+        while not self._stopping.wait(self.interval / 2):
+            heartbeat = self._heartbeat
+            stalled = time.monotonic() - heartbeat - self.interval
+            if stalled < self.block_threshold or heartbeat == reported_heartbeat:
+                continue
+            # One report per blocking episode
+            reported_heartbeat = heartbeat
+            EVENT_LOOP_BLOCKED.inc()
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            diagnostics_logger.warning(
+                "Event loop blocked for at least %.0f ms; loop thread stack:\n%s",
+                stalled * 1000, stack
+            )
+
+
+loop_monitor = LoopMonitor(
+    interval=settings.LOOP_MONITOR_INTERVAL_MS / 1000,
+    block_threshold=settings.LOOP_BLOCK_THRESHOLD_MS / 1000
+)
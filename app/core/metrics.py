@@ -0,0 +1,106 @@
+"""
+Prometheus metrics
+
+With several uvicorn workers each process keeps its own samples, so set
+PROMETHEUS_MULTIPROC_DIR to a directory shared by the workers (emptied before
+the server starts); /metrics then aggregates across every live worker.
+"""
+import os
+from app.core.config import settings
+from app.core.database import cassandra_manager
+
+# prometheus_client picks its value storage at import time
+if settings.PROMETHEUS_MULTIPROC_DIR:
+    os.makedirs(settings.PROMETHEUS_MULTIPROC_DIR, exist_ok=True)
+    os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", settings.PROMETHEUS_MULTIPROC_DIR)
+
+from prometheus_client import (  # noqa: E402
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being served",
+    ["method"],
+    multiprocess_mode="livesum"
+)
+CASSANDRA_QUERY_DURATION = Histogram(
+    "cassandra_query_duration_seconds",
+    "Cassandra statement latency by repository operation",
+    ["operation", "consistency"],
+    buckets=LATENCY_BUCKETS
+)
+CASSANDRA_QUERY_ERRORS = Counter(
+    "cassandra_query_errors_total",
+    "Cassandra statements that raised",
+    ["operation"]
+)
+CASSANDRA_POOL_OPEN_CONNECTIONS = Gauge(
+    "cassandra_pool_open_connections",
+    "Open driver connections per host",
+    ["host"],
+    multiprocess_mode="livesum"
+)
+CASSANDRA_POOL_IN_FLIGHT = Gauge(
+    "cassandra_pool_in_flight_requests",
+    "Requests in flight on driver connections per host",
+    ["host"],
+    multiprocess_mode="livesum"
+)
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "How late the event loop ran a scheduled wakeup",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+)
+EVENT_LOOP_BLOCKED = Counter(
+    "event_loop_blocked_total",
+    "Times the event loop was blocked past the threshold (stack captured)"
+)
+
+
+def is_multiprocess() -> bool:
+    """Whether samples are shared through the multiprocess directory"""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def update_pool_metrics():
+    """Copy this process's driver pool state into the pool gauges"""
+    session = cassandra_manager.session
+    if session is None:
+        return
+    for host, state in session.get_pool_state().items():
+        label = str(host.endpoint)
+        CASSANDRA_POOL_OPEN_CONNECTIONS.labels(label).set(state.get("open_count", 0))
+        CASSANDRA_POOL_IN_FLIGHT.labels(label).set(sum(state.get("in_flights", [])))
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format"""
+    update_pool_metrics()
+    if is_multiprocess():
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry)
+    return generate_latest(REGISTRY)
+
+
+def mark_worker_dead(pid: int):
+    """Drop a stopped worker's live gauges from the multiprocess directory"""
+    if is_multiprocess():
+        multiprocess.mark_process_dead(pid)
+
@@ -0,0 +1,427 @@
+import asyncio
+import fnmatch
+import hashlib
+import logging
+import time
+from typing import Dict, List, Optional
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.cache import ExpiringLRU
+from app.core.compression import Codec, Stream, base_etag, is_compressible, negotiate, variant_etag
+from app.core.config import settings
+from app.core.dependencies import is_admin_token
+from app.core.metrics import HTTP_REQUEST_DURATION, HTTP_REQUESTS_IN_PROGRESS
+from app.core.profiler import ProfilerBusyError, ProfilerDisabledError, profiler_controller
+from app.core.responses import FastJSONResponse
+from app.core.timing import reset_request_timings, server_timing_header, start_request_timings
+from app.services.idempotency_service import request_fingerprint
+
+logger = logging.getLogger(__name__)
+
+
+def route_template(scope: Scope) -> str:
+    """Route path template for the request (low-cardinality metric label)"""
+    # Routes of included routers only know their own suffix; FastAPI records
+    # the full prefixed path on the effective route context
+    context = scope.get("fastapi", {}).get("effective_route_context")
+    if context is not None:
+        return context.path
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class PrometheusMiddleware:
+    """Record request latency by route template and status, and in-flight requests"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = HTTP_REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            in_progress.dec()
+            # The router fills in scope["route"] while handling the request
+            HTTP_REQUEST_DURATION.labels(method, route_template(scope), str(status_code)).observe(
+                time.perf_counter() - started
+            )
+
+
+class TimingMiddleware:
+    """Add X-Process-Time and a Server-Timing breakdown (db, serialize, app) to responses"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings, token = start_request_timings()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                now = time.perf_counter_ns()
+                headers = list(message.get("headers", []))
+                headers.append((b"x-process-time", str((now - timings.started_ns) / 1e9).encode("latin-1")))
+                headers.append((b"server-timing", server_timing_header(timings, now).encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            reset_request_timings(token)
+
+
+class ProfilingMiddleware:
+    """Profile a single request sent with X-Profile: 1 and a valid X-Admin-Token
+
+    The response carries X-Profile-Id; fetch the collapsed stacks from
+    /api/v1/admin/profile/requests/{id}. Other requests running concurrently on
+    the same loop show up in the samples too.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not self._wants_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            profiler = profiler_controller.begin()
+        except (ProfilerBusyError, ProfilerDisabledError) as e:
+            logger.info("Skipping request profile: %s", e)
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profiler_controller.new_id()
+
+        async def send_wrapper(message: Message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", profile_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler_controller.end(profiler)
+            profiler_controller.store(profile_id, profiler, f"{scope['method']} {scope['path']}")
+
+    @staticmethod
+    def _wants_profile(scope: Scope) -> bool:
+        headers = dict(scope.get("headers", []))
+        if headers.get(b"x-profile") not in (b"1", b"true"):
+            return False
+        token = headers.get(b"x-admin-token")
+        return is_admin_token(token.decode("latin-1") if token else None)
+
+
+class IdempotencyMiddleware:
+    """Honour the Idempotency-Key header on the routes in IDEMPOTENCY_ROUTES
+
+    The first request with a key runs and its response is stored; a retry
+    with the same key and the same method, path, query and body gets the
+    stored response (marked Idempotent-Replayed: true) without running again.
+    A retry while the first request is still running gets 409, and reusing a
+    key for a different request gets 422. Server errors are not stored, and a
+    request that raises or is cancelled releases its key. Keys are scoped to
+    the caller's Authorization header, so two clients never share one.
+    """
+
+    MAX_KEY_LENGTH = 255
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        key = self._idempotency_key(scope)
+        services = getattr(scope["app"].state, "services", None) if key is not None else None
+        if services is None:
+            await self.app(scope, receive, send)
+            return
+        if not key or len(key) > self.MAX_KEY_LENGTH:
+            await self._error(scope, receive, send, 400, f"Idempotency-Key must be 1 to {self.MAX_KEY_LENGTH} characters")
+            return
+
+        key = self._scoped_key(scope, key)
+        body = await self._read_body(receive)
+        fingerprint = request_fingerprint(scope["method"], scope["path"], scope.get("query_string", b""), body)
+        record = await services.idempotency.begin(key, fingerprint)
+        if record is not None:
+            await self._replay(scope, receive, send, record, fingerprint)
+            return
+
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status_code = 500
+        headers = []
+        chunks = []
+        size = 0
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code, headers, size
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                chunk = message.get("body", b"")
+                size += len(chunk)
+                if size <= settings.IDEMPOTENCY_MAX_BODY_BYTES:
+                    chunks.append(chunk)
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, send_wrapper)
+        except BaseException:
+            # Cancellation (client gone, worker shutting down) must not leave the key claimed;
+            # shielded so a repeated cancel does not interrupt the release
+            await asyncio.shield(services.idempotency.abandon(key))
+            raise
+        stored = b"".join(chunks) if size <= settings.IDEMPOTENCY_MAX_BODY_BYTES else None
+        await services.idempotency.complete(key, status_code, headers, stored)
+
+    @staticmethod
+    def _idempotency_key(scope: Scope):
+        """The request's Idempotency-Key when its route honours one"""
+        if scope["type"] != "http":
+            return None
+        route = f"{scope['method']} {scope['path']}"
+        if not any(fnmatch.fnmatchcase(route, pattern) for pattern in settings.IDEMPOTENCY_ROUTES):
+            return None
+        for name, value in scope.get("headers", []):
+            if name == b"idempotency-key":
+                return value.decode("latin-1").strip()
+        return None
+
+    @staticmethod
+    def _scoped_key(scope: Scope, key: str) -> str:
+        """Storage key for the caller's Idempotency-Key"""
+        for name, value in scope.get("headers", []):
+            if name == b"authorization":
+                return f"{hashlib.sha256(value).hexdigest()[:32]}:{key}"
+        return key
+
+    @staticmethod
+    async def _read_body(receive: Receive) -> bytes:
+        """Buffer the request body; it is part of the fingerprint"""
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                return b"".join(chunks)
+
+    async def _replay(self, scope: Scope, receive: Receive, send: Send, record: dict, fingerprint: str):
+        """Answer a repeated key from its stored record"""
+        if record["fingerprint"] != fingerprint:
+            await self._error(scope, receive, send, 422, "Idempotency-Key was already used for a different request")
+            return
+        if record["status_code"] is None:
+            await self._error(
+                scope, receive, send, 409, "A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"}
+            )
+            return
+        headers = list(record["headers"]) + [(b"idempotent-replayed", b"true")]
+        await send({"type": "http.response.start", "status": record["status_code"], "headers": headers})
+        await send({"type": "http.response.body", "body": record["body"]})
+
+    @staticmethod
+    async def _error(scope: Scope, receive: Receive, send: Send, status_code: int, detail: str, headers=None):
+        response = FastJSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+        await response(scope, receive, send)
+
+
+class CompressionMiddleware:
+    """Compress responses with the best coding the client accepts
+
+    Bodies under COMPRESSION_MIN_BYTES are sent as they are and streamed
+    responses are compressed chunk by chunk. Compressed variants of responses
+    with a strong ETag are kept in memory, so repeated reads of unchanged
+    data do no compression work. A variant's ETag names its coding
+    ("abc-gzip"); If-None-Match is mapped back to the representation's tag
+    before the application compares it, and a 304 echoes the tag the client
+    sent.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.cache: ExpiringLRU[bytes] = ExpiringLRU(
+            settings.COMPRESSION_CACHE_SIZE, settings.COMPRESSION_CACHE_TTL_SECONDS
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = MutableHeaders(scope=scope)
+        sent_tags: Dict[str, str] = {}
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+            sent_tags = {base_etag(candidate): candidate for candidate in candidates}
+            scope = dict(scope, headers=list(scope["headers"]))
+            MutableHeaders(scope=scope)["if-none-match"] = ", ".join(sent_tags)
+        query = scope.get("query_string", b"").decode("latin-1")
+        responder = _CompressedResponse(
+            send, negotiate(headers.get("accept-encoding")), self.cache, f"{scope['path']}?{query}", sent_tags
+        )
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressedResponse:
+    """Send side of CompressionMiddleware for one response"""
+
+    def __init__(self, send: Send, codec: Optional[Codec], cache: ExpiringLRU, resource: str, sent_tags: Dict[str, str]):
+        self._send = send
+        self.codec = codec
+        self.cache = cache
+        self.resource = resource
+        self.sent_tags = sent_tags
+        self.mode = "pass"
+        self.start: Optional[Message] = None
+        self.buffer: List[bytes] = []
+        self.size = 0
+        self.stream: Optional[Stream] = None
+        self.cache_key: Optional[str] = None
+        # Compressed output kept for the cache; None once it grows too large
+        self.output: Optional[List[bytes]] = None
+        self.output_size = 0
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            await self._start(message)
+        elif message["type"] == "http.response.body":
+            await self._body(message)
+        else:
+            await self._send(message)
+
+    async def _start(self, message: Message):
+        headers = MutableHeaders(raw=list(message.get("headers", [])))
+        message = {**message, "headers": headers.raw}
+        status_code = message["status"]
+        etag = headers.get("etag")
+        if status_code == 304:
+            if etag in self.sent_tags:
+                headers["etag"] = self.sent_tags[etag]
+            await self._send(message)
+            return
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type", "")) or status_code < 200:
+            await self._send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        length = headers.get("content-length")
+        if self.codec is None or status_code == 204 or (length is not None and int(length) < settings.COMPRESSION_MIN_BYTES):
+            await self._send(message)
+            return
+
+        if etag and not etag.startswith("W/"):
+            self.cache_key = f"{self.codec.name} {self.resource} {etag}"
+            cached = self.cache.get(self.cache_key)
+            if cached is not None:
+                self._compressed_headers(headers, len(cached))
+                await self._send(message)
+                await self._send({"type": "http.response.body", "body": cached})
+                # The application's own body is not needed
+                self.mode = "cached"
+                return
+            self.output = []
+        self.start = message
+        self.mode = "buffer"
+
+    async def _body(self, message: Message):
+        if self.mode == "pass":
+            await self._send(message)
+            return
+        if self.mode == "cached":
+            return
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(raw=self.start["headers"])
+
+        if self.mode == "buffer":
+            self.buffer.append(body)
+            self.size += len(body)
+            if not more_body:
+                body = b"".join(self.buffer)
+                if self.size < settings.COMPRESSION_MIN_BYTES:
+                    await self._send(self.start)
+                    await self._send({"type": "http.response.body", "body": body})
+                    return
+                compressed = self.codec.compress(body)
+                self._compressed_headers(headers, len(compressed))
+                self._keep(compressed)
+                self._store()
+                await self._send(self.start)
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            if self.size < settings.COMPRESSION_MIN_BYTES:
+                return
+            # Large enough and still coming: switch to streaming
+            self.stream = self.codec.stream()
+            self._compressed_headers(headers, None)
+            await self._send(self.start)
+            body = b"".join(self.buffer)
+            self.buffer = []
+            self.mode = "stream"
+
+        chunk = self.stream.compress(body) if body else b""
+        if not more_body:
+            chunk += self.stream.finish()
+        self._keep(chunk)
+        if not more_body:
+            self._store()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+    def _compressed_headers(self, headers: MutableHeaders, length: Optional[int]):
+        headers["content-encoding"] = self.codec.name
+        if length is None:
+            if "content-length" in headers:
+                del headers["content-length"]
+        else:
+            headers["content-length"] = str(length)
+        etag = headers.get("etag")
+        if etag:
+            headers["etag"] = variant_etag(etag, self.codec.name)
+
+    def _keep(self, chunk: bytes):
+        if self.output is None:
+            return
+        self.output_size += len(chunk)
+        if self.output_size > settings.COMPRESSION_CACHE_MAX_BYTES:
+            self.output = None
+        else:
+            self.output.append(chunk)
+
+    def _store(self):
+        if self.output is not None and self.cache_key is not None:
+            self.cache.set(self.cache_key, b"".join(self.output))
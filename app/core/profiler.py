@@ -0,0 +1,158 @@
+"""
+Statistical sampling profiler for a live worker
+
+A daemon thread wakes every PROFILER_INTERVAL_MS, reads the event-loop
+thread's current stack with sys._current_frames() and counts it. The result
+is in collapsed-stack format ("frame;frame;frame count" per line), which
+flamegraph.pl, speedscope and inferno read directly. Sampling only reads
+frames, so the cost is bounded by the interval and stack depth, and only one
+profile runs per worker at a time.
+"""
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Dict, Optional
+from app.core.config import settings
+
+_CWD = os.getcwd() + os.sep
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+
+class ProfilerDisabledError(RuntimeError):
+    """Raised when profiling is switched off"""
+
+
+def _frame_label(code) -> str:
+    """Readable, low-cardinality label for one stack frame"""
+    filename = code.co_filename
+    if filename.startswith(_CWD):
+        filename = filename[len(_CWD):]
+    elif "site-packages" + os.sep in filename:
+        filename = filename.split("site-packages" + os.sep, 1)[1]
+    return f"{code.co_name} ({filename})"
+
+
+class SamplingProfiler:
+    """Samples one thread's stack at a fixed interval"""
+
+    def __init__(self, thread_id: int, interval: float, max_stacks: int):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.max_stacks = max_stacks
+        self.samples = 0
+        self.truncated = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the sampling thread"""
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop sampling and wait for the thread to exit"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            stack = ";".join(reversed(labels))
+            self.samples += 1
+            if stack in self._stacks or len(self._stacks) < self.max_stacks:
+                self._stacks[stack] += 1
+            else:
+                self.truncated += 1
+
+    def collapsed(self) -> str:
+        """Collapsed-stack output, most frequent stacks first"""
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+
+class ProfilerController:
+    """Runs at most one profile per worker and keeps recent per-request results"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Optional[SamplingProfiler] = None
+        self._results: "OrderedDict[str, Dict]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        """Kill switch: PROFILER_ENABLED=false refuses every profile"""
+        return settings.PROFILER_ENABLED
+
+    @property
+    def running(self) -> bool:
+        """Whether a profile is currently sampling"""
+        return self._active is not None
+
+    def begin(self) -> SamplingProfiler:
+        """Start sampling the calling (event-loop) thread"""
+        if not self.enabled:
+            raise ProfilerDisabledError("Profiling is disabled")
+        with self._lock:
+            if self._active is not None:
+                raise ProfilerBusyError("A profile is already running in this worker")
+            self._active = SamplingProfiler(
+                threading.get_ident(),
+                interval=settings.PROFILER_INTERVAL_MS / 1000,
+                max_stacks=settings.PROFILER_MAX_STACKS
+            )
+            self._active.start()
+            return self._active
+
+    def end(self, profiler: SamplingProfiler) -> SamplingProfiler:
+        """Stop a profile started with begin()"""
+        profiler.stop()
+        with self._lock:
+            if self._active is profiler:
+                self._active = None
+        return profiler
+
+    def kill(self) -> bool:
+        """Stop the running profile, if any"""
+        active = self._active
+        if active is None:
+            return False
+        self.end(active)
+        return True
+
+    def new_id(self) -> str:
+        """Id under which a per-request profile will be stored"""
+        return uuid.uuid4().hex[:16]
+
+    def store(self, profile_id: str, profiler: SamplingProfiler, label: str):
+        """Keep a finished per-request profile"""
+        with self._lock:
+            self._results[profile_id] = {
+                "label": label,
+                "created_at": time.time(),
+                "samples": profiler.samples,
+                "collapsed": profiler.collapsed(),
+            }
+            while len(self._results) > settings.PROFILER_KEEP_RESULTS:
+                self._results.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict]:
+        """A stored per-request profile"""
+        with self._lock:
+            return self._results.get(profile_id)
+
+
+profiler_controller = ProfilerController()
@@ -0,0 +1,55 @@
+import threading
+from typing import Any, Dict, Optional
+
+
+class QueryMetrics:
+    """In-process per-operation Cassandra query statistics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._operations: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        operation: str,
+        latency_ms: float,
+        consistency_level: Optional[str] = None,
+        profile: Optional[str] = None,
+        error: bool = False
+    ):
+        """Record one statement execution"""
+        with self._lock:
+            stats = self._operations.get(operation)
+            if stats is None:
+                stats = self._operations[operation] = {
+                    "count": 0,
+                    "errors": 0,
+                    "total_ms": 0.0,
+                    "max_ms": 0.0,
+                }
+            stats["count"] += 1
+            stats["errors"] += int(error)
+            stats["total_ms"] += latency_ms
+            stats["max_ms"] = max(stats["max_ms"], latency_ms)
+            stats["consistency_level"] = consistency_level
+            stats["profile"] = profile
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the current statistics with average latency filled in"""
+        with self._lock:
+            result = {}
+            for operation, stats in sorted(self._operations.items()):
+                entry = dict(stats)
+                entry["avg_ms"] = round(stats["total_ms"] / stats["count"], 3) if stats["count"] else 0.0
+                entry["total_ms"] = round(stats["total_ms"], 3)
+                entry["max_ms"] = round(stats["max_ms"], 3)
+                result[operation] = entry
+            return result
+
+    def reset(self):
+        """Drop all recorded statistics"""
+        with self._lock:
+            self._operations.clear()
+
+
+query_metrics = QueryMetrics()
@@ -0,0 +1,94 @@
+"""
+Readiness gate
+
+The lifespan only connects and checks the schema version, so the worker
+starts answering /health (liveness) straight away. Warmup then runs in the
+background: it opens connection pools to every host, prepares the
+repositories' statements, loads in-memory caches and runs synthetic
+lookups. /ready returns 503 until that has finished, so a rolling deploy
+only routes traffic to warm workers. A failed warmup is retried every
+READINESS_RETRY_SECONDS.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.core.database import cassandra_manager
+
+logger = logging.getLogger(__name__)
+
+
+class Readiness:
+    """Runs the worker's warmup and reports whether it may take traffic"""
+
+    def __init__(self):
+        self.ready = False
+        self.attempts = 0
+        self.last_error: Optional[str] = None
+        self.completed_at: Optional[datetime] = None
+        self.hosts: Dict[str, int] = {}
+        self.steps_ms: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self, services):
+        """Start warming up in the background on the running event loop"""
+        if self._task is None:
+            self.ready = False
+            self._task = asyncio.get_running_loop().create_task(self._run(services), name="readiness-warmup")
+
+    async def stop(self):
+        """Cancel a warmup still in progress and mark the worker not ready"""
+        self.ready = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self, services):
+        """Warm up, retrying until it succeeds"""
+        while True:
+            self.attempts += 1
+            try:
+                await self.warmup(services)
+                return
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+                logger.error("Warmup attempt %d failed: %s", self.attempts, self.last_error)
+            await asyncio.sleep(settings.READINESS_RETRY_SECONDS)
+
+    async def warmup(self, services):
+        """Open pools, warm every service, then mark the worker ready"""
+        started = time.perf_counter()
+        self.hosts = await asyncio.to_thread(cassandra_manager.open_pools, settings.READINESS_POOL_TIMEOUT_SECONDS)
+        if not any(self.hosts.values()):
+            raise RuntimeError("No Cassandra host has an open connection")
+        self.steps_ms["pools"] = round((time.perf_counter() - started) * 1000, 3)
+
+        # Prepares statements, runs synthetic lookups and loads caches
+        started = time.perf_counter()
+        await services.warmup()
+        self.steps_ms["services"] = round((time.perf_counter() - started) * 1000, 3)
+
+        self.ready = True
+        self.last_error = None
+        self.completed_at = datetime.utcnow()
+        logger.info("Worker ready after %d warmup attempt(s): %s", self.attempts, self.steps_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Readiness state for the /ready endpoint"""
+        return {
+            "status": "ready" if self.ready else "warming_up",
+            "attempts": self.attempts,
+            "last_error": self.last_error,
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "hosts": self.hosts,
+            "steps_ms": self.steps_ms,
+        }
+
+
+readiness = Readiness()
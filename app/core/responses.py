@@ -0,0 +1,252 @@
+"""
+Response encoding
+
+FastJSONResponse is the application's default response class. It encodes
+with the backend named by JSON_ENCODER (orjson, or the stdlib json module),
+rendering datetimes as isoformat() strings and UUIDs in canonical form,
+exactly as FastAPI's jsonable_encoder did.
+
+Rows read from our own tables already carry the types the response schemas
+declare, so building a model per row (full validation) and then letting
+FastAPI validate it again against response_model is repeated work.
+serialize_rows() encodes the driver's dict rows directly: rows whose columns
+are all schema fields go straight to the encoder, anything else goes through
+a serializer derived from the schema, which drops undeclared columns. With a
+fields= selection, rows are trimmed to the requested fields first (projected
+reads already are). Nothing is validated, so only use it for data that came
+from the database. rows_response() sends large lists with chunked encoding.
+
+rows_response() also tags responses with a strong ETag and answers a
+matching If-None-Match with 304. When every row has an id and updated_at
+the tag is derived from those, so an unchanged resource is confirmed
+without encoding it at all; other rows are tagged with a hash of the
+encoded body. Streamed lists without versions are not tagged, since that
+would mean encoding the whole list up front.
+"""
+import hashlib
+import json
+import uuid
+from collections.abc import Mapping, Set as AbstractSet
+from datetime import date, datetime, time
+from functools import lru_cache
+from time import perf_counter_ns
+from typing import Any, AsyncIterator, Callable, Dict, FrozenSet, List, Optional, Sequence, Type, Union
+import orjson
+from cassandra.util import SortedSet
+from pydantic import BaseModel, TypeAdapter
+from starlette.background import BackgroundTask
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from typing_extensions import TypedDict
+from app.core.config import settings
+from app.core.timing import add_serialize_time
+
+Rows = Union[Dict[str, Any], List[Dict[str, Any]]]
+
+
+def _encode_default(value: Any) -> Any:
+    """Types the stdlib encoder does not know, rendered like orjson does"""
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, Mapping):
+        # e.g. the driver's OrderedMapSerializedKey for MAP columns
+        return dict(value)
+    if isinstance(value, (AbstractSet, SortedSet)):
+        # set, frozenset and the driver's SortedSet for SET columns
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _orjson_dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _stdlib_dumps(content: Any) -> bytes:
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+        default=_encode_default
+    ).encode("utf-8")
+
+
+JSON_ENCODERS: Dict[str, Callable[[Any], bytes]] = {
+    "orjson": _orjson_dumps,
+    "json": _stdlib_dumps,
+}
+
+
+def get_json_encoder(name: str) -> Callable[[Any], bytes]:
+    """Encoder function for a JSON_ENCODER name"""
+    try:
+        return JSON_ENCODERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown JSON encoder {name!r}; expected one of {', '.join(JSON_ENCODERS)}")
+
+
+dumps = get_json_encoder(settings.JSON_ENCODER)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with the configured JSON backend"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+@lru_cache(maxsize=None)
+def schema_fields(model: Type[BaseModel]) -> FrozenSet[str]:
+    """Field names of a response schema"""
+    return frozenset(model.model_fields)
+
+
+@lru_cache(maxsize=None)
+def row_adapter(model: Type[BaseModel], many: bool = False) -> TypeAdapter:
+    """Serializer for rows shaped like a response schema, built once per schema"""
+    fields = {name: field.annotation for name, field in model.model_fields.items()}
+    row_type = TypedDict(f"{model.__name__}Row", fields, total=False)
+    return TypeAdapter(List[row_type] if many else row_type)
+
+
+def project_rows(rows: Rows, fields: Sequence[str]) -> Rows:
+    """Keep only the given fields of one row or a list of rows"""
+    if isinstance(rows, list):
+        return [{field: row[field] for field in fields if field in row} for row in rows]
+    return {field: rows[field] for field in fields if field in rows}
+
+
+def serialize_rows(model: Type[BaseModel], rows: Rows, fields: Optional[Sequence[str]] = None) -> bytes:
+    """JSON for one row or a list of rows, as the schema would render it"""
+    started = perf_counter_ns()
+    try:
+        return _encode_rows(model, rows, fields)
+    finally:
+        add_serialize_time(perf_counter_ns() - started)
+
+
+def _encode_rows(model: Type[BaseModel], rows: Rows, fields: Optional[Sequence[str]]) -> bytes:
+    many = isinstance(rows, list)
+    # Rows of one statement share their columns, so the first row decides
+    sample = rows[0] if many and rows else rows
+    if fields and isinstance(sample, dict) and not sample.keys() <= set(fields):
+        # Full rows, e.g. from a cache or a read past the projection limit
+        rows = project_rows(rows, fields)
+        sample = rows[0] if many else rows
+    if not isinstance(sample, dict) or sample.keys() <= schema_fields(model):
+        return dumps(rows)
+    return row_adapter(model, many).dump_json(rows)
+
+
+class TrustedResponse(Response):
+    """JSON response rendered from database rows without validation
+
+    Returning a Response from an endpoint makes FastAPI skip response_model
+    validation; keep response_model on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        model: Type[BaseModel],
+        rows: Rows,
+        status_code: int = 200,
+        headers: Optional[Dict[str, str]] = None,
+        background: Optional[BackgroundTask] = None,
+        fields: Optional[Sequence[str]] = None
+    ):
+        super().__init__(serialize_rows(model, rows, fields), status_code=status_code, headers=headers, background=background)
+
+
+async def _stream_rows(
+    model: Type[BaseModel],
+    rows: List[Dict[str, Any]],
+    chunk_rows: int,
+    fields: Optional[Sequence[str]] = None
+) -> AsyncIterator[bytes]:
+    """A JSON array of rows, encoded chunk_rows at a time"""
+    yield b"["
+    for start in range(0, len(rows), chunk_rows):
+        chunk = serialize_rows(model, rows[start:start + chunk_rows], fields)
+        yield (b"," if start else b"") + chunk[1:-1]
+    yield b"]"
+
+
+def _version_token(rows: Rows) -> Optional[bytes]:
+    """Identity and updated_at of every row, or None when a row lacks them"""
+    parts = []
+    for row in rows if isinstance(rows, list) else [rows]:
+        updated_at = row.get("updated_at")
+        if updated_at is None or row.get("id") is None:
+            return None
+        parts.append(f"{row['id']}@{updated_at}")
+    return "\n".join(parts).encode("utf-8")
+
+
+def _tag(digest) -> str:
+    return f'"{digest.hexdigest()}"'
+
+
+def version_etag(rows: Rows, fields: Optional[Sequence[str]] = None) -> Optional[str]:
+    """Strong ETag from row versions, computed without encoding the rows"""
+    token = _version_token(rows)
+    if token is None:
+        return None
+    digest = hashlib.blake2b(token, digest_size=16)
+    # The same rows render differently per field selection and encoder
+    digest.update(repr((settings.JSON_ENCODER, tuple(fields or ()))).encode("utf-8"))
+    return _tag(digest)
+
+
+def content_etag(body: bytes) -> str:
+    """Strong ETag from an encoded body"""
+    return _tag(hashlib.blake2b(body, digest_size=16))
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Whether an If-None-Match header matches an ETag (weak comparison, RFC 9110)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(candidate.strip().removeprefix("W/") == etag for candidate in if_none_match.split(","))
+
+
+def rows_response(
+    model: Type[BaseModel],
+    rows: Rows,
+    status_code: int = 200,
+    headers: Optional[Dict[str, str]] = None,
+    fields: Optional[Sequence[str]] = None,
+    if_none_match: Optional[str] = None
+) -> Response:
+    """Response for database rows; lists over JSON_STREAM_MIN_ROWS are streamed
+
+    fields narrows each row to a partial response (see field_selection). The
+    response carries an ETag where one can be computed, and is a bodiless 304
+    when if_none_match matches it.
+    """
+    headers = dict(headers or {})
+    streamed = isinstance(rows, list) and len(rows) > settings.JSON_STREAM_MIN_ROWS
+    body = None
+    etag = version_etag(rows, fields)
+    if etag is None and not streamed:
+        body = serialize_rows(model, rows, fields)
+        etag = content_etag(body)
+    if etag is not None:
+        headers["etag"] = etag
+        if status_code == 200 and etag_matches(if_none_match, etag):
+            return Response(status_code=304, headers=headers)
+    if streamed:
+        return StreamingResponse(
+            _stream_rows(model, rows, settings.JSON_STREAM_CHUNK_ROWS, fields),
+            status_code=status_code,
+            headers=headers,
+            media_type="application/json"
+        )
+    if body is not None:
+        return Response(body, status_code=status_code, headers=headers, media_type="application/json")
+    return TrustedResponse(model, rows, status_code=status_code, headers=headers, fields=fields)
@@ -0,0 +1,88 @@
+"""
+uvicorn launch options for development and production
+
+Production runs one worker per available CPU on uvloop and httptools, with
+keep-alive, backlog and graceful-shutdown settings from config, and recycles
+each worker after LIMIT_MAX_REQUESTS (+ random jitter, so workers do not all
+restart together). Workers are spawned processes that import the app
+themselves, and the Cassandra cluster is created in each worker's lifespan,
+so no connection is ever shared across a fork. Keep this module free of
+imports from app.main for that reason.
+"""
+import logging
+import math
+import os
+import tempfile
+from typing import Any, Dict
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+APP = "app.main:app"
+
+
+def available_cpus() -> int:
+    """CPUs this process may use, honouring affinity and a cgroup v2 quota"""
+    try:
+        count = len(os.sched_getaffinity(0))
+    except AttributeError:
+        count = os.cpu_count() or 1
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as cpu_max:
+            quota, period = cpu_max.read().split()
+        if quota != "max":
+            count = min(count, max(1, math.ceil(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return count
+
+
+def worker_count() -> int:
+    """WORKERS when set, otherwise one worker per available CPU"""
+    return settings.WORKERS or available_cpus()
+
+
+def uvicorn_options(production: bool) -> Dict[str, Any]:
+    """Keyword arguments for uvicorn.run()"""
+    options: Dict[str, Any] = {
+        "host": settings.HOST,
+        "port": settings.PORT,
+        "log_level": settings.LOG_LEVEL.lower(),
+        "timeout_keep_alive": settings.KEEP_ALIVE_SECONDS,
+        "backlog": settings.BACKLOG,
+    }
+    if not production:
+        # Reload only makes sense on a developer machine
+        options["reload"] = settings.RELOAD and settings.ENVIRONMENT == "development"
+        return options
+
+    options.update({
+        "workers": worker_count(),
+        "loop": "uvloop",
+        "http": "httptools",
+        "reload": False,
+        "limit_max_requests": settings.LIMIT_MAX_REQUESTS,
+        "limit_max_requests_jitter": settings.LIMIT_MAX_REQUESTS_JITTER,
+        "limit_concurrency": settings.LIMIT_CONCURRENCY,
+        "timeout_graceful_shutdown": settings.TIMEOUT_GRACEFUL_SHUTDOWN_SECONDS,
+        "proxy_headers": True,
+        "server_header": False,
+    })
+    return options
+
+
+def prepare_metrics_dir(workers: int):
+    """Give multi-worker runs a shared, empty Prometheus multiprocess directory"""
+    if workers <= 1:
+        return
+    path = settings.PROMETHEUS_MULTIPROC_DIR or os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        path = tempfile.mkdtemp(prefix="prometheus-")
+        logger.info("PROMETHEUS_MULTIPROC_DIR not set; using %s", path)
+    os.makedirs(path, exist_ok=True)
+    # Files left by a previous run would be summed into this one
+    for name in os.listdir(path):
+        if name.endswith(".db"):
+            os.remove(os.path.join(path, name))
+    # Spawned workers inherit the environment
+    os.environ["PROMETHEUS_MULTIPROC_DIR"] = path
@@ -0,0 +1,122 @@
+"""
+Opt-in slow-query log
+
+Statements slower than SLOW_QUERY_THRESHOLD_MS are written as JSON lines to
+the dedicated slow-query log file and kept in a bounded in-memory buffer for
+the admin API. A sampled fraction of statements is executed with Cassandra
+request tracing; when one of those turns out slow its trace events are
+fetched and attached to the record.
+"""
+import json
+import logging
+import random
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+slow_query_logger = logging.getLogger("app.slow_queries")
+
+
+def param_shapes(params: Sequence) -> List[str]:
+    """Describe bound parameters by type (and length) without their values"""
+    shapes = []
+    for value in params or ():
+        name = type(value).__name__
+        if isinstance(value, (str, bytes, list, tuple, set, dict)):
+            name = f"{name}[{len(value)}]"
+        shapes.append(name)
+    return shapes
+
+
+class SlowQueryLog:
+    """Threshold-based recorder of slow Cassandra statements"""
+
+    def __init__(self, capacity: int = 200):
+        self._lock = threading.Lock()
+        self._records = deque(maxlen=capacity)
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the slow-query log is switched on"""
+        return settings.SLOW_QUERY_LOG_ENABLED
+
+    def should_trace(self) -> bool:
+        """Whether the next statement should run with request tracing"""
+        return self.enabled and random.random() < settings.SLOW_QUERY_TRACE_SAMPLE_RATE
+
+    def is_slow(self, latency_ms: float) -> bool:
+        """Whether a statement latency crosses the threshold"""
+        return self.enabled and latency_ms >= settings.SLOW_QUERY_THRESHOLD_MS
+
+    def record(
+        self,
+        operation: str,
+        query: str,
+        params: Sequence,
+        latency_ms: float,
+        consistency_level: Optional[str],
+        result=None,
+        error: Optional[Exception] = None,
+        traced: bool = False
+    ) -> Dict[str, Any]:
+        """Log one slow statement; result is the driver ResultSet when it succeeded"""
+        future = getattr(result, "response_future", None)
+        coordinator = getattr(future, "coordinator_host", None)
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "operation": operation,
+            "statement": " ".join(query.split()),
+            "param_shapes": param_shapes(params),
+            "latency_ms": round(latency_ms, 3),
+            "consistency_level": consistency_level,
+            "coordinator": str(coordinator) if coordinator else None,
+            "retries": getattr(future, "_query_retries", 0) if future else 0,
+            "error": str(error) if error else None,
+        }
+        if traced and result is not None:
+            entry["trace"] = self._fetch_trace(result)
+
+        with self._lock:
+            self._records.append(entry)
+        slow_query_logger.warning(json.dumps(entry, default=str))
+        return entry
+
+    def _fetch_trace(self, result) -> Optional[Dict[str, Any]]:
+        """Fetch the trace session and events for a traced statement"""
+        try:
+            trace = result.get_query_trace(max_wait_sec=settings.SLOW_QUERY_TRACE_WAIT_SECONDS)
+        except Exception as e:
+            logger.warning(f"Could not fetch query trace: {e}")
+            return None
+        if trace is None:
+            return None
+        return {
+            "trace_id": str(trace.trace_id),
+            "coordinator": str(trace.coordinator),
+            "duration_us": trace.duration.total_seconds() * 1_000_000 if trace.duration else None,
+            "events": [
+                {
+                    "source": str(event.source),
+                    "elapsed_us": event.source_elapsed.total_seconds() * 1_000_000 if event.source_elapsed else None,
+                    "thread": event.thread_name,
+                    "description": event.description,
+                }
+                for event in trace.events
+            ],
+        }
+
+    def recent(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent slow statements, newest first"""
+        with self._lock:
+            return list(reversed(self._records))[:limit]
+
+    def clear(self):
+        """Drop buffered records"""
+        with self._lock:
+            self._records.clear()
+
+
+slow_query_log = SlowQueryLog(capacity=settings.SLOW_QUERY_BUFFER_SIZE)
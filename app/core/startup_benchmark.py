@@ -0,0 +1,90 @@
+"""
+Cold-start benchmark
+
+    python -m app.core.startup_benchmark [--runs N] [--top N]
+
+Every run is a fresh interpreter, like a newly spawned worker or a test
+collection. It reports the process wall time (interpreter start included),
+the time spent importing app.main, the modules with the largest cumulative
+import time (from python -X importtime) and whether any of the modules that
+should only load on first use were imported anyway.
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+TARGET = "app.main"
+# Loaded on first use; importing the app must not pull these in
+DEFERRED_MODULES = ("cassandra.cqlengine", "psutil", "httpx")
+
+_PROBE = f"""
+import sys, time
+started = time.perf_counter()
+import {TARGET}
+elapsed = time.perf_counter() - started
+loaded = [name for name in {DEFERRED_MODULES!r} if name in sys.modules]
+print(elapsed, ",".join(loaded))
+"""
+
+_ROOT = Path(__file__).resolve().parents[2]
+
+
+def run_once() -> Tuple[float, float, List[str], Dict[str, int]]:
+    """Import the app in a new interpreter
+
+    Returns process wall seconds, import seconds, deferred modules that were
+    loaded and the cumulative import time of every module in microseconds.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=_ROOT, capture_output=True, text=True, check=True,
+    )
+    wall = time.perf_counter() - started
+    elapsed, _, loaded = result.stdout.strip().rpartition("\n")[2].partition(" ")
+
+    cumulative: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        # import time: <self us> | <cumulative us> | <indented module name>
+        _, micros, name = line.split("|")
+        cumulative[name.strip()] = int(micros)
+    return wall, float(elapsed), [name for name in loaded.split(",") if name], cumulative
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m app.core.startup_benchmark", description="Cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    args = parser.parse_args(argv)
+
+    walls, imports = [], []
+    loaded: List[str] = []
+    cumulative: Dict[str, List[int]] = {}
+    for _ in range(args.runs):
+        wall, elapsed, loaded, modules = run_once()
+        walls.append(wall * 1000)
+        imports.append(elapsed * 1000)
+        for name, micros in modules.items():
+            cumulative.setdefault(name, []).append(micros)
+
+    print(f"{args.runs} runs, median / min")
+    print(f"  process wall   {statistics.median(walls):8.1f} / {min(walls):8.1f} ms")
+    print(f"  import {TARGET} {statistics.median(imports):8.1f} / {min(imports):8.1f} ms")
+    print(f"  deferred modules loaded: {', '.join(loaded) or 'none'}")
+    print("slowest imports (cumulative, median ms)")
+    slowest = sorted(cumulative.items(), key=lambda item: statistics.median(item[1]), reverse=True)
+    for name, samples in slowest[:args.top]:
+        print(f"  {statistics.median(samples) / 1000:8.1f}  {name}")
+    if loaded:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+Background system sampler
+
+Every SYSTEM_SAMPLE_INTERVAL_SECONDS a worker thread collects process and
+host statistics (RSS, CPU, file descriptors, GC, memory, disk) plus the
+event-loop lag seen since the previous sample, and appends them to a ring
+buffer. Health endpoints read the buffer only, so polling them costs no
+syscalls.
+
+psutil is imported on first use, so importing the app (worker spawn, test
+collection) does not pay for it.
+"""
+import asyncio
+import gc
+import logging
+import os
+import platform
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional
+from app.core.config import settings
+from app.core.loop_monitor import loop_monitor
+
+if TYPE_CHECKING:
+    import psutil
+
+logger = logging.getLogger(__name__)
+
+
+class SystemSampler:
+    """Collects system snapshots on an interval into a ring buffer"""
+
+    def __init__(self, history: int = 60):
+        self._samples: Deque[Dict[str, Any]] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._process: Optional["psutil.Process"] = None
+        self._system_info: Optional[Dict[str, Any]] = None
+
+    def system_info(self) -> Dict[str, Any]:
+        """Static host information, collected once per process"""
+        if self._system_info is None:
+            import psutil
+            self._system_info = {
+                "platform": platform.system(),
+                "platform_version": platform.version(),
+                "python_version": platform.python_version(),
+                "cpu_count": psutil.cpu_count(),
+                "memory_total": psutil.virtual_memory().total,
+                "uptime": psutil.boot_time(),
+            }
+        return self._system_info
+
+    def process(self) -> "psutil.Process":
+        """psutil handle for the current process, created on first use"""
+        if self._process is None or self._process.pid != os.getpid():
+            # Also covers a forked worker: measure this process, not the parent
+            import psutil
+            self._process = psutil.Process(os.getpid())
+        return self._process
+
+    def start(self):
+        """Start sampling on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(), name="system-sampler")
+
+    async def stop(self):
+        """Stop sampling"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        """Sample forever; psutil calls run in a worker thread"""
+        self.system_info()
+        # The first cpu_percent call only primes the counter
+        self.process().cpu_percent(None)
+        while True:
+            await asyncio.sleep(settings.SYSTEM_SAMPLE_INTERVAL_SECONDS)
+            loop_lag_ms = loop_monitor.take_max_lag() * 1000
+            try:
+                sample = await asyncio.to_thread(self.collect)
+            except Exception as e:
+                logger.warning("System sample failed: %s", e)
+                continue
+            sample["loop_lag_max_ms"] = round(loop_lag_ms, 3)
+            with self._lock:
+                self._samples.append(sample)
+
+    def collect(self) -> Dict[str, Any]:
+        """Take one snapshot (blocking; call off the event loop)"""
+        import psutil
+        process = self.process()
+        with process.oneshot():
+            memory_info = process.memory_info()
+            cpu_percent = process.cpu_percent(None)
+            num_fds = process.num_fds() if hasattr(process, "num_fds") else None
+            num_threads = process.num_threads()
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_usage("/")
+        return {
+            "timestamp": datetime.utcnow().isoformat(),
+            "process": {
+                "rss": memory_info.rss,
+                "cpu_percent": cpu_percent,
+                "open_fds": num_fds,
+                "threads": num_threads,
+            },
+            "gc": {
+                "counts": list(gc.get_count()),
+                "collections": [generation["collections"] for generation in gc.get_stats()],
+            },
+            "memory": {
+                "usage_percent": memory.percent,
+                "available": memory.available,
+                "total": memory.total,
+            },
+            "disk": {
+                "usage_percent": disk.percent,
+                "free": disk.free,
+                "total": disk.total,
+            },
+        }
+
+    def samples(self) -> List[Dict[str, Any]]:
+        """All buffered samples, oldest first"""
+        with self._lock:
+            return list(self._samples)
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """Most recent sample"""
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def trends(self) -> Dict[str, Any]:
+        """Min/avg/max of key series over the buffered window"""
+        samples = self.samples()
+        if not samples:
+            return {}
+        series = {
+            "rss": [sample["process"]["rss"] for sample in samples],
+            "cpu_percent": [sample["process"]["cpu_percent"] for sample in samples],
+            "loop_lag_max_ms": [sample["loop_lag_max_ms"] for sample in samples],
+            "memory_usage_percent": [sample["memory"]["usage_percent"] for sample in samples],
+        }
+        trends = {
+            name: {
+                "min": min(values),
+                "avg": round(sum(values) / len(values), 3),
+                "max": max(values),
+            }
+            for name, values in series.items()
+        }
+        trends["rss"]["change"] = series["rss"][-1] - series["rss"][0]
+        trends["window_seconds"] = round(settings.SYSTEM_SAMPLE_INTERVAL_SECONDS * (len(samples) - 1), 1)
+        trends["samples"] = len(samples)
+        return trends
+
+
+system_sampler = SystemSampler(history=settings.SYSTEM_SAMPLE_HISTORY)
@@ -0,0 +1,136 @@
+"""
+Online migration of legacy TEXT timestamp columns to typed TIMESTAMP columns
+
+Rollout:
+    1. python -m app.migrations upgrade (adds the *_ts columns)
+    2. deploy with TIMESTAMP_MIGRATION_PHASE=dual_write
+    3. python -m app.core.timestamp_migration backfill
+    4. deploy with TIMESTAMP_MIGRATION_PHASE=read_typed (then typed)
+"""
+import argparse
+import logging
+from typing import Dict, List, Optional, Tuple
+from cassandra import InvalidRequest
+from cassandra.cluster import Session
+from app.core.database import cassandra_manager
+from app.core.timestamps import TYPED_TIMESTAMP_COLUMNS, to_timestamp
+from app.core.token_scanner import scan_table
+
+logger = logging.getLogger(__name__)
+
+# (partition key columns, clustering columns) for each migrated table
+TABLE_KEYS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    "games": (("id",), ()),
+    "contests": (("contest_id",), ()),
+    "otp_store": (("phone_or_email",), ("purpose", "created_at")),
+    "league_joins": (("league_id", "status"), ("user_id", "joined_at")),
+}
+
+
+def add_typed_columns(session: Session) -> List[str]:
+    """Add the TIMESTAMP shadow columns, skipping ones that already exist"""
+    added = []
+    for table, columns in TYPED_TIMESTAMP_COLUMNS.items():
+        for typed_column in columns.values():
+            try:
+                session.execute(f"ALTER TABLE {table} ADD {typed_column} TIMESTAMP")
+                added.append(f"{table}.{typed_column}")
+            except InvalidRequest as e:
+                if "conflicts with an existing column" not in str(e) and "already exists" not in str(e):
+                    raise
+    return added
+
+
+def backfill_table(session: Session, table: str, splits: int = 64) -> Dict[str, int]:
+    """Fill typed columns from their TEXT copies for rows where they are still null
+
+    Each write is a lightweight transaction conditioned on the typed columns
+    still being null and the row's TEXT timestamps still holding the values
+    scanned. A concurrent dual-write or a delete since the scan therefore
+    makes the write not apply instead of overwriting or resurrecting the row;
+    such rows are counted as skipped and a later run picks up any still
+    pending.
+    """
+    partition_key, clustering = TABLE_KEYS[table]
+    key_columns = partition_key + clustering
+    mapping = TYPED_TIMESTAMP_COLUMNS[table]
+    # Key columns cannot appear in an IF clause; the regular TEXT copies can
+    checked_text = tuple(column for column in mapping if column not in key_columns)
+    columns = list(dict.fromkeys(key_columns + tuple(mapping) + tuple(mapping.values())))
+    where = " AND ".join(f"{column} = ?" for column in key_columns)
+    statements = {}
+    stats = {"scanned": 0, "updated": 0, "skipped": 0, "unparseable": 0}
+
+    for row in scan_table(session, table, partition_key, columns, splits=splits):
+        stats["scanned"] += 1
+        missing = {}
+        for text_column, typed_column in mapping.items():
+            text = row[text_column]
+            if row[typed_column] is not None or not text:
+                continue
+            try:
+                missing[typed_column] = to_timestamp(text)
+            except ValueError:
+                stats["unparseable"] += 1
+                logger.warning(f"Skipping unparseable {table}.{text_column} value {text!r}")
+        if not missing:
+            continue
+
+        assigned = tuple(sorted(missing))
+        if assigned not in statements:
+            assignments = ", ".join(f"{column} = ?" for column in assigned)
+            conditions = " AND ".join(
+                [f"{column} = null" for column in assigned] + [f"{column} = ?" for column in checked_text]
+            )
+            statements[assigned] = session.prepare(
+                f"UPDATE {table} SET {assignments} WHERE {where} IF {conditions}"
+            )
+        values = [missing[column] for column in assigned]
+        values.extend(row[column] for column in key_columns)
+        values.extend(row[column] for column in checked_text)
+        if session.execute(statements[assigned], values).was_applied:
+            stats["updated"] += 1
+        else:
+            stats["skipped"] += 1
+
+    logger.info(f"Backfilled {table}: {stats}")
+    return stats
+
+
+def count_pending(session: Session, table: str, splits: int = 64) -> int:
+    """Count rows that still have a TEXT timestamp without its typed copy"""
+    partition_key, _ = TABLE_KEYS[table]
+    mapping = TYPED_TIMESTAMP_COLUMNS[table]
+    columns = list(dict.fromkeys(partition_key + tuple(mapping) + tuple(mapping.values())))
+    pending = 0
+    for row in scan_table(session, table, partition_key, columns, splits=splits):
+        if any(row[text] and row[typed] is None for text, typed in mapping.items()):
+            pending += 1
+    return pending
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Migrate TEXT timestamp columns to TIMESTAMP")
+    parser.add_argument("command", choices=["backfill", "status"])
+    parser.add_argument("--table", choices=sorted(TYPED_TIMESTAMP_COLUMNS), action="append",
+                        help="Restrict to a table (repeatable); defaults to all migrated tables")
+    parser.add_argument("--splits", type=int, default=64, help="Token ranges to scan per table")
+    args = parser.parse_args(argv)
+    tables = args.table or list(TYPED_TIMESTAMP_COLUMNS)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    session = cassandra_manager.get_session()
+    try:
+        if args.command == "backfill":
+            for table in tables:
+                print(f"{table}: {backfill_table(session, table, splits=args.splits)}")
+        else:
+            for table in tables:
+                print(f"{table}: {count_pending(session, table, splits=args.splits)} rows pending backfill")
+    finally:
+        cassandra_manager.close()
+
+
+if __name__ == "__main__":
+    main()
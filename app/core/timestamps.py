@@ -0,0 +1,119 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Tuple, Union
+from app.core.config import settings
+
+# Legacy TEXT timestamp column -> typed TIMESTAMP column, per table
+TYPED_TIMESTAMP_COLUMNS: Dict[str, Dict[str, str]] = {
+    "games": {
+        "created_at": "created_at_ts",
+        "updated_at": "updated_at_ts",
+    },
+    "contests": {
+        "contest_starttime": "contest_starttime_ts",
+        "contest_endtime": "contest_endtime_ts",
+    },
+    "otp_store": {
+        "created_at": "created_at_ts",
+        "expires_at": "expires_at_ts",
+    },
+    "league_joins": {
+        "joined_at": "joined_at_ts",
+        "updated_at": "updated_at_ts",
+    },
+}
+
+# TEXT timestamps that are part of the primary key. Cassandra cannot change the
+# type of a key column, so these keep being written in every phase and remain
+# the row identity used by update/delete paths.
+KEY_TEXT_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "otp_store": ("created_at",),
+    "league_joins": ("joined_at",),
+}
+
+# Migration phases, in rollout order:
+#   dual_write - write TEXT and TIMESTAMP columns, read TEXT
+#   read_typed - write both, read TIMESTAMP (TEXT fallback for rows not yet backfilled)
+#   typed      - write TIMESTAMP only (plus TEXT key columns), read TIMESTAMP
+PHASE_DUAL_WRITE = "dual_write"
+PHASE_READ_TYPED = "read_typed"
+PHASE_TYPED = "typed"
+MIGRATION_PHASES = (PHASE_DUAL_WRITE, PHASE_READ_TYPED, PHASE_TYPED)
+
+
+def current_phase() -> str:
+    """Get the configured timestamp migration phase"""
+    phase = settings.TIMESTAMP_MIGRATION_PHASE
+    if phase not in MIGRATION_PHASES:
+        raise ValueError(f"TIMESTAMP_MIGRATION_PHASE must be one of: {', '.join(MIGRATION_PHASES)}")
+    return phase
+
+
+def to_timestamp(value: Union[datetime, str, None]) -> Optional[datetime]:
+    """Normalize a datetime or ISO string to naive UTC at Cassandra's millisecond precision"""
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value.replace(microsecond=value.microsecond // 1000 * 1000)
+
+
+def utcnow() -> datetime:
+    """Current UTC time, truncated so TEXT and TIMESTAMP copies stay identical"""
+    return to_timestamp(datetime.utcnow())
+
+
+def to_legacy_text(value: Optional[datetime]) -> Optional[str]:
+    """Format a timestamp the way the legacy TEXT columns store it"""
+    return value.isoformat() if value is not None else None
+
+
+def timestamp_write_values(table: str, values: Dict[str, Any]) -> Dict[str, Any]:
+    """Expand timestamp values into the columns the current phase writes"""
+    columns = TYPED_TIMESTAMP_COLUMNS[table]
+    key_columns = KEY_TEXT_COLUMNS.get(table, ())
+    write_text = current_phase() != PHASE_TYPED
+
+    expanded = {}
+    for text_column, value in values.items():
+        value = to_timestamp(value)
+        expanded[columns[text_column]] = value
+        if write_text or text_column in key_columns:
+            expanded[text_column] = to_legacy_text(value)
+    return expanded
+
+
+def resolve_row_timestamps(table: str, row: Optional[dict]) -> Optional[dict]:
+    """Replace a row's timestamp columns with typed values, in place
+
+    TEXT key columns keep their stored value: legacy keys carry microseconds
+    that the millisecond TIMESTAMP copy would drop.
+    """
+    if row is None:
+        return None
+    read_typed = current_phase() != PHASE_DUAL_WRITE
+    key_columns = KEY_TEXT_COLUMNS.get(table, ())
+    for text_column, typed_column in TYPED_TIMESTAMP_COLUMNS[table].items():
+        if text_column not in row and typed_column not in row:
+            # Not selected by a projected read
+            continue
+        if text_column in key_columns and row.get(text_column):
+            # Keys are returned exactly as stored, so clients can address the row with them
+            row.pop(typed_column, None)
+            continue
+        typed = row.pop(typed_column, None)
+        if typed is None or not read_typed:
+            # Row written before dual-write and not backfilled yet
+            text = row.get(text_column)
+            typed = to_timestamp(text) if text else None
+        row[text_column] = typed
+    return row
+
+
+def timestamp_filter(table: str, text_column: str, value: datetime) -> Tuple[str, Any]:
+    """Column and bound value to use when filtering on a timestamp"""
+    value = to_timestamp(value)
+    if current_phase() == PHASE_DUAL_WRITE:
+        return text_column, to_legacy_text(value)
+    return TYPED_TIMESTAMP_COLUMNS[table][text_column], value
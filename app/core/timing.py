@@ -0,0 +1,92 @@
+"""
+Per-request time attribution for the Server-Timing header
+
+TimingMiddleware opens a RequestTimings for each request in a contextvar;
+repository calls add their database time to it and TimedRoute marks when the
+endpoint returned, so the time until the response starts is serialization.
+Endpoints that encode rows themselves (rows_response) add that time
+explicitly, since it happens before the endpoint returns.
+"""
+import functools
+import inspect
+import time
+from contextvars import ContextVar
+from typing import Optional
+from fastapi.routing import APIRoute
+
+
+class RequestTimings:
+    """Nanosecond timings collected while serving one request"""
+
+    __slots__ = ("started_ns", "db_ns", "serialize_ns", "endpoint_done_ns")
+
+    def __init__(self):
+        self.started_ns = time.perf_counter_ns()
+        self.db_ns = 0
+        self.serialize_ns = 0
+        self.endpoint_done_ns: Optional[int] = None
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def start_request_timings():
+    """Start timing the current request; returns (timings, reset token)"""
+    timings = RequestTimings()
+    return timings, _current.set(timings)
+
+
+def reset_request_timings(token):
+    """Stop attributing time to the request started with token"""
+    _current.reset(token)
+
+
+def add_db_time(elapsed_ns: int):
+    """Attribute database time to the current request, if any"""
+    timings = _current.get()
+    if timings is not None:
+        timings.db_ns += elapsed_ns
+
+
+def add_serialize_time(elapsed_ns: int):
+    """Attribute serialization done inside the endpoint to the current request, if any"""
+    timings = _current.get()
+    if timings is not None:
+        timings.serialize_ns += elapsed_ns
+
+
+def mark_endpoint_done():
+    """Record that the endpoint returned and response serialization begins"""
+    timings = _current.get()
+    if timings is not None:
+        timings.endpoint_done_ns = time.perf_counter_ns()
+
+
+def server_timing_header(timings: RequestTimings, response_start_ns: int) -> str:
+    """Server-Timing value splitting the request into db, serialize and app time"""
+    total = response_start_ns - timings.started_ns
+    serialize = timings.serialize_ns
+    if timings.endpoint_done_ns:
+        serialize += response_start_ns - timings.endpoint_done_ns
+    app = max(total - timings.db_ns - serialize, 0)
+    parts = (("db", timings.db_ns), ("serialize", serialize), ("app", app), ("total", total))
+    return ", ".join(f"{name};dur={elapsed / 1_000_000:.3f}" for name, elapsed in parts)
+
+
+class TimedRoute(APIRoute):
+    """APIRoute that marks when its endpoint returns, before FastAPI serializes the result"""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if inspect.iscoroutinefunction(endpoint):
+            endpoint = self._mark_completion(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _mark_completion(endpoint):
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                mark_endpoint_done()
+        return timed_endpoint
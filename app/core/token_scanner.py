@@ -0,0 +1,53 @@
+import logging
+from typing import Iterator, List, Sequence, Tuple
+from cassandra.cluster import Session
+from app.core.execution_profiles import BULK_SCAN
+
+logger = logging.getLogger(__name__)
+
+# Murmur3Partitioner token bounds. MIN_TOKEN is never assigned to a partition,
+# so half-open (start, end] ranges starting from it cover the whole ring.
+MIN_TOKEN = -(2 ** 63)
+MAX_TOKEN = 2 ** 63 - 1
+
+
+def split_token_ring(splits: int) -> List[Tuple[int, int]]:
+    """Split the token ring into contiguous (start, end] ranges"""
+    if splits < 1:
+        raise ValueError("splits must be at least 1")
+    step = (MAX_TOKEN - MIN_TOKEN) // splits
+    ranges = []
+    start = MIN_TOKEN
+    for index in range(splits):
+        end = MAX_TOKEN if index == splits - 1 else start + step
+        ranges.append((start, end))
+        start = end
+    return ranges
+
+
+def scan_table(
+    session: Session,
+    table: str,
+    partition_key: Sequence[str],
+    columns: Sequence[str],
+    splits: int = 64,
+    fetch_size: int = 500
+) -> Iterator:
+    """Iterate over every row of a table one token range at a time
+
+    Each range is a single-replica-set query, so a full scan never turns into
+    one huge coordinator-side sequential read.
+    """
+    token = f"token({', '.join(partition_key)})"
+    statement = session.prepare(
+        f"SELECT {', '.join(columns)} FROM {table} WHERE {token} > ? AND {token} <= ?"
+    )
+    statement.fetch_size = fetch_size
+    
+    for start, end in split_token_ring(splits):
+        try:
+            for row in session.execute(statement, (start, end), execution_profile=BULK_SCAN):
+                yield row
+        except Exception as e:
+            logger.error(f"Error scanning {table} token range ({start}, {end}]: {e}")
+            raise
@@ -1,25 +1,40 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
-import time
+from fastapi.responses import Response
 import logging
+import os
 from contextlib import asynccontextmanager
 
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.core.logging import setup_logging
 from app.core.database import init_database, cassandra_manager
+from app.core.metrics import CONTENT_TYPE_LATEST, mark_worker_dead, render_metrics
+from app.core.middleware import (
+    CompressionMiddleware,
+    IdempotencyMiddleware,
+    PrometheusMiddleware,
+    ProfilingMiddleware,
+    TimingMiddleware,
+)
+from app.core.responses import FastJSONResponse
+from app.core.timing import TimedRoute
+from app.core.loop_monitor import loop_monitor
+from app.core.health_probes import health_probes
+from app.core.system_sampler import system_sampler
+from app.core.readiness import readiness
+from app.services.registry import ServiceRegistry
 
-# Setup logging
-setup_logging()
 logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan events"""
-    # Startup
+    # Startup; logging is configured here rather than at import so that
+    # importing the app (worker spawn, test collection) opens no files
+    setup_logging()
     logger.info("Starting up FastAPI application...")
     
     # Initialize database
@@ -30,11 +45,28 @@ async def lifespan(app: FastAPI):
         logger.error(f"Failed to initialize database: {e}")
         raise
     
+    # Services and repositories live for the whole worker
+    app.state.services = ServiceRegistry()
+    # Warm up in the background; /ready flips once it completes
+    readiness.start(app.state.services)
+    
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    health_probes.start()
+    system_sampler.start()
+    
     yield
     
     # Shutdown
     logger.info("Shutting down FastAPI application...")
+    await readiness.stop()
+    await app.state.services.close()
+    app.state.services = None
+    await loop_monitor.stop()
+    await health_probes.stop()
+    await system_sampler.stop()
     cassandra_manager.close()
+    mark_worker_dead(os.getpid())
 
 
 def create_application() -> FastAPI:
@@ -47,8 +79,16 @@ def create_application() -> FastAPI:
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         docs_url=f"{settings.API_V1_STR}/docs",
         redoc_url=f"{settings.API_V1_STR}/redoc",
+        default_response_class=FastJSONResponse,
         lifespan=lifespan
     )
+    app.router.route_class = TimedRoute
+
+    # Replay responses for repeated Idempotency-Key requests (innermost)
+    app.add_middleware(IdempotencyMiddleware)
+
+    # gzip/br/zstd for clients that accept it; stored idempotent responses stay uncompressed
+    app.add_middleware(CompressionMiddleware)
 
     # Add CORS middleware
     app.add_middleware(
@@ -57,6 +97,8 @@ def create_application() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        # Lets browser dashboards send the tag back in If-None-Match
+        expose_headers=["ETag"],
     )
 
     # Add trusted host middleware
@@ -65,32 +107,43 @@ def create_application() -> FastAPI:
         allowed_hosts=settings.ALLOWED_HOSTS
     )
 
+    # Per-request profiling (X-Profile header, admin token required)
+    app.add_middleware(ProfilingMiddleware)
+
+    # Request latency and in-flight metrics
+    app.add_middleware(PrometheusMiddleware)
+
     # Include API router
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
-    @app.middleware("http")
-    async def add_process_time_header(request: Request, call_next):
-        """Add processing time to response headers"""
-        start_time = time.time()
-        response = await call_next(request)
-        process_time = time.time() - start_time
-        response.headers["X-Process-Time"] = str(process_time)
-        return response
+    # Process time and Server-Timing breakdown (outermost)
+    app.add_middleware(TimingMiddleware)
 
     @app.exception_handler(Exception)
     async def global_exception_handler(request: Request, exc: Exception):
         """Global exception handler"""
         logger.error(f"Global exception: {exc}", exc_info=True)
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=500,
             content={"detail": "Internal server error"}
         )
 
     @app.get("/health")
     async def health_check():
-        """Health check endpoint"""
+        """Liveness: the worker's event loop is serving requests"""
         return {"status": "healthy", "version": settings.VERSION}
 
+    @app.get("/ready")
+    async def ready_check():
+        """Readiness: 503 until connection pools, statements and caches are warm"""
+        state = readiness.snapshot()
+        return FastJSONResponse(status_code=200 if readiness.ready else 503, content=state)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        """Prometheus metrics endpoint"""
+        return Response(content=render_metrics(), media_type=CONTENT_TYPE_LATEST)
+
     return app
 
 
@@ -0,0 +1 @@
+# Schema migrations package
@@ -0,0 +1,54 @@
+"""
+Schema migration command line
+
+    python -m app.migrations upgrade [--target N]
+    python -m app.migrations status
+"""
+import argparse
+import logging
+from typing import List, Optional
+from app.core.config import settings
+from app.core.database import cassandra_manager
+from app.migrations.runner import (
+    apply_migrations,
+    ensure_keyspace,
+    ensure_migrations_table,
+    get_applied_migrations,
+    load_migrations,
+)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(prog="python -m app.migrations", description="Cassandra schema migrations")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    upgrade = subcommands.add_parser("upgrade", help="Apply pending migrations")
+    upgrade.add_argument("--target", type=int, help="Stop after this version")
+    subcommands.add_parser("status", help="Show applied and pending migrations")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    session = cassandra_manager.connect(use_keyspace=False)
+    try:
+        ensure_keyspace(session)
+        session.set_keyspace(settings.CASSANDRA_KEYSPACE)
+        ensure_migrations_table(session)
+
+        if args.command == "upgrade":
+            applied = apply_migrations(session, target=args.target)
+            for migration in applied:
+                print(f"applied  {migration.name}")
+            if not applied:
+                print("Schema is up to date")
+        else:
+            applied = {row["version"]: row for row in get_applied_migrations(session)}
+            for migration in load_migrations():
+                row = applied.get(migration.version)
+                state = f"applied  {row['applied_at']:%Y-%m-%d %H:%M:%S}" if row else "pending"
+                print(f"{migration.name:<40} {state}")
+    finally:
+        cassandra_manager.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+import importlib
+import logging
+import pkgutil
+import re
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Optional
+from cassandra import InvalidRequest
+from cassandra.cluster import Session
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+VERSIONS_PACKAGE = "app.migrations.versions"
+MIGRATION_SCOPE = "app"
+_MODULE_PATTERN = re.compile(r"^(\d{4})_\w+$")
+
+
+class Migration(NamedTuple):
+    """A single ordered schema migration"""
+    version: int
+    name: str
+    description: str
+    upgrade: Callable[[Session], None]
+
+
+class SchemaVersionError(RuntimeError):
+    """Raised when the database schema is behind the application"""
+
+
+def load_migrations() -> List[Migration]:
+    """Load migration modules from the versions package, ordered by version"""
+    package = importlib.import_module(VERSIONS_PACKAGE)
+    migrations = []
+    for module_info in pkgutil.iter_modules(package.__path__):
+        match = _MODULE_PATTERN.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{VERSIONS_PACKAGE}.{module_info.name}")
+        migrations.append(Migration(
+            version=int(match.group(1)),
+            name=module_info.name,
+            description=getattr(module, "DESCRIPTION", module_info.name),
+            upgrade=module.upgrade
+        ))
+
+    migrations.sort(key=lambda migration: migration.version)
+    versions = [migration.version for migration in migrations]
+    if len(versions) != len(set(versions)):
+        raise ValueError(f"Duplicate migration versions in {VERSIONS_PACKAGE}")
+    return migrations
+
+
+def latest_version() -> int:
+    """Highest migration version shipped with the application"""
+    migrations = load_migrations()
+    return migrations[-1].version if migrations else 0
+
+
+def ensure_keyspace(session: Session):
+    """Create the application keyspace if it does not exist"""
+    session.execute(f"""
+        CREATE KEYSPACE IF NOT EXISTS {settings.CASSANDRA_KEYSPACE}
+        WITH REPLICATION = {{
+            'class': 'SimpleStrategy',
+            'replication_factor': 1
+        }}
+    """)
+
+
+def ensure_migrations_table(session: Session):
+    """Create the schema_migrations bookkeeping table"""
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            scope TEXT,
+            version INT,
+            name TEXT,
+            description TEXT,
+            applied_at TIMESTAMP,
+            PRIMARY KEY ((scope), version)
+        ) WITH CLUSTERING ORDER BY (version DESC)
+    """)
+
+
+def get_current_version(session: Session) -> int:
+    """Get the highest applied migration version (0 when nothing is applied)"""
+    try:
+        row = session.execute(
+            "SELECT version FROM schema_migrations WHERE scope = %s LIMIT 1",
+            (MIGRATION_SCOPE,)
+        ).one()
+    except InvalidRequest as e:
+        if "schema_migrations" in str(e):
+            return 0
+        raise
+    return row['version'] if row else 0
+
+
+def get_applied_migrations(session: Session) -> List[dict]:
+    """Get the applied migration history, newest first"""
+    rows = session.execute(
+        "SELECT version, name, description, applied_at FROM schema_migrations WHERE scope = %s",
+        (MIGRATION_SCOPE,)
+    )
+    return list(rows)
+
+
+def apply_migrations(session: Session, target: Optional[int] = None) -> List[Migration]:
+    """Apply pending migrations in order, up to and including target"""
+    ensure_migrations_table(session)
+    current = get_current_version(session)
+    pending = [
+        migration for migration in load_migrations()
+        if migration.version > current and (target is None or migration.version <= target)
+    ]
+
+    for migration in pending:
+        logger.info(f"Applying migration {migration.name}: {migration.description}")
+        try:
+            migration.upgrade(session)
+        except Exception as e:
+            logger.error(f"Migration {migration.name} failed: {e}")
+            raise
+        session.execute(
+            """
+                INSERT INTO schema_migrations (scope, version, name, description, applied_at)
+                VALUES (%s, %s, %s, %s, %s)
+            """,
+            (MIGRATION_SCOPE, migration.version, migration.name, migration.description, datetime.utcnow())
+        )
+    return pending
+
+
+def check_schema_version(session: Session) -> int:
+    """Verify the applied schema is at least the version this code expects"""
+    current = get_current_version(session)
+    expected = latest_version()
+    if current < expected:
+        raise SchemaVersionError(
+            f"Database schema is at version {current}, application requires {expected}; "
+            f"run `python -m app.migrations upgrade`"
+        )
+    return current
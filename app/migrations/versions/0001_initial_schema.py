@@ -0,0 +1,113 @@
+"""Baseline schema: the tables previously created on every application start"""
+
+DESCRIPTION = "initial schema"
+
+
+def upgrade(session):
+    """Create all required tables"""
+
+    # Sessions table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS sessions (
+            mobile_no TEXT,
+            device_id TEXT,
+            session_token TEXT,
+            user_id TEXT,
+            jwt_token TEXT,
+            fcm_token TEXT,
+            created_at TIMESTAMP,
+            expires_at TIMESTAMP,
+            is_active BOOLEAN,
+            updated_at TIMESTAMP,
+            PRIMARY KEY ((mobile_no, device_id), created_at)
+        ) WITH CLUSTERING ORDER BY (created_at DESC)
+    """)
+
+    # Users table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id TEXT PRIMARY KEY,
+            mobile_no TEXT,
+            email TEXT,
+            full_name TEXT,
+            state TEXT,
+            referral_code TEXT,
+            referred_by TEXT,
+            profile_data TEXT,
+            language_code TEXT,
+            language_name TEXT,
+            region_code TEXT,
+            timezone TEXT,
+            user_preferences TEXT,
+            status TEXT,
+            created_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+    """)
+
+    # Games table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS games (
+            id TEXT PRIMARY KEY,
+            name TEXT,
+            description TEXT,
+            category TEXT,
+            icon TEXT,
+            banner TEXT,
+            min_players INT,
+            max_players INT,
+            difficulty TEXT,
+            rating DOUBLE,
+            is_active BOOLEAN,
+            is_featured BOOLEAN,
+            tags LIST<TEXT>,
+            metadata MAP<TEXT, TEXT>,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    """)
+
+    # Contests table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS contests (
+            contest_id TEXT PRIMARY KEY,
+            contest_name TEXT,
+            contest_win_price TEXT,
+            contest_entryfee TEXT,
+            contest_joinuser INT,
+            contest_activeuser INT,
+            contest_starttime TEXT,
+            contest_endtime TEXT
+        )
+    """)
+
+    # OTP store table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS otp_store(
+            phone_or_email text,
+            otp_code text,
+            created_at TEXT,
+            expires_at TEXT,
+            purpose text,
+            is_verified boolean,
+            attempt_count int,
+            PRIMARY KEY ((phone_or_email), purpose, created_at)
+        ) WITH CLUSTERING ORDER BY (purpose ASC, created_at DESC)
+    """)
+
+    # League joins table
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS league_joins (
+            league_id TEXT,
+            status TEXT,
+            user_id TEXT,
+            id UUID,
+            joined_at TEXT,
+            updated_at TEXT,
+            invite_code TEXT,
+            role TEXT,
+            extra_data TEXT,
+            status_id TEXT,
+            PRIMARY KEY ((league_id, status), user_id, joined_at)
+        ) WITH CLUSTERING ORDER BY (user_id ASC, joined_at DESC)
+    """)
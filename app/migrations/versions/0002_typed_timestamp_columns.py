@@ -0,0 +1,9 @@
+"""Add TIMESTAMP shadow columns for the legacy TEXT timestamps"""
+from app.core.timestamp_migration import add_typed_columns
+
+DESCRIPTION = "typed timestamp columns"
+
+
+def upgrade(session):
+    """Add the *_ts columns; backfill separately with app.core.timestamp_migration"""
+    add_typed_columns(session)
@@ -0,0 +1,17 @@
+"""Stored results of requests sent with an Idempotency-Key header"""
+
+DESCRIPTION = "idempotency keys"
+
+
+def upgrade(session):
+    """Create the idempotency_keys table; rows expire through their write TTL"""
+    session.execute("""
+        CREATE TABLE IF NOT EXISTS idempotency_keys (
+            idempotency_key TEXT PRIMARY KEY,
+            fingerprint TEXT,
+            created_at TIMESTAMP,
+            status_code INT,
+            headers TEXT,
+            body BLOB
+        )
+    """)
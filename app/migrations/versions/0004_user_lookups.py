@@ -0,0 +1,32 @@
+"""Lookup tables that own each user's mobile number and email"""
+import logging
+from app.core.token_scanner import scan_table
+
+logger = logging.getLogger(__name__)
+
+DESCRIPTION = "user mobile and email lookups"
+
+# Unique users column -> lookup table keyed by it
+USER_LOOKUPS = {"mobile_no": "users_by_mobile", "email": "users_by_email"}
+
+
+def upgrade(session):
+    """Create the lookup tables and fill them from the existing users"""
+    for column, table in USER_LOOKUPS.items():
+        session.execute(f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                {column} TEXT PRIMARY KEY,
+                user_id TEXT
+            )
+        """)
+
+    claims = {
+        column: session.prepare(f"INSERT INTO {table} ({column}, user_id) VALUES (?, ?) IF NOT EXISTS")
+        for column, table in USER_LOOKUPS.items()
+    }
+    for row in scan_table(session, "users", ("id",), ("id", *USER_LOOKUPS)):
+        for column, statement in claims.items():
+            if not row[column]:
+                continue
+            if not session.execute(statement, (row[column], row["id"])).was_applied:
+                logger.warning(f"users.{column} {row[column]!r} of {row['id']} is already owned by another user")
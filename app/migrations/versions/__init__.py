@@ -0,0 +1 @@
+# Ordered migration files: NNNN_description.py
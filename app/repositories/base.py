@@ -0,0 +1,208 @@
+import asyncio
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional, Sequence, Set
+from cassandra import ConsistencyLevel
+from cassandra.cluster import ResultSet, Session
+from app.core.database import cassandra_manager, execute_async, get_cassandra_session
+from app.core.execution_profiles import DEFAULT, DURABLE_WRITE, resolve_consistency
+from app.core.metrics import CASSANDRA_QUERY_DURATION, CASSANDRA_QUERY_ERRORS
+from app.core.query_metrics import query_metrics
+from app.core.slow_query_log import slow_query_log
+from app.core.timing import add_db_time
+from app.core.config import settings
+from app.core.timestamps import TYPED_TIMESTAMP_COLUMNS, resolve_row_timestamps
+
+logger = logging.getLogger(__name__)
+
+# Key used by synthetic warmup lookups; no real entity has it
+WARMUP_KEY = "__warmup__"
+
+# Set while warmup walks repository methods to prepare their statements
+_prepare_only: ContextVar[bool] = ContextVar("repository_prepare_only", default=False)
+
+# Column lists prepared for projected reads, per table
+_projections: Dict[str, Set[str]] = {}
+
+
+class _EmptyResult(list):
+    """Stand-in result for statements prepared but not executed"""
+
+    was_applied = False
+
+    def one(self):
+        return None
+
+
+def write_timestamp() -> int:
+    """Cassandra write timestamp (microseconds since the epoch) for now
+
+    Taken just before reading a row that is about to be updated, and passed
+    to the update's USING TIMESTAMP.
+    """
+    return time.time_ns() // 1000
+
+
+class BaseRepository:
+    """Shared statement execution for Cassandra repositories
+
+    Statements are prepared once per process, so the driver knows each
+    query's routing key and the token-aware policy can send it straight to a
+    replica. Callers pick a named execution profile per call; the consistency
+    policy in settings can override its level per operation, where an
+    operation is "<table>.<method>". Each repository method names its own
+    operation explicitly, so helpers it calls are counted and configured
+    under the public method and renaming a helper changes nothing.
+
+    Repositories are application-scoped: one instance per worker, built in
+    the lifespan once the database is connected (see ServiceRegistry).
+    """
+
+    # Table whose legacy TEXT timestamps are resolved in _row_to_dict
+    table: Optional[str] = None
+
+    def __init__(self):
+        self.session: Session = get_cassandra_session()
+
+    async def warmup(self):
+        """Prepare statements and run synthetic queries before the worker takes traffic"""
+
+    async def flush(self):
+        """Write out anything buffered in memory"""
+
+    async def close(self):
+        """Release resources held by the repository"""
+
+    async def _prepare_statements(self, *calls: Awaitable):
+        """Await repository calls with their statements prepared but not executed
+
+        Walking the real methods prepares exactly the statement text they
+        use. A statement that fails to prepare is logged and skipped.
+        """
+        token = _prepare_only.set(True)
+        try:
+            for call in calls:
+                try:
+                    await call
+                except Exception as e:
+                    logger.warning("Warmup could not prepare a %s statement: %s", self.table, e)
+        finally:
+            _prepare_only.reset(token)
+
+    def _columns(self, fields: Optional[Sequence[str]] = None) -> str:
+        """Column list for a SELECT that only needs the given response fields
+
+        Each distinct list is its own prepared statement, so a table gets at
+        most FIELD_PROJECTION_MAX_STATEMENTS of them; past that the read falls
+        back to * and the response layer drops the extra columns.
+        """
+        if not fields:
+            return "*"
+        typed = TYPED_TIMESTAMP_COLUMNS.get(self.table, {})
+        columns = []
+        for field in fields:
+            if not field.isidentifier():
+                raise ValueError(f"Invalid field name: {field!r}")
+            columns.append(field)
+            if field in typed:
+                # Read both copies; _row_to_dict picks one per the migration phase
+                columns.append(typed[field])
+        column_list = ", ".join(columns)
+        prepared = _projections.setdefault(self.table, set())
+        if column_list not in prepared:
+            if len(prepared) >= settings.FIELD_PROJECTION_MAX_STATEMENTS:
+                return "*"
+            prepared.add(column_list)
+        return column_list
+
+    def _row_to_dict(self, row) -> Optional[dict]:
+        """Finish a driver row for the service layer
+
+        Every execution profile uses dict_factory, so rows already arrive as
+        dictionaries; only legacy TEXT timestamps are resolved, in place.
+        """
+        if row is not None and self.table in TYPED_TIMESTAMP_COLUMNS:
+            resolve_row_timestamps(self.table, row)
+        return row
+
+    async def _update_row(
+        self,
+        key: Dict[str, Any],
+        changes: Dict[str, Any],
+        read_at: int,
+        profile=DURABLE_WRITE,
+        *,
+        operation: str
+    ) -> None:
+        """Write changed columns of a row the caller read at read_at
+
+        The UPDATE is a plain write stamped USING TIMESTAMP read_at, not a
+        lightweight transaction: a delete issued after the read is newer and
+        still wins, so the row is not recreated with only the changed
+        columns, and no Paxos round mixes with the table's plain writes.
+        Callers build their response from the row they read plus the changes,
+        so an update costs one read and one write.
+        """
+        query = (
+            f"UPDATE {self.table} USING TIMESTAMP ? SET {', '.join(f'{column} = ?' for column in changes)} "
+            f"WHERE {' AND '.join(f'{column} = ?' for column in key)}"
+        )
+        await self._execute(query, (read_at, *changes.values(), *key.values()), profile=profile, operation=operation)
+
+    async def _execute(
+        self,
+        query: str,
+        params: Sequence = (),
+        profile=DEFAULT,
+        *,
+        operation: str
+    ) -> ResultSet:
+        """Execute a query as a prepared statement under an execution profile
+
+        operation is the calling repository method's name; metrics, the slow
+        query log and the consistency policy see it as "<table>.<operation>".
+        The request runs on the driver's I/O thread while the event loop serves
+        other requests; only the first page is awaited (see execute_async).
+        """
+        operation = f"{self.table}.{operation}"
+        prepared = cassandra_manager.prepare(query)
+        if _prepare_only.get():
+            return _EmptyResult()
+        statement = prepared.bind(params)
+        consistency = resolve_consistency(operation)
+        if consistency is not None:
+            statement.consistency_level = consistency
+        else:
+            consistency = self.session.get_execution_profile(profile).consistency_level
+
+        traced = slow_query_log.should_trace()
+        started = time.perf_counter_ns()
+        result = error = None
+        try:
+            result = await execute_async(self.session, statement, execution_profile=profile, trace=traced)
+            return result
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            elapsed_ns = time.perf_counter_ns() - started
+            add_db_time(elapsed_ns)
+            level = ConsistencyLevel.value_to_name.get(consistency)
+            query_metrics.record(
+                operation,
+                elapsed_ns / 1e6,
+                consistency_level=level,
+                profile=profile if isinstance(profile, str) else "default",
+                error=error is not None
+            )
+            CASSANDRA_QUERY_DURATION.labels(operation, level or "unknown").observe(elapsed_ns / 1e9)
+            if error is not None:
+                CASSANDRA_QUERY_ERRORS.labels(operation).inc()
+            if slow_query_log.is_slow(elapsed_ns / 1e6):
+                record = (operation, query, params, elapsed_ns / 1e6, level)
+                if traced and result is not None:
+                    # Fetching the trace waits on the database
+                    await asyncio.to_thread(slow_query_log.record, *record, result=result, error=error, traced=traced)
+                else:
+                    slow_query_log.record(*record, result=result, error=error, traced=traced)
@@ -1,51 +1,52 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import datetime
-from cassandra.cluster import Session
 from app.schemas.contest import ContestCreate, ContestUpdate
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import timestamp_filter, timestamp_write_values, to_timestamp
 
 logger = logging.getLogger(__name__)
 
 
-class ContestRepository:
+class ContestRepository(BaseRepository):
     """Contest data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "contests"
     
-    def _row_to_dict(self, row) -> dict:
-        """Convert Cassandra row to dictionary"""
-        if row is None:
-            return None
-        return {column: getattr(row, column) for column in row._fields}
+    async def warmup(self):
+        """Prepare the contest reads and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_all_contests(),
+        )
+        await self.get_contest_by_id(WARMUP_KEY)
     
-    async def get_all_contests(self, limit: int = 100) -> List[dict]:
+    async def get_all_contests(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all contests with pagination"""
         try:
-            query = "SELECT * FROM contests LIMIT %s"
-            rows = self.session.execute(query, (limit,))
+            query = f"SELECT {self._columns(fields)} FROM contests LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_all_contests")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting all contests: {e}")
             raise
     
-    async def get_contest_by_id(self, contest_id: str) -> Optional[dict]:
+    async def get_contest_by_id(self, contest_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get contest by ID"""
         try:
-            query = "SELECT * FROM contests WHERE contest_id = %s"
-            row = self.session.execute(query, (contest_id,)).one()
+            query = f"SELECT {self._columns(fields)} FROM contests WHERE contest_id = ?"
+            row = (await self._execute(query, (contest_id,), operation="get_contest_by_id")).one()
             return self._row_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting contest by ID {contest_id}: {e}")
             raise
     
-    async def get_active_contests(self, limit: int = 50) -> List[dict]:
+    async def get_active_contests(self, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get active contests (where end time is in the future)"""
         try:
-            query = "SELECT * FROM contests WHERE contest_endtime > %s LIMIT %s"
-            current_time = datetime.utcnow().isoformat()
-            rows = self.session.execute(query, (current_time, limit))
+            column, current_time = timestamp_filter("contests", "contest_endtime", datetime.utcnow())
+            query = f"SELECT {self._columns(fields)} FROM contests WHERE {column} > ? LIMIT ? ALLOW FILTERING"
+            rows = await self._execute(query, (current_time, limit), profile=FAST_READ, operation="get_active_contests")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting active contests: {e}")
@@ -56,23 +57,26 @@ class ContestRepository:
         try:
             now = datetime.utcnow()
             contest_id = f"contest_{now.timestamp()}_{hash(contest_data.contest_name)}"
+            timestamps = timestamp_write_values("contests", {
+                "contest_starttime": contest_data.contest_starttime,
+                "contest_endtime": contest_data.contest_endtime
+            })
             
-            query = """
+            query = f"""
                 INSERT INTO contests (
                     contest_id, contest_name, contest_win_price, contest_entryfee,
-                    contest_joinuser, contest_activeuser, contest_starttime, contest_endtime
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    contest_joinuser, contest_activeuser, {', '.join(timestamps)}
+                ) VALUES ({', '.join(['?'] * (6 + len(timestamps)))})
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 contest_id,
                 contest_data.contest_name,
                 contest_data.contest_win_price,
                 contest_data.contest_entryfee,
                 contest_data.contest_joinuser,
                 contest_data.contest_activeuser,
-                contest_data.contest_starttime,
-                contest_data.contest_endtime
-            ))
+                *timestamps.values()
+            ), profile=DURABLE_WRITE, operation="create_contest")
             
             # Return the created contest
             return {
@@ -82,62 +86,30 @@ class ContestRepository:
                 "contest_entryfee": contest_data.contest_entryfee,
                 "contest_joinuser": contest_data.contest_joinuser,
                 "contest_activeuser": contest_data.contest_activeuser,
-                "contest_starttime": contest_data.contest_starttime,
-                "contest_endtime": contest_data.contest_endtime
+                "contest_starttime": timestamps["contest_starttime_ts"],
+                "contest_endtime": timestamps["contest_endtime_ts"]
             }
         except Exception as e:
             logger.error(f"Error creating contest: {e}")
             raise
     
-    async def update_contest(self, contest_id: str, contest_data: ContestUpdate) -> Optional[dict]:
-        """Update an existing contest"""
+    async def update_contest(self, contest_id: str, contest_data: ContestUpdate, read_at: int) -> dict:
+        """Update a contest read at read_at (see BaseRepository._update_row)
+
+        Returns the changed fields (empty when there are none).
+        """
         try:
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            
-            if contest_data.contest_name is not None:
-                update_fields.append("contest_name = %s")
-                values.append(contest_data.contest_name)
-            
-            if contest_data.contest_win_price is not None:
-                update_fields.append("contest_win_price = %s")
-                values.append(contest_data.contest_win_price)
-            
-            if contest_data.contest_entryfee is not None:
-                update_fields.append("contest_entryfee = %s")
-                values.append(contest_data.contest_entryfee)
-            
-            if contest_data.contest_joinuser is not None:
-                update_fields.append("contest_joinuser = %s")
-                values.append(contest_data.contest_joinuser)
-            
-            if contest_data.contest_activeuser is not None:
-                update_fields.append("contest_activeuser = %s")
-                values.append(contest_data.contest_activeuser)
-            
-            if contest_data.contest_starttime is not None:
-                update_fields.append("contest_starttime = %s")
-                values.append(contest_data.contest_starttime)
-            
-            if contest_data.contest_endtime is not None:
-                update_fields.append("contest_endtime = %s")
-                values.append(contest_data.contest_endtime)
-            
-            if not update_fields:
-                return None
-            
-            query = f"""
-                UPDATE contests 
-                SET {', '.join(update_fields)}
-                WHERE contest_id = %s
-            """
-            values.append(contest_id)
-            
-            self.session.execute(query, values)
-            
-            # Return updated contest
-            return await self.get_contest_by_id(contest_id)
+            changes = contest_data.model_dump(exclude_none=True)
+            timestamps = {
+                column: to_timestamp(changes.pop(column))
+                for column in ("contest_starttime", "contest_endtime")
+                if column in changes
+            }
+            columns = {**changes, **timestamp_write_values("contests", timestamps)}
+            if not columns:
+                return {}
+            await self._update_row({"contest_id": contest_id}, columns, read_at, operation="update_contest")
+            return {**changes, **timestamps}
         except Exception as e:
             logger.error(f"Error updating contest {contest_id}: {e}")
             raise
@@ -145,8 +117,8 @@ class ContestRepository:
     async def delete_contest(self, contest_id: str) -> bool:
         """Delete a contest"""
         try:
-            query = "DELETE FROM contests WHERE contest_id = %s"
-            self.session.execute(query, (contest_id,))
+            query = "DELETE FROM contests WHERE contest_id = ?"
+            await self._execute(query, (contest_id,), profile=DURABLE_WRITE, operation="delete_contest")
             return True
         except Exception as e:
             logger.error(f"Error deleting contest {contest_id}: {e}")
@@ -155,8 +127,8 @@ class ContestRepository:
     async def increment_join_user(self, contest_id: str) -> bool:
         """Increment the number of users who joined the contest"""
         try:
-            query = "UPDATE contests SET contest_joinuser = contest_joinuser + 1 WHERE contest_id = %s"
-            self.session.execute(query, (contest_id,))
+            query = "UPDATE contests SET contest_joinuser = contest_joinuser + 1 WHERE contest_id = ?"
+            await self._execute(query, (contest_id,), profile=DURABLE_WRITE, operation="increment_join_user")
             return True
         except Exception as e:
             logger.error(f"Error incrementing join user for contest {contest_id}: {e}")
@@ -165,8 +137,8 @@ class ContestRepository:
     async def increment_active_user(self, contest_id: str) -> bool:
         """Increment the number of active users in the contest"""
         try:
-            query = "UPDATE contests SET contest_activeuser = contest_activeuser + 1 WHERE contest_id = %s"
-            self.session.execute(query, (contest_id,))
+            query = "UPDATE contests SET contest_activeuser = contest_activeuser + 1 WHERE contest_id = ?"
+            await self._execute(query, (contest_id,), profile=DURABLE_WRITE, operation="increment_active_user")
             return True
         except Exception as e:
             logger.error(f"Error incrementing active user for contest {contest_id}: {e}")
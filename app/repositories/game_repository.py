@@ -1,25 +1,33 @@
 import logging
 from typing import List, Optional
-from datetime import datetime
-from cassandra.cluster import Session
 from app.schemas.game import GameCreate, GameUpdate
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import timestamp_write_values, utcnow
 
 logger = logging.getLogger(__name__)
 
 
-class GameRepository:
+class GameRepository(BaseRepository):
     """Game data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "games"
+    
+    async def warmup(self):
+        """Prepare the game reads and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_all_games(),
+            self.get_featured_games(),
+            self.get_games_by_category(WARMUP_KEY),
+        )
+        await self.get_game_by_id(WARMUP_KEY)
     
     async def get_all_games(self, limit: int = 100) -> List[dict]:
         """Get all games"""
         try:
-            query = "SELECT * FROM games LIMIT %s"
-            rows = self.session.execute(query, (limit,))
-            return [dict(row) for row in rows]
+            query = "SELECT * FROM games LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_all_games")
+            return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting all games: {e}")
             raise
@@ -27,9 +35,9 @@ class GameRepository:
     async def get_game_by_id(self, game_id: str) -> Optional[dict]:
         """Get game by ID"""
         try:
-            query = "SELECT * FROM games WHERE id = %s"
-            row = self.session.execute(query, (game_id,)).one()
-            return dict(row) if row else None
+            query = "SELECT * FROM games WHERE id = ?"
+            row = (await self._execute(query, (game_id,), operation="get_game_by_id")).one()
+            return self._row_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting game by ID {game_id}: {e}")
             raise
@@ -37,9 +45,9 @@ class GameRepository:
     async def get_active_games(self, limit: int = 100) -> List[dict]:
         """Get active games"""
         try:
-            query = "SELECT * FROM games WHERE is_active = true LIMIT %s"
-            rows = self.session.execute(query, (limit,))
-            return [dict(row) for row in rows]
+            query = "SELECT * FROM games WHERE is_active = true LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_active_games")
+            return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting active games: {e}")
             raise
@@ -47,9 +55,9 @@ class GameRepository:
     async def get_featured_games(self, limit: int = 50) -> List[dict]:
         """Get featured games"""
         try:
-            query = "SELECT * FROM games WHERE is_featured = true LIMIT %s"
-            rows = self.session.execute(query, (limit,))
-            return [dict(row) for row in rows]
+            query = "SELECT * FROM games WHERE is_featured = true LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_featured_games")
+            return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting featured games: {e}")
             raise
@@ -57,9 +65,9 @@ class GameRepository:
     async def get_games_by_category(self, category: str, limit: int = 50) -> List[dict]:
         """Get games by category"""
         try:
-            query = "SELECT * FROM games WHERE category = %s LIMIT %s"
-            rows = self.session.execute(query, (category, limit))
-            return [dict(row) for row in rows]
+            query = "SELECT * FROM games WHERE category = ? LIMIT ?"
+            rows = await self._execute(query, (category, limit), profile=FAST_READ, operation="get_games_by_category")
+            return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting games by category {category}: {e}")
             raise
@@ -67,18 +75,19 @@ class GameRepository:
     async def create_game(self, game_data: GameCreate) -> dict:
         """Create a new game"""
         try:
-            now = datetime.utcnow().isoformat()
-            game_id = f"game_{now}_{hash(game_data.name)}"
+            now = utcnow()
+            game_id = f"game_{now.isoformat()}_{hash(game_data.name)}"
+            timestamps = timestamp_write_values("games", {"created_at": now, "updated_at": now})
             
-            query = """
+            query = f"""
                 INSERT INTO games (
                     id, name, description, category, icon, banner,
                     min_players, max_players, difficulty, rating,
                     is_active, is_featured, tags, metadata,
-                    created_at, updated_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    {', '.join(timestamps)}
+                ) VALUES ({', '.join(['?'] * (14 + len(timestamps)))})
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 game_id,
                 game_data.name,
                 game_data.description,
@@ -93,9 +102,8 @@ class GameRepository:
                 game_data.is_featured,
                 game_data.tags or [],
                 game_data.metadata or {},
-                now,
-                now
-            ))
+                *timestamps.values()
+            ), profile=DURABLE_WRITE, operation="create_game")
             
             # Return the created game
             return {
@@ -120,84 +128,17 @@ class GameRepository:
             logger.error(f"Error creating game: {e}")
             raise
     
-    async def update_game(self, game_id: str, game_data: GameUpdate) -> Optional[dict]:
-        """Update an existing game"""
+    async def update_game(self, game_id: str, game_data: GameUpdate, read_at: int) -> dict:
+        """Update a game read at read_at (see BaseRepository._update_row)
+
+        Returns the changed fields.
+        """
         try:
-            now = datetime.utcnow().isoformat()
-            
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            
-            if game_data.name is not None:
-                update_fields.append("name = %s")
-                values.append(game_data.name)
-            
-            if game_data.description is not None:
-                update_fields.append("description = %s")
-                values.append(game_data.description)
-            
-            if game_data.category is not None:
-                update_fields.append("category = %s")
-                values.append(game_data.category)
-            
-            if game_data.icon is not None:
-                update_fields.append("icon = %s")
-                values.append(game_data.icon)
-            
-            if game_data.banner is not None:
-                update_fields.append("banner = %s")
-                values.append(game_data.banner)
-            
-            if game_data.min_players is not None:
-                update_fields.append("min_players = %s")
-                values.append(game_data.min_players)
-            
-            if game_data.max_players is not None:
-                update_fields.append("max_players = %s")
-                values.append(game_data.max_players)
-            
-            if game_data.difficulty is not None:
-                update_fields.append("difficulty = %s")
-                values.append(game_data.difficulty)
-            
-            if game_data.rating is not None:
-                update_fields.append("rating = %s")
-                values.append(game_data.rating)
-            
-            if game_data.is_active is not None:
-                update_fields.append("is_active = %s")
-                values.append(game_data.is_active)
-            
-            if game_data.is_featured is not None:
-                update_fields.append("is_featured = %s")
-                values.append(game_data.is_featured)
-            
-            if game_data.tags is not None:
-                update_fields.append("tags = %s")
-                values.append(game_data.tags)
-            
-            if game_data.metadata is not None:
-                update_fields.append("metadata = %s")
-                values.append(game_data.metadata)
-            
-            update_fields.append("updated_at = %s")
-            values.append(now)
-            
-            if not update_fields:
-                return None
-            
-            query = f"""
-                UPDATE games 
-                SET {', '.join(update_fields)}
-                WHERE id = %s
-            """
-            values.append(game_id)
-            
-            self.session.execute(query, values)
-            
-            # Return updated game
-            return await self.get_game_by_id(game_id)
+            now = utcnow()
+            changes = game_data.model_dump(exclude_none=True)
+            columns = {**changes, **timestamp_write_values("games", {"updated_at": now})}
+            await self._update_row({"id": game_id}, columns, read_at, operation="update_game")
+            return {**changes, "updated_at": now}
         except Exception as e:
             logger.error(f"Error updating game {game_id}: {e}")
             raise
@@ -205,8 +146,8 @@ class GameRepository:
     async def delete_game(self, game_id: str) -> bool:
         """Delete a game"""
         try:
-            query = "DELETE FROM games WHERE id = %s"
-            self.session.execute(query, (game_id,))
+            query = "DELETE FROM games WHERE id = ?"
+            await self._execute(query, (game_id,), profile=DURABLE_WRITE, operation="delete_game")
             return True
         except Exception as e:
             logger.error(f"Error deleting game {game_id}: {e}")
@@ -0,0 +1,88 @@
+import logging
+from datetime import datetime
+from typing import Optional
+from app.core.execution_profiles import DURABLE_WRITE
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import utcnow
+
+logger = logging.getLogger(__name__)
+
+
+class IdempotencyRepository(BaseRepository):
+    """Idempotency-Key records for Cassandra
+
+    A key is claimed with a lightweight transaction before the request runs,
+    under a short lease TTL, and completed with the response afterwards. The
+    completing write is conditional on the claim's fingerprint too, so Paxos
+    orders it after the claim; it rewrites the whole row under the full TTL
+    and never resurrects a claim that expired or was released.
+    """
+
+    table = "idempotency_keys"
+
+    async def warmup(self):
+        """Prepare the claim, complete and release statements"""
+        await self._prepare_statements(
+            self.claim(WARMUP_KEY, "", utcnow(), 1),
+            self.complete(WARMUP_KEY, "", utcnow(), 0, "[]", b"", 1),
+            self.release(WARMUP_KEY),
+        )
+
+    async def claim(self, key: str, fingerprint: str, created_at: datetime, ttl: int) -> Optional[dict]:
+        """Claim a key for a new request
+
+        Returns None when the key was free and is now claimed, otherwise the
+        existing record (status_code is None while its request is running).
+        """
+        try:
+            query = """
+                INSERT INTO idempotency_keys (idempotency_key, fingerprint, created_at)
+                VALUES (?, ?, ?) IF NOT EXISTS USING TTL ?
+            """
+            result = await self._execute(query, (key, fingerprint, created_at, ttl), profile=DURABLE_WRITE, operation="claim")
+            if result.was_applied:
+                return None
+            return result.one()
+        except Exception as e:
+            logger.error(f"Error claiming idempotency key {key}: {e}")
+            raise
+
+    async def complete(
+        self,
+        key: str,
+        fingerprint: str,
+        created_at: datetime,
+        status_code: int,
+        headers: str,
+        body: bytes,
+        ttl: int
+    ) -> bool:
+        """Store the response of a claimed key; False when the claim is gone"""
+        try:
+            query = """
+                UPDATE idempotency_keys USING TTL ?
+                SET fingerprint = ?, created_at = ?, status_code = ?, headers = ?, body = ?
+                WHERE idempotency_key = ?
+                IF fingerprint = ?
+            """
+            result = await self._execute(
+                query,
+                (ttl, fingerprint, created_at, status_code, headers, body, key, fingerprint),
+                profile=DURABLE_WRITE,
+                operation="complete"
+            )
+            return result.was_applied
+        except Exception as e:
+            logger.error(f"Error completing idempotency key {key}: {e}")
+            raise
+
+    async def release(self, key: str) -> bool:
+        """Forget a claimed key so the request can be retried"""
+        try:
+            # Conditional like the claim, so the delete is ordered after it
+            query = "DELETE FROM idempotency_keys WHERE idempotency_key = ? IF EXISTS"
+            await self._execute(query, (key,), profile=DURABLE_WRITE, operation="release")
+            return True
+        except Exception as e:
+            logger.error(f"Error releasing idempotency key {key}: {e}")
+            raise
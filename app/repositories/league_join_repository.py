@@ -1,81 +1,90 @@
 import logging
-from typing import List, Optional
-from datetime import datetime
+from typing import List, Optional, Sequence
 from uuid import uuid4
-from cassandra.cluster import Session
 from app.schemas.league_join import LeagueJoinCreate, LeagueJoinUpdate
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import BULK_SCAN, DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import timestamp_write_values, utcnow
 
 logger = logging.getLogger(__name__)
 
 
-class LeagueJoinRepository:
+class LeagueJoinRepository(BaseRepository):
     """League join data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "league_joins"
     
-    def _row_to_dict(self, row) -> dict:
-        """Convert Cassandra row to dictionary"""
-        if row is None:
-            return None
-        return {column: getattr(row, column) for column in row._fields}
+    async def warmup(self):
+        """Prepare the league join reads and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_all_league_joins(),
+            self.get_league_joins_by_league_id(WARMUP_KEY),
+            self.get_user_league_joins(WARMUP_KEY),
+            self.get_league_join_by_user_and_league(WARMUP_KEY, WARMUP_KEY),
+            self.get_league_joins_by_invite_code(WARMUP_KEY),
+            self.get_league_member_count(WARMUP_KEY),
+        )
+        await self.get_league_joins_by_status(WARMUP_KEY, "active")
     
-    async def get_all_league_joins(self, limit: int = 100) -> List[dict]:
+    async def get_all_league_joins(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all league joins with pagination"""
         try:
-            query = "SELECT * FROM league_joins LIMIT %s"
-            rows = self.session.execute(query, (limit,))
+            query = f"SELECT {self._columns(fields)} FROM league_joins LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_all_league_joins")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting all league joins: {e}")
             raise
     
-    async def get_league_joins_by_league_id(self, league_id: str, limit: int = 50) -> List[dict]:
+    async def get_league_joins_by_league_id(self, league_id: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all joins for a specific league"""
         try:
-            query = "SELECT * FROM league_joins WHERE league_id = %s LIMIT %s"
-            rows = self.session.execute(query, (league_id, limit))
+            query = f"SELECT {self._columns(fields)} FROM league_joins WHERE league_id = ? LIMIT ?"
+            rows = await self._execute(query, (league_id, limit), profile=FAST_READ, operation="get_league_joins_by_league_id")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting league joins for league {league_id}: {e}")
             raise
     
-    async def get_league_joins_by_status(self, league_id: str, status: str, limit: int = 50) -> List[dict]:
+    async def get_league_joins_by_status(self, league_id: str, status: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get league joins by status for a specific league"""
         try:
-            query = "SELECT * FROM league_joins WHERE league_id = %s AND status = %s LIMIT %s"
-            rows = self.session.execute(query, (league_id, status, limit))
+            query = f"SELECT {self._columns(fields)} FROM league_joins WHERE league_id = ? AND status = ? LIMIT ?"
+            rows = await self._execute(query, (league_id, status, limit), profile=FAST_READ, operation="get_league_joins_by_status")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting league joins by status {status} for league {league_id}: {e}")
             raise
     
-    async def get_user_league_joins(self, user_id: str, limit: int = 50) -> List[dict]:
+    async def get_user_league_joins(self, user_id: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all league joins for a specific user"""
         try:
-            query = "SELECT * FROM league_joins WHERE user_id = %s LIMIT %s"
-            rows = self.session.execute(query, (user_id, limit))
+            query = f"SELECT {self._columns(fields)} FROM league_joins WHERE user_id = ? LIMIT ?"
+            rows = await self._execute(query, (user_id, limit), profile=FAST_READ, operation="get_user_league_joins")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting league joins for user {user_id}: {e}")
             raise
     
-    async def get_league_join_by_user_and_league(self, user_id: str, league_id: str) -> Optional[dict]:
+    async def _get_join_row(self, user_id: str, league_id: str, operation: str, fields: Optional[Sequence[str]] = None):
+        """Get the raw league join row, keeping the TEXT joined_at key intact"""
+        query = f"SELECT {self._columns(fields)} FROM league_joins WHERE league_id = ? AND user_id = ? LIMIT 1"
+        return (await self._execute(query, (league_id, user_id), operation=operation)).one()
+    
+    async def get_league_join_by_user_and_league(self, user_id: str, league_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get specific league join by user and league"""
         try:
-            query = "SELECT * FROM league_joins WHERE league_id = %s AND user_id = %s LIMIT 1"
-            row = self.session.execute(query, (league_id, user_id)).one()
+            row = await self._get_join_row(user_id, league_id, "get_league_join_by_user_and_league", fields)
             return self._row_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting league join for user {user_id} in league {league_id}: {e}")
             raise
     
-    async def get_league_joins_by_invite_code(self, invite_code: str, limit: int = 50) -> List[dict]:
+    async def get_league_joins_by_invite_code(self, invite_code: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get league joins by invite code"""
         try:
-            query = "SELECT * FROM league_joins WHERE invite_code = %s LIMIT %s"
-            rows = self.session.execute(query, (invite_code, limit))
+            query = f"SELECT {self._columns(fields)} FROM league_joins WHERE invite_code = ? LIMIT ?"
+            rows = await self._execute(query, (invite_code, limit), profile=FAST_READ, operation="get_league_joins_by_invite_code")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting league joins by invite code {invite_code}: {e}")
@@ -84,26 +93,26 @@ class LeagueJoinRepository:
     async def create_league_join(self, join_data: LeagueJoinCreate) -> dict:
         """Create a new league join"""
         try:
-            now = datetime.utcnow()
+            now = utcnow()
             join_id = uuid4()
+            timestamps = timestamp_write_values("league_joins", {"joined_at": now, "updated_at": now})
             
-            query = """
+            query = f"""
                 INSERT INTO league_joins (
-                    league_id, status, user_id, id, joined_at, updated_at,
-                    invite_code, role, extra_data
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                    league_id, status, user_id, id, invite_code, role, extra_data,
+                    {', '.join(timestamps)}
+                ) VALUES ({', '.join(['?'] * (7 + len(timestamps)))})
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 join_data.league_id,
                 join_data.status,
                 join_data.user_id,
                 join_id,
-                now.isoformat(),
-                now.isoformat(),
                 join_data.invite_code,
                 join_data.role,
-                join_data.extra_data
-            ))
+                join_data.extra_data,
+                *timestamps.values()
+            ), profile=DURABLE_WRITE, operation="create_league_join")
             
             # Return the created league join
             return {
@@ -111,8 +120,8 @@ class LeagueJoinRepository:
                 "status": join_data.status,
                 "user_id": join_data.user_id,
                 "id": join_id,
-                "joined_at": now.isoformat(),
-                "updated_at": now.isoformat(),
+                "joined_at": now,
+                "updated_at": now,
                 "invite_code": join_data.invite_code,
                 "role": join_data.role,
                 "extra_data": join_data.extra_data
@@ -129,28 +138,29 @@ class LeagueJoinRepository:
             values = []
             
             if join_data.status is not None:
-                update_fields.append("status = %s")
+                update_fields.append("status = ?")
                 values.append(join_data.status)
             
             if join_data.invite_code is not None:
-                update_fields.append("invite_code = %s")
+                update_fields.append("invite_code = ?")
                 values.append(join_data.invite_code)
             
             if join_data.role is not None:
-                update_fields.append("role = %s")
+                update_fields.append("role = ?")
                 values.append(join_data.role)
             
             if join_data.extra_data is not None:
-                update_fields.append("extra_data = %s")
+                update_fields.append("extra_data = ?")
                 values.append(join_data.extra_data)
             
             if join_data.status_id is not None:
-                update_fields.append("status_id = %s")
+                update_fields.append("status_id = ?")
                 values.append(join_data.status_id)
             
             # Always update the updated_at field
-            update_fields.append("updated_at = %s")
-            values.append(datetime.utcnow().isoformat())
+            for column, value in timestamp_write_values("league_joins", {"updated_at": utcnow()}).items():
+                update_fields.append(f"{column} = ?")
+                values.append(value)
             
             if not update_fields:
                 return None
@@ -158,11 +168,11 @@ class LeagueJoinRepository:
             query = f"""
                 UPDATE league_joins 
                 SET {', '.join(update_fields)}
-                WHERE league_id = %s AND status = %s AND user_id = %s AND joined_at = %s
+                WHERE league_id = ? AND status = ? AND user_id = ? AND joined_at = ?
             """
             values.extend([league_id, status, user_id, joined_at])
             
-            self.session.execute(query, values)
+            await self._execute(query, values, profile=DURABLE_WRITE, operation="update_league_join")
             
             # Return updated league join
             return await self.get_league_join_by_user_and_league(user_id, league_id)
@@ -175,9 +185,9 @@ class LeagueJoinRepository:
         try:
             query = """
                 DELETE FROM league_joins 
-                WHERE league_id = %s AND status = %s AND user_id = %s AND joined_at = %s
+                WHERE league_id = ? AND status = ? AND user_id = ? AND joined_at = ?
             """
-            self.session.execute(query, (league_id, status, user_id, joined_at))
+            await self._execute(query, (league_id, status, user_id, joined_at), profile=DURABLE_WRITE, operation="delete_league_join")
             return True
         except Exception as e:
             logger.error(f"Error deleting league join: {e}")
@@ -187,7 +197,7 @@ class LeagueJoinRepository:
         """Update the status of a league join"""
         try:
             # First get the current join
-            current_join = await self.get_league_join_by_user_and_league(user_id, league_id)
+            current_join = await self._get_join_row(user_id, league_id, "update_join_status")
             if not current_join:
                 return None
             
@@ -210,9 +220,9 @@ class LeagueJoinRepository:
     async def get_league_member_count(self, league_id: str, status: str = "active") -> int:
         """Get the count of members in a league with specific status"""
         try:
-            query = "SELECT COUNT(*) as count FROM league_joins WHERE league_id = %s AND status = %s"
-            row = self.session.execute(query, (league_id, status)).one()
-            return row.count if row else 0
+            query = "SELECT COUNT(*) as count FROM league_joins WHERE league_id = ? AND status = ?"
+            row = (await self._execute(query, (league_id, status), profile=BULK_SCAN, operation="get_league_member_count")).one()
+            return row['count'] if row else 0
         except Exception as e:
             logger.error(f"Error getting member count for league {league_id}: {e}")
             raise 
\ No newline at end of file
@@ -1,64 +1,77 @@
 import logging
-from typing import List, Optional
-from datetime import datetime, timedelta
-from cassandra.cluster import Session
+from typing import List, Optional, Sequence
+from datetime import datetime
 from app.schemas.otp import OTPCreate, OTPUpdate, OTPVerify
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import BULK_SCAN, DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import timestamp_filter, timestamp_write_values, utcnow
 
 logger = logging.getLogger(__name__)
 
 
-class OTPRepository:
+class OTPRepository(BaseRepository):
     """OTP data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "otp_store"
     
-    def _row_to_dict(self, row) -> dict:
-        """Convert Cassandra row to dictionary"""
-        if row is None:
-            return None
-        return {column: getattr(row, column) for column in row._fields}
+    async def warmup(self):
+        """Prepare the OTP reads and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_all_otps_by_phone_email(WARMUP_KEY),
+            self.get_otps_by_purpose(WARMUP_KEY),
+            self.get_verified_otps(),
+        )
+        await self.get_otp_by_phone_email_and_purpose(WARMUP_KEY, WARMUP_KEY)
     
-    async def get_otp_by_phone_email_and_purpose(self, phone_or_email: str, purpose: str) -> Optional[dict]:
+    async def _get_latest_otp_row(
+        self,
+        phone_or_email: str,
+        purpose: str,
+        operation: str,
+        fields: Optional[Sequence[str]] = None
+    ):
+        """Get the newest raw OTP row, keeping the TEXT created_at key intact"""
+        query = f"""
+            SELECT {self._columns(fields)} FROM otp_store 
+            WHERE phone_or_email = ? AND purpose = ? 
+            LIMIT 1
+        """
+        return (await self._execute(query, (phone_or_email, purpose), operation=operation)).one()
+    
+    async def get_otp_by_phone_email_and_purpose(self, phone_or_email: str, purpose: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get OTP by phone/email and purpose"""
         try:
-            query = """
-                SELECT * FROM otp_store 
-                WHERE phone_or_email = %s AND purpose = %s 
-                LIMIT 1
-            """
-            row = self.session.execute(query, (phone_or_email, purpose)).one()
+            row = await self._get_latest_otp_row(phone_or_email, purpose, "get_otp_by_phone_email_and_purpose", fields)
             return self._row_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting OTP for {phone_or_email} with purpose {purpose}: {e}")
             raise
     
-    async def get_all_otps_by_phone_email(self, phone_or_email: str, limit: int = 50) -> List[dict]:
+    async def get_all_otps_by_phone_email(self, phone_or_email: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all OTPs for a phone/email"""
         try:
-            query = "SELECT * FROM otp_store WHERE phone_or_email = %s LIMIT %s"
-            rows = self.session.execute(query, (phone_or_email, limit))
+            query = f"SELECT {self._columns(fields)} FROM otp_store WHERE phone_or_email = ? LIMIT ?"
+            rows = await self._execute(query, (phone_or_email, limit), profile=FAST_READ, operation="get_all_otps_by_phone_email")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting OTPs for {phone_or_email}: {e}")
             raise
     
-    async def get_otps_by_purpose(self, purpose: str, limit: int = 50) -> List[dict]:
+    async def get_otps_by_purpose(self, purpose: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all OTPs by purpose"""
         try:
-            query = "SELECT * FROM otp_store WHERE purpose = %s LIMIT %s"
-            rows = self.session.execute(query, (purpose, limit))
+            query = f"SELECT {self._columns(fields)} FROM otp_store WHERE purpose = ? LIMIT ?"
+            rows = await self._execute(query, (purpose, limit), profile=FAST_READ, operation="get_otps_by_purpose")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting OTPs by purpose {purpose}: {e}")
             raise
     
-    async def get_verified_otps(self, limit: int = 50) -> List[dict]:
+    async def get_verified_otps(self, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all verified OTPs"""
         try:
-            query = "SELECT * FROM otp_store WHERE is_verified = true LIMIT %s"
-            rows = self.session.execute(query, (limit,))
+            query = f"SELECT {self._columns(fields)} FROM otp_store WHERE is_verified = true LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_verified_otps")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting verified OTPs: {e}")
@@ -67,30 +80,32 @@ class OTPRepository:
     async def create_otp(self, otp_data: OTPCreate) -> dict:
         """Create a new OTP"""
         try:
-            now = datetime.utcnow()
+            timestamps = timestamp_write_values("otp_store", {
+                "created_at": utcnow(),
+                "expires_at": otp_data.expires_at
+            })
             
-            query = """
+            query = f"""
                 INSERT INTO otp_store (
-                    phone_or_email, otp_code, created_at, expires_at,
-                    purpose, is_verified, attempt_count
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    phone_or_email, otp_code, purpose, is_verified, attempt_count,
+                    {', '.join(timestamps)}
+                ) VALUES ({', '.join(['?'] * (5 + len(timestamps)))})
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 otp_data.phone_or_email,
                 otp_data.otp_code,
-                now.isoformat(),
-                otp_data.expires_at,
                 otp_data.purpose,
                 otp_data.is_verified,
-                otp_data.attempt_count
-            ))
+                otp_data.attempt_count,
+                *timestamps.values()
+            ), profile=DURABLE_WRITE, operation="create_otp")
             
             # Return the created OTP
             return {
                 "phone_or_email": otp_data.phone_or_email,
                 "otp_code": otp_data.otp_code,
-                "created_at": now.isoformat(),
-                "expires_at": otp_data.expires_at,
+                "created_at": timestamps["created_at_ts"],
+                "expires_at": timestamps["expires_at_ts"],
                 "purpose": otp_data.purpose,
                 "is_verified": otp_data.is_verified,
                 "attempt_count": otp_data.attempt_count
@@ -107,19 +122,21 @@ class OTPRepository:
             values = []
             
             if otp_data.otp_code is not None:
-                update_fields.append("otp_code = %s")
+                update_fields.append("otp_code = ?")
                 values.append(otp_data.otp_code)
             
             if otp_data.expires_at is not None:
-                update_fields.append("expires_at = %s")
-                values.append(otp_data.expires_at)
+                expires = timestamp_write_values("otp_store", {"expires_at": otp_data.expires_at})
+                for column, value in expires.items():
+                    update_fields.append(f"{column} = ?")
+                    values.append(value)
             
             if otp_data.is_verified is not None:
-                update_fields.append("is_verified = %s")
+                update_fields.append("is_verified = ?")
                 values.append(otp_data.is_verified)
             
             if otp_data.attempt_count is not None:
-                update_fields.append("attempt_count = %s")
+                update_fields.append("attempt_count = ?")
                 values.append(otp_data.attempt_count)
             
             if not update_fields:
@@ -128,11 +145,11 @@ class OTPRepository:
             query = f"""
                 UPDATE otp_store 
                 SET {', '.join(update_fields)}
-                WHERE phone_or_email = %s AND purpose = %s AND created_at = %s
+                WHERE phone_or_email = ? AND purpose = ? AND created_at = ?
             """
             values.extend([phone_or_email, purpose, created_at])
             
-            self.session.execute(query, values)
+            await self._execute(query, values, profile=DURABLE_WRITE, operation="update_otp")
             
             # Return updated OTP
             return await self.get_otp_by_phone_email_and_purpose(phone_or_email, purpose)
@@ -145,9 +162,9 @@ class OTPRepository:
         try:
             query = """
                 DELETE FROM otp_store 
-                WHERE phone_or_email = %s AND purpose = %s AND created_at = %s
+                WHERE phone_or_email = ? AND purpose = ? AND created_at = ?
             """
-            self.session.execute(query, (phone_or_email, purpose, created_at))
+            await self._execute(query, (phone_or_email, purpose, created_at), profile=DURABLE_WRITE, operation="delete_otp")
             return True
         except Exception as e:
             logger.error(f"Error deleting OTP for {phone_or_email}: {e}")
@@ -157,17 +174,14 @@ class OTPRepository:
         """Verify an OTP"""
         try:
             # Get the OTP
-            otp = await self.get_otp_by_phone_email_and_purpose(
-                verify_data.phone_or_email, 
-                verify_data.purpose
-            )
-            
-            if not otp:
+            row = await self._get_latest_otp_row(verify_data.phone_or_email, verify_data.purpose, "verify_otp")
+            if not row:
                 return False
+            created_at_key = row['created_at']
+            otp = self._row_to_dict(row)
             
             # Check if OTP is expired
-            expires_at = datetime.fromisoformat(otp['expires_at'])
-            if datetime.utcnow() > expires_at:
+            if otp['expires_at'] is None or datetime.utcnow() > otp['expires_at']:
                 return False
             
             # Check if OTP code matches
@@ -177,7 +191,7 @@ class OTPRepository:
                 await self.update_otp(
                     verify_data.phone_or_email,
                     verify_data.purpose,
-                    otp['created_at'],
+                    created_at_key,
                     OTPUpdate(attempt_count=new_attempt_count)
                 )
                 return False
@@ -186,7 +200,7 @@ class OTPRepository:
             await self.update_otp(
                 verify_data.phone_or_email,
                 verify_data.purpose,
-                otp['created_at'],
+                created_at_key,
                 OTPUpdate(is_verified=True)
             )
             
@@ -198,15 +212,15 @@ class OTPRepository:
     async def increment_attempt_count(self, phone_or_email: str, purpose: str) -> bool:
         """Increment attempt count for an OTP"""
         try:
-            otp = await self.get_otp_by_phone_email_and_purpose(phone_or_email, purpose)
-            if not otp:
+            row = await self._get_latest_otp_row(phone_or_email, purpose, "increment_attempt_count")
+            if not row:
                 return False
             
-            new_attempt_count = otp.get('attempt_count', 0) + 1
+            new_attempt_count = (row['attempt_count'] or 0) + 1
             await self.update_otp(
                 phone_or_email,
                 purpose,
-                otp['created_at'],
+                row['created_at'],
                 OTPUpdate(attempt_count=new_attempt_count)
             )
             return True
@@ -217,16 +231,16 @@ class OTPRepository:
     async def delete_expired_otps(self) -> int:
         """Delete expired OTPs and return count of deleted records"""
         try:
-            current_time = datetime.utcnow().isoformat()
-            query = "SELECT * FROM otp_store WHERE expires_at < %s"
-            expired_otps = self.session.execute(query, (current_time,))
+            column, current_time = timestamp_filter("otp_store", "expires_at", datetime.utcnow())
+            query = f"SELECT * FROM otp_store WHERE {column} < ? ALLOW FILTERING"
+            expired_otps = await self._execute(query, (current_time,), profile=BULK_SCAN, operation="delete_expired_otps")
             
             deleted_count = 0
             for otp in expired_otps:
                 await self.delete_otp(
-                    otp.phone_or_email,
-                    otp.purpose,
-                    otp.created_at
+                    otp['phone_or_email'],
+                    otp['purpose'],
+                    otp['created_at']
                 )
                 deleted_count += 1
             
@@ -1,28 +1,34 @@
 import logging
 from typing import List, Optional
 from datetime import datetime
-from cassandra.cluster import Session
 from app.schemas.session import SessionCreate, SessionUpdate
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import BULK_SCAN, DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
 
 logger = logging.getLogger(__name__)
 
 
-class SessionRepository:
+class SessionRepository(BaseRepository):
     """Session data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "sessions"
+    
+    async def warmup(self):
+        """Prepare the session reads and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_active_session(WARMUP_KEY, WARMUP_KEY),
+        )
+        await self.get_sessions_by_mobile_device(WARMUP_KEY, WARMUP_KEY)
     
     async def get_sessions_by_mobile_device(self, mobile_no: str, device_id: str) -> List[dict]:
         """Get sessions by mobile number and device ID"""
         try:
             query = """
                 SELECT * FROM sessions 
-                WHERE mobile_no = %s AND device_id = %s
+                WHERE mobile_no = ? AND device_id = ?
             """
-            rows = self.session.execute(query, (mobile_no, device_id))
-            return [dict(row) for row in rows]
+            rows = await self._execute(query, (mobile_no, device_id), profile=FAST_READ, operation="get_sessions_by_mobile_device")
+            return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting sessions by mobile/device: {e}")
             raise
@@ -32,11 +38,11 @@ class SessionRepository:
         try:
             query = """
                 SELECT * FROM sessions 
-                WHERE mobile_no = %s AND device_id = %s AND is_active = true
+                WHERE mobile_no = ? AND device_id = ? AND is_active = true
                 LIMIT 1
             """
-            row = self.session.execute(query, (mobile_no, device_id)).one()
-            return dict(row) if row else None
+            row = (await self._execute(query, (mobile_no, device_id), operation="get_active_session")).one()
+            return self._row_to_dict(row)
         except Exception as e:
             logger.error(f"Error getting active session: {e}")
             raise
@@ -50,9 +56,9 @@ class SessionRepository:
                     mobile_no, device_id, session_token, user_id, 
                     jwt_token, fcm_token, created_at, expires_at, 
                     is_active, updated_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 session_data.mobile_no,
                 session_data.device_id,
                 session_data.session_token,
@@ -63,7 +69,7 @@ class SessionRepository:
                 session_data.expires_at,
                 session_data.is_active,
                 now
-            ))
+            ), profile=DURABLE_WRITE, operation="create_session")
             
             # Return the created session
             return {
@@ -92,22 +98,22 @@ class SessionRepository:
             values = []
             
             if session_data.jwt_token is not None:
-                update_fields.append("jwt_token = %s")
+                update_fields.append("jwt_token = ?")
                 values.append(session_data.jwt_token)
             
             if session_data.fcm_token is not None:
-                update_fields.append("fcm_token = %s")
+                update_fields.append("fcm_token = ?")
                 values.append(session_data.fcm_token)
             
             if session_data.is_active is not None:
-                update_fields.append("is_active = %s")
+                update_fields.append("is_active = ?")
                 values.append(session_data.is_active)
             
             if session_data.expires_at is not None:
-                update_fields.append("expires_at = %s")
+                update_fields.append("expires_at = ?")
                 values.append(session_data.expires_at)
             
-            update_fields.append("updated_at = %s")
+            update_fields.append("updated_at = ?")
             values.append(now)
             
             if not update_fields:
@@ -116,11 +122,11 @@ class SessionRepository:
             query = f"""
                 UPDATE sessions 
                 SET {', '.join(update_fields)}
-                WHERE mobile_no = %s AND device_id = %s
+                WHERE mobile_no = ? AND device_id = ?
             """
             values.extend([mobile_no, device_id])
             
-            self.session.execute(query, values)
+            await self._execute(query, values, profile=DURABLE_WRITE, operation="update_session")
             
             # Return updated session
             return await self.get_active_session(mobile_no, device_id)
@@ -133,10 +139,10 @@ class SessionRepository:
         try:
             query = """
                 UPDATE sessions 
-                SET is_active = false, updated_at = %s
-                WHERE mobile_no = %s AND device_id = %s
+                SET is_active = false, updated_at = ?
+                WHERE mobile_no = ? AND device_id = ?
             """
-            self.session.execute(query, (datetime.utcnow(), mobile_no, device_id))
+            await self._execute(query, (datetime.utcnow(), mobile_no, device_id), profile=DURABLE_WRITE, operation="deactivate_session")
             return True
         except Exception as e:
             logger.error(f"Error deactivating session: {e}")
@@ -148,9 +154,9 @@ class SessionRepository:
             now = datetime.utcnow()
             query = """
                 DELETE FROM sessions 
-                WHERE expires_at < %s
+                WHERE expires_at < ?
             """
-            result = self.session.execute(query, (now,))
+            result = await self._execute(query, (now,), profile=BULK_SCAN, operation="delete_expired_sessions")
             return len(result)
         except Exception as e:
             logger.error(f"Error deleting expired sessions: {e}")
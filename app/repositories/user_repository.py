@@ -1,72 +1,121 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from datetime import datetime
-from cassandra.cluster import Session
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.database import get_cassandra_session
+from app.core.execution_profiles import DURABLE_WRITE, FAST_READ
+from app.repositories.base import WARMUP_KEY, BaseRepository
+from app.core.timestamps import utcnow
 
 logger = logging.getLogger(__name__)
 
+# Unique users column -> lookup table that owns each value (migration 0004)
+USER_LOOKUPS = {"mobile_no": "users_by_mobile", "email": "users_by_email"}
 
-class UserRepository:
+
+def new_user_id(mobile_no: str) -> str:
+    """ID for a user about to be created"""
+    return f"user_{datetime.utcnow().timestamp()}_{hash(mobile_no)}"
+
+
+class UserRepository(BaseRepository):
     """User data access repository for Cassandra"""
     
-    def __init__(self):
-        self.session: Session = get_cassandra_session()
+    table = "users"
     
-    def _row_to_dict(self, row) -> dict:
-        """Convert Cassandra row to dictionary"""
-        if row is None:
-            return None
-        return {column: getattr(row, column) for column in row._fields}
+    async def warmup(self):
+        """Prepare the user reads and lookups and run a synthetic lookup"""
+        await self._prepare_statements(
+            self.get_all_users(),
+            self.get_user_by_mobile(WARMUP_KEY),
+            self.get_user_by_email(WARMUP_KEY),
+            self.claim_unique("mobile_no", WARMUP_KEY, WARMUP_KEY),
+            self.claim_unique("email", WARMUP_KEY, WARMUP_KEY),
+            self.release_unique("mobile_no", WARMUP_KEY, WARMUP_KEY),
+            self.release_unique("email", WARMUP_KEY, WARMUP_KEY),
+        )
+        await self.get_user_by_id(WARMUP_KEY)
     
-    async def get_all_users(self, limit: int = 100) -> List[dict]:
+    async def get_all_users(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all users with pagination"""
         try:
-            query = "SELECT * FROM users LIMIT %s"
-            rows = self.session.execute(query, (limit,))
+            query = f"SELECT {self._columns(fields)} FROM users LIMIT ?"
+            rows = await self._execute(query, (limit,), profile=FAST_READ, operation="get_all_users")
             return [self._row_to_dict(row) for row in rows]
         except Exception as e:
             logger.error(f"Error getting all users: {e}")
             raise
     
-    async def get_user_by_id(self, user_id: str) -> Optional[dict]:
+    async def get_user_by_id(self, user_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by ID"""
         try:
-            query = "SELECT * FROM users WHERE id = %s"
-            row = self.session.execute(query, (user_id,)).one()
-            return self._row_to_dict(row)
+            return self._row_to_dict(await self._get_user_row(user_id, "get_user_by_id", fields))
         except Exception as e:
             logger.error(f"Error getting user by ID {user_id}: {e}")
             raise
     
-    async def get_user_by_mobile(self, mobile_no: str) -> Optional[dict]:
+    async def get_user_by_mobile(self, mobile_no: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by mobile number"""
         try:
-            # Note: This would require a secondary index on mobile_no in production
-            query = "SELECT * FROM users WHERE mobile_no = %s ALLOW FILTERING"
-            row = self.session.execute(query, (mobile_no,)).one()
-            return self._row_to_dict(row)
+            return await self._get_user_by_lookup("mobile_no", mobile_no, "get_user_by_mobile", fields)
         except Exception as e:
             logger.error(f"Error getting user by mobile {mobile_no}: {e}")
             raise
     
-    async def get_user_by_email(self, email: str) -> Optional[dict]:
+    async def get_user_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by email"""
         try:
-            # Note: This would require a secondary index on email in production
-            query = "SELECT * FROM users WHERE email = %s ALLOW FILTERING"
-            row = self.session.execute(query, (email,)).one()
-            return self._row_to_dict(row)
+            return await self._get_user_by_lookup("email", email, "get_user_by_email", fields)
         except Exception as e:
             logger.error(f"Error getting user by email {email}: {e}")
             raise
     
-    async def create_user(self, user_data: UserCreate) -> dict:
-        """Create a new user"""
+    async def _get_user_row(self, user_id: str, operation: str, fields: Optional[Sequence[str]] = None):
+        """Get the raw user row"""
+        query = f"SELECT {self._columns(fields)} FROM users WHERE id = ?"
+        return (await self._execute(query, (user_id,), operation=operation)).one()
+    
+    async def _get_user_by_lookup(
+        self,
+        column: str,
+        value: str,
+        operation: str,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[dict]:
+        """Get the user that owns a mobile number or email; both reads count as operation"""
+        query = f"SELECT user_id FROM {USER_LOOKUPS[column]} WHERE {column} = ?"
+        owner = (await self._execute(query, (value,), operation=operation)).one()
+        if not owner:
+            return None
+        return self._row_to_dict(await self._get_user_row(owner['user_id'], operation, fields))
+    
+    async def claim_unique(self, column: str, value: str, user_id: str) -> bool:
+        """Take a mobile number or email for a user; False if another user owns it"""
+        try:
+            query = f"INSERT INTO {USER_LOOKUPS[column]} ({column}, user_id) VALUES (?, ?) IF NOT EXISTS"
+            result = await self._execute(query, (value, user_id), profile=DURABLE_WRITE, operation="claim_unique")
+            if result.was_applied:
+                return True
+            owner = result.one()
+            return owner is not None and owner['user_id'] == user_id
+        except Exception as e:
+            logger.error(f"Error claiming {column} {value} for user {user_id}: {e}")
+            raise
+    
+    async def release_unique(self, column: str, value: str, user_id: str) -> bool:
+        """Give up a mobile number or email the user owns"""
+        try:
+            # Conditional like the claim, so the lookup tables only see Paxos writes
+            query = f"DELETE FROM {USER_LOOKUPS[column]} WHERE {column} = ? IF user_id = ?"
+            await self._execute(query, (value, user_id), profile=DURABLE_WRITE, operation="release_unique")
+            return True
+        except Exception as e:
+            logger.error(f"Error releasing {column} {value} of user {user_id}: {e}")
+            raise
+    
+    async def create_user(self, user_data: UserCreate, user_id: str) -> dict:
+        """Create a new user under an ID from new_user_id"""
         try:
             now = datetime.utcnow()
-            user_id = f"user_{now.timestamp()}_{hash(user_data.mobile_no)}"
             
             query = """
                 INSERT INTO users (
@@ -74,9 +123,9 @@ class UserRepository:
                     referred_by, profile_data, language_code, language_name,
                     region_code, timezone, user_preferences, status,
                     created_at, updated_at
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """
-            self.session.execute(query, (
+            await self._execute(query, (
                 user_id,
                 user_data.mobile_no,
                 user_data.email,
@@ -93,7 +142,7 @@ class UserRepository:
                 user_data.status,
                 now,
                 now
-            ))
+            ), profile=DURABLE_WRITE, operation="create_user")
             
             # Return the created user
             return {
@@ -118,84 +167,16 @@ class UserRepository:
             logger.error(f"Error creating user: {e}")
             raise
     
-    async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[dict]:
-        """Update an existing user"""
+    async def update_user(self, user_id: str, user_data: UserUpdate, read_at: int) -> dict:
+        """Update a user read at read_at (see BaseRepository._update_row)
+
+        Returns the changed fields.
+        """
         try:
-            now = datetime.utcnow()
-            
-            # Build dynamic update query
-            update_fields = []
-            values = []
-            
-            if user_data.mobile_no is not None:
-                update_fields.append("mobile_no = %s")
-                values.append(user_data.mobile_no)
-            
-            if user_data.email is not None:
-                update_fields.append("email = %s")
-                values.append(user_data.email)
-            
-            if user_data.full_name is not None:
-                update_fields.append("full_name = %s")
-                values.append(user_data.full_name)
-            
-            if user_data.state is not None:
-                update_fields.append("state = %s")
-                values.append(user_data.state)
-            
-            if user_data.referral_code is not None:
-                update_fields.append("referral_code = %s")
-                values.append(user_data.referral_code)
-            
-            if user_data.referred_by is not None:
-                update_fields.append("referred_by = %s")
-                values.append(user_data.referred_by)
-            
-            if user_data.profile_data is not None:
-                update_fields.append("profile_data = %s")
-                values.append(user_data.profile_data)
-            
-            if user_data.language_code is not None:
-                update_fields.append("language_code = %s")
-                values.append(user_data.language_code)
-            
-            if user_data.language_name is not None:
-                update_fields.append("language_name = %s")
-                values.append(user_data.language_name)
-            
-            if user_data.region_code is not None:
-                update_fields.append("region_code = %s")
-                values.append(user_data.region_code)
-            
-            if user_data.timezone is not None:
-                update_fields.append("timezone = %s")
-                values.append(user_data.timezone)
-            
-            if user_data.user_preferences is not None:
-                update_fields.append("user_preferences = %s")
-                values.append(user_data.user_preferences)
-            
-            if user_data.status is not None:
-                update_fields.append("status = %s")
-                values.append(user_data.status)
-            
-            update_fields.append("updated_at = %s")
-            values.append(now)
-            
-            if not update_fields:
-                return None
-            
-            query = f"""
-                UPDATE users 
-                SET {', '.join(update_fields)}
-                WHERE id = %s
-            """
-            values.append(user_id)
-            
-            self.session.execute(query, values)
-            
-            # Return updated user
-            return await self.get_user_by_id(user_id)
+            changes = user_data.model_dump(exclude_none=True)
+            changes["updated_at"] = utcnow()
+            await self._update_row({"id": user_id}, changes, read_at, operation="update_user")
+            return changes
         except Exception as e:
             logger.error(f"Error updating user {user_id}: {e}")
             raise
@@ -203,8 +184,8 @@ class UserRepository:
     async def delete_user(self, user_id: str) -> bool:
         """Delete a user"""
         try:
-            query = "DELETE FROM users WHERE id = %s"
-            self.session.execute(query, (user_id,))
+            query = "DELETE FROM users WHERE id = ?"
+            await self._execute(query, (user_id,), profile=DURABLE_WRITE, operation="delete_user")
             return True
         except Exception as e:
             logger.error(f"Error deleting user {user_id}: {e}")
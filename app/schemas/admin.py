@@ -0,0 +1,10 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+
+class SlowQueryLogResponse(BaseModel):
+    """Slow-query log snapshot schema"""
+    enabled: bool = Field(..., description="Whether the slow-query log is switched on")
+    threshold_ms: float = Field(..., description="Latency threshold in milliseconds")
+    trace_sample_rate: float = Field(..., description="Fraction of statements executed with tracing")
+    records: List[Dict[str, Any]] = Field(..., description="Recent slow statements, newest first")
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class SubRequest(BaseModel):
+    """One call inside a batch"""
+    id: str = Field(..., min_length=1, description="Name other sub-requests use to reference this one's result")
+    method: str = Field("GET", description="HTTP method")
+    path: str = Field(..., description="Path with optional query string, e.g. /api/v1/users/{id}")
+    body: Optional[Any] = Field(None, description="JSON request body")
+    headers: Dict[str, str] = Field(default={}, description="Extra request headers")
+
+
+class BatchRequest(BaseModel):
+    """Schema for a batch of sub-requests
+
+    Strings in a path or body may contain references such as
+    ${user.body.id} to the result of an earlier sub-request; a sub-request
+    waits for the ones it references and the rest run concurrently.
+    """
+    requests: List[SubRequest] = Field(..., min_length=1, description="Sub-requests in order")
+
+
+class SubResponse(BaseModel):
+    """Result of one sub-request"""
+    id: str = Field(..., description="Sub-request ID")
+    status: int = Field(..., description="HTTP status code")
+    body: Optional[Any] = Field(None, description="JSON response body, or text when not JSON")
+
+
+class BatchResponse(BaseModel):
+    """Schema for batch results, in request order"""
+    responses: List[SubResponse] = Field(..., description="One result per sub-request")
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
+from datetime import datetime
 
 
 class ContestBase(BaseModel):
@@ -9,8 +10,8 @@ class ContestBase(BaseModel):
     contest_entryfee: str = Field(..., description="Contest entry fee")
     contest_joinuser: int = Field(default=0, description="Number of users who joined")
     contest_activeuser: int = Field(default=0, description="Number of active users")
-    contest_starttime: str = Field(..., description="Contest start time")
-    contest_endtime: str = Field(..., description="Contest end time")
+    contest_starttime: datetime = Field(..., description="Contest start time")
+    contest_endtime: datetime = Field(..., description="Contest end time")
 
 
 class ContestCreate(ContestBase):
@@ -25,8 +26,8 @@ class ContestUpdate(BaseModel):
     contest_entryfee: Optional[str] = Field(None, description="Contest entry fee")
     contest_joinuser: Optional[int] = Field(None, description="Number of users who joined")
     contest_activeuser: Optional[int] = Field(None, description="Number of active users")
-    contest_starttime: Optional[str] = Field(None, description="Contest start time")
-    contest_endtime: Optional[str] = Field(None, description="Contest end time")
+    contest_starttime: Optional[datetime] = Field(None, description="Contest start time")
+    contest_endtime: Optional[datetime] = Field(None, description="Contest end time")
 
 
 class ContestResponse(ContestBase):
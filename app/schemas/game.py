@@ -45,7 +45,7 @@ class GameUpdate(BaseModel):
 class GameResponse(GameBase):
     """Schema for game response"""
     id: str = Field(..., description="Game ID")
-    created_at: str = Field(..., description="Game creation time")
-    updated_at: str = Field(..., description="Game last update time")
+    created_at: datetime = Field(..., description="Game creation time")
+    updated_at: datetime = Field(..., description="Game last update time")
     
     model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 
 
@@ -23,4 +23,11 @@ class DetailedHealthResponse(BaseModel):
     status: str = Field(..., description="Overall health status")
     timestamp: datetime = Field(..., description="Health check timestamp")
     system_info: SystemInfo = Field(..., description="System information")
-    services: Dict[str, Any] = Field(..., description="Individual service health status") 
\ No newline at end of file
+    services: Dict[str, Any] = Field(..., description="Individual service health status")
+    system_metrics: Optional[Dict[str, Any]] = Field(None, description="Latest background system sample and short-term trends") 
+
+
+class QueryMetricsResponse(BaseModel):
+    """Per-operation Cassandra query statistics schema"""
+    timestamp: datetime = Field(..., description="Snapshot timestamp")
+    operations: Dict[str, Dict[str, Any]] = Field(..., description="Statistics keyed by repository operation, including the effective consistency level")
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
+from datetime import datetime
 from uuid import UUID
 
 
@@ -30,8 +31,8 @@ class LeagueJoinUpdate(BaseModel):
 class LeagueJoinResponse(LeagueJoinBase):
     """Schema for league join response"""
     id: UUID = Field(..., description="Join ID")
-    joined_at: str = Field(..., description="Join timestamp")
-    updated_at: str = Field(..., description="Last update timestamp")
+    joined_at: datetime = Field(..., description="Join timestamp")
+    updated_at: datetime = Field(..., description="Last update timestamp")
     status_id: Optional[str] = Field(None, description="Status ID")
     
     model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
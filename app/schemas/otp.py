@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 from typing import Optional
+from datetime import datetime
 
 
 class OTPBase(BaseModel):
@@ -7,7 +8,7 @@ class OTPBase(BaseModel):
     phone_or_email: str = Field(..., description="Phone number or email")
     otp_code: str = Field(..., description="OTP code")
     purpose: str = Field(..., description="Purpose of OTP")
-    expires_at: str = Field(..., description="Expiration timestamp")
+    expires_at: datetime = Field(..., description="Expiration timestamp")
     is_verified: bool = Field(default=False, description="Whether OTP is verified")
     attempt_count: int = Field(default=0, description="Number of verification attempts")
 
@@ -20,7 +21,7 @@ class OTPCreate(OTPBase):
 class OTPUpdate(BaseModel):
     """Schema for updating an OTP"""
     otp_code: Optional[str] = Field(None, description="OTP code")
-    expires_at: Optional[str] = Field(None, description="Expiration timestamp")
+    expires_at: Optional[datetime] = Field(None, description="Expiration timestamp")
     is_verified: Optional[bool] = Field(None, description="Whether OTP is verified")
     attempt_count: Optional[int] = Field(None, description="Number of verification attempts")
 
@@ -34,6 +35,6 @@ class OTPVerify(BaseModel):
 
 class OTPResponse(OTPBase):
     """Schema for OTP response"""
-    created_at: str = Field(..., description="Creation timestamp")
+    created_at: datetime = Field(..., description="Creation timestamp")
     
     model_config = ConfigDict(from_attributes=True) 
\ No newline at end of file
@@ -0,0 +1,28 @@
+from typing import List
+from app.repositories.base import BaseRepository
+
+
+class BaseService:
+    """Lifecycle hooks shared by application-scoped services
+
+    Each hook runs on every repository the service holds as an attribute.
+    """
+
+    def repositories(self) -> List[BaseRepository]:
+        """Repositories owned by this service"""
+        return [value for value in vars(self).values() if isinstance(value, BaseRepository)]
+
+    async def warmup(self):
+        """Warm up the service's repositories before taking traffic"""
+        for repository in self.repositories():
+            await repository.warmup()
+
+    async def flush(self):
+        """Flush buffered state in the service's repositories"""
+        for repository in self.repositories():
+            await repository.flush()
+
+    async def close(self):
+        """Release the service's repositories"""
+        for repository in self.repositories():
+            await repository.close()
@@ -1,44 +1,59 @@
 import logging
-from typing import List, Optional
+from datetime import datetime
+from typing import List, Optional, Sequence
+from app.core.cache import RefreshingValue
+from app.core.config import settings
 from app.schemas.contest import ContestCreate, ContestResponse, ContestUpdate
+from app.repositories.base import write_timestamp
 from app.repositories.contest_repository import ContestRepository
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
 
-class ContestService:
+class ContestService(BaseService):
     """Contest business logic service"""
     
     def __init__(self):
         self.contest_repository = ContestRepository()
+        # Live contests are the hottest list; served from memory for a few seconds
+        self.live_contests = RefreshingValue(
+            lambda: self.contest_repository.get_active_contests(limit=settings.LIVE_CONTESTS_SIZE),
+            ttl=settings.LIVE_CONTESTS_TTL_SECONDS
+        )
     
-    async def get_contests(self, limit: int = 100) -> List[ContestResponse]:
+    async def warmup(self):
+        """Prepare statements and load the live contests"""
+        await super().warmup()
+        await self.live_contests.load()
+    
+    async def get_contests(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all contests with pagination"""
         try:
-            contests = await self.contest_repository.get_all_contests(limit=limit)
-            return [ContestResponse(**contest) for contest in contests]
+            return await self.contest_repository.get_all_contests(limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting contests: {e}")
+            logger.error("Error getting contests: %s", e)
             raise
     
-    async def get_contest_by_id(self, contest_id: str) -> Optional[ContestResponse]:
+    async def get_contest_by_id(self, contest_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get contest by ID"""
         try:
-            contest = await self.contest_repository.get_contest_by_id(contest_id)
-            if contest:
-                return ContestResponse(**contest)
-            return None
+            return await self.contest_repository.get_contest_by_id(contest_id, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting contest {contest_id}: {e}")
+            logger.error("Error getting contest %s: %s", contest_id, e)
             raise
     
-    async def get_active_contests(self, limit: int = 50) -> List[ContestResponse]:
+    async def get_active_contests(self, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get active contests"""
         try:
-            contests = await self.contest_repository.get_active_contests(limit=limit)
-            return [ContestResponse(**contest) for contest in contests]
+            if limit > settings.LIVE_CONTESTS_SIZE:
+                return await self.contest_repository.get_active_contests(limit=limit, fields=fields)
+            now = datetime.utcnow()
+            contests = await self.live_contests.get()
+            # Drop contests that ended since the cache was loaded
+            return [contest for contest in contests if contest['contest_endtime'] > now][:limit]
         except Exception as e:
-            logger.error(f"Error getting active contests: {e}")
+            logger.error("Error getting active contests: %s", e)
             raise
     
     async def create_contest(self, contest_data: ContestCreate) -> ContestResponse:
@@ -52,19 +67,16 @@ class ContestService:
                 raise ValueError("Active user count cannot be negative")
             
             contest = await self.contest_repository.create_contest(contest_data)
-            logger.info(f"Created contest with ID: {contest['contest_id']}")
+            self.live_contests.invalidate()
+            logger.info("Created contest with ID: %s", contest['contest_id'])
             return ContestResponse(**contest)
         except Exception as e:
-            logger.error(f"Error creating contest: {e}")
+            logger.error("Error creating contest: %s", e)
             raise
     
     async def update_contest(self, contest_id: str, contest_data: ContestUpdate) -> Optional[ContestResponse]:
         """Update an existing contest"""
         try:
-            contest = await self.contest_repository.get_contest_by_id(contest_id)
-            if not contest:
-                return None
-            
             # Business logic validation
             if contest_data.contest_joinuser is not None and contest_data.contest_joinuser < 0:
                 raise ValueError("Join user count cannot be negative")
@@ -72,24 +84,29 @@ class ContestService:
             if contest_data.contest_activeuser is not None and contest_data.contest_activeuser < 0:
                 raise ValueError("Active user count cannot be negative")
             
-            updated_contest = await self.contest_repository.update_contest(contest_id, contest_data)
-            if updated_contest:
-                logger.info(f"Updated contest with ID: {contest_id}")
-                return ContestResponse(**updated_contest)
-            return None
+            read_at = write_timestamp()
+            contest = await self.contest_repository.get_contest_by_id(contest_id)
+            if not contest:
+                return None
+            
+            changes = await self.contest_repository.update_contest(contest_id, contest_data, read_at)
+            self.live_contests.invalidate()
+            logger.info("Updated contest with ID: %s", contest_id)
+            return ContestResponse(**{**contest, **changes})
         except Exception as e:
-            logger.error(f"Error updating contest {contest_id}: {e}")
+            logger.error("Error updating contest %s: %s", contest_id, e)
             raise
     
     async def delete_contest(self, contest_id: str) -> bool:
         """Delete a contest"""
         try:
             success = await self.contest_repository.delete_contest(contest_id)
+            self.live_contests.invalidate()
             if success:
-                logger.info(f"Deleted contest with ID: {contest_id}")
+                logger.info("Deleted contest with ID: %s", contest_id)
             return success
         except Exception as e:
-            logger.error(f"Error deleting contest {contest_id}: {e}")
+            logger.error("Error deleting contest %s: %s", contest_id, e)
             raise
     
     async def increment_join_user(self, contest_id: str) -> bool:
@@ -97,10 +114,10 @@ class ContestService:
         try:
             success = await self.contest_repository.increment_join_user(contest_id)
             if success:
-                logger.info(f"Incremented join user count for contest: {contest_id}")
+                logger.info("Incremented join user count for contest: %s", contest_id)
             return success
         except Exception as e:
-            logger.error(f"Error incrementing join user for contest {contest_id}: {e}")
+            logger.error("Error incrementing join user for contest %s: %s", contest_id, e)
             raise
     
     async def increment_active_user(self, contest_id: str) -> bool:
@@ -108,8 +125,8 @@ class ContestService:
         try:
             success = await self.contest_repository.increment_active_user(contest_id)
             if success:
-                logger.info(f"Incremented active user count for contest: {contest_id}")
+                logger.info("Incremented active user count for contest: %s", contest_id)
             return success
         except Exception as e:
-            logger.error(f"Error incrementing active user for contest {contest_id}: {e}")
+            logger.error("Error incrementing active user for contest %s: %s", contest_id, e)
             raise 
\ No newline at end of file
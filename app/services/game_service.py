@@ -1,16 +1,30 @@
 import logging
 from typing import List, Optional
+from app.core.cache import RefreshingValue
+from app.core.config import settings
 from app.schemas.game import GameCreate, GameResponse, GameUpdate
+from app.repositories.base import write_timestamp
 from app.repositories.game_repository import GameRepository
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
 
-class GameService:
+class GameService(BaseService):
     """Game business logic service"""
     
     def __init__(self):
         self.game_repository = GameRepository()
+        # Active games change rarely; catalog reads are served from memory
+        self.catalog = RefreshingValue(
+            lambda: self.game_repository.get_active_games(limit=settings.GAME_CATALOG_SIZE),
+            ttl=settings.GAME_CATALOG_TTL_SECONDS
+        )
+    
+    async def warmup(self):
+        """Prepare statements and load the game catalog"""
+        await super().warmup()
+        await self.catalog.load()
     
     async def get_all_games(self, limit: int = 100) -> List[GameResponse]:
         """Get all games"""
@@ -18,7 +32,7 @@ class GameService:
             games = await self.game_repository.get_all_games(limit=limit)
             return [GameResponse(**game) for game in games]
         except Exception as e:
-            logger.error(f"Error getting all games: {e}")
+            logger.error("Error getting all games: %s", e)
             raise
     
     async def get_game_by_id(self, game_id: str) -> Optional[GameResponse]:
@@ -29,16 +43,19 @@ class GameService:
                 return GameResponse(**game)
             return None
         except Exception as e:
-            logger.error(f"Error getting game {game_id}: {e}")
+            logger.error("Error getting game %s: %s", game_id, e)
             raise
     
     async def get_active_games(self, limit: int = 100) -> List[GameResponse]:
         """Get active games"""
         try:
-            games = await self.game_repository.get_active_games(limit=limit)
+            if limit <= settings.GAME_CATALOG_SIZE:
+                games = (await self.catalog.get())[:limit]
+            else:
+                games = await self.game_repository.get_active_games(limit=limit)
             return [GameResponse(**game) for game in games]
         except Exception as e:
-            logger.error(f"Error getting active games: {e}")
+            logger.error("Error getting active games: %s", e)
             raise
     
     async def get_featured_games(self, limit: int = 50) -> List[GameResponse]:
@@ -47,7 +64,7 @@ class GameService:
             games = await self.game_repository.get_featured_games(limit=limit)
             return [GameResponse(**game) for game in games]
         except Exception as e:
-            logger.error(f"Error getting featured games: {e}")
+            logger.error("Error getting featured games: %s", e)
             raise
     
     async def get_games_by_category(self, category: str, limit: int = 50) -> List[GameResponse]:
@@ -56,7 +73,7 @@ class GameService:
             games = await self.game_repository.get_games_by_category(category, limit=limit)
             return [GameResponse(**game) for game in games]
         except Exception as e:
-            logger.error(f"Error getting games by category {category}: {e}")
+            logger.error("Error getting games by category %s: %s", category, e)
             raise
     
     async def create_game(self, game_data: GameCreate) -> GameResponse:
@@ -70,10 +87,11 @@ class GameService:
                 raise ValueError("Rating must be between 0 and 5")
             
             game = await self.game_repository.create_game(game_data)
-            logger.info(f"Created game with ID: {game['id']}")
+            self.catalog.invalidate()
+            logger.info("Created game with ID: %s", game['id'])
             return GameResponse(**game)
         except Exception as e:
-            logger.error(f"Error creating game: {e}")
+            logger.error("Error creating game: %s", e)
             raise
     
     async def update_game(self, game_id: str, game_data: GameUpdate) -> Optional[GameResponse]:
@@ -88,48 +106,56 @@ class GameService:
                 if game_data.rating < 0 or game_data.rating > 5:
                     raise ValueError("Rating must be between 0 and 5")
             
-            game = await self.game_repository.update_game(game_id, game_data)
-            if game:
-                logger.info(f"Updated game with ID: {game_id}")
-                return GameResponse(**game)
-            return None
+            read_at = write_timestamp()
+            game = await self.game_repository.get_game_by_id(game_id)
+            if not game:
+                return None
+            return await self._apply_update(game, game_data, read_at)
         except Exception as e:
-            logger.error(f"Error updating game {game_id}: {e}")
+            logger.error("Error updating game %s: %s", game_id, e)
             raise
     
+    async def _apply_update(self, game: dict, game_data: GameUpdate, read_at: int) -> GameResponse:
+        """Write a patch to a game already read and respond with the merged row"""
+        changes = await self.game_repository.update_game(game['id'], game_data, read_at)
+        self.catalog.invalidate()
+        logger.info("Updated game with ID: %s", game['id'])
+        return GameResponse(**{**game, **changes})
+    
     async def delete_game(self, game_id: str) -> bool:
         """Delete a game"""
         try:
             success = await self.game_repository.delete_game(game_id)
+            self.catalog.invalidate()
             if success:
-                logger.info(f"Deleted game with ID: {game_id}")
+                logger.info("Deleted game with ID: %s", game_id)
             return success
         except Exception as e:
-            logger.error(f"Error deleting game {game_id}: {e}")
+            logger.error("Error deleting game %s: %s", game_id, e)
             raise
     
     async def toggle_game_status(self, game_id: str) -> Optional[GameResponse]:
         """Toggle game active status"""
         try:
-            game = await self.get_game_by_id(game_id)
+            read_at = write_timestamp()
+            game = await self.game_repository.get_game_by_id(game_id)
             if not game:
                 return None
             
-            update_data = GameUpdate(is_active=not game.is_active)
-            return await self.update_game(game_id, update_data)
+            return await self._apply_update(game, GameUpdate(is_active=not game['is_active']), read_at)
         except Exception as e:
-            logger.error(f"Error toggling game status {game_id}: {e}")
+            logger.error("Error toggling game status %s: %s", game_id, e)
             raise
     
     async def toggle_featured_status(self, game_id: str) -> Optional[GameResponse]:
         """Toggle game featured status"""
         try:
-            game = await self.get_game_by_id(game_id)
+            read_at = write_timestamp()
+            game = await self.game_repository.get_game_by_id(game_id)
             if not game:
                 return None
             
-            update_data = GameUpdate(is_featured=not game.is_featured)
-            return await self.update_game(game_id, update_data)
+            return await self._apply_update(game, GameUpdate(is_featured=not game['is_featured']), read_at)
         except Exception as e:
-            logger.error(f"Error toggling featured status {game_id}: {e}")
+            logger.error("Error toggling featured status %s: %s", game_id, e)
             raise 
\ No newline at end of file
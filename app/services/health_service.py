@@ -1,9 +1,9 @@
 import logging
-import psutil
-import platform
 from datetime import datetime
 from typing import Dict, Any
 from app.schemas.health import DetailedHealthResponse, SystemInfo
+from app.core.health_probes import health_probes
+from app.core.system_sampler import system_sampler
 
 logger = logging.getLogger(__name__)
 
@@ -15,97 +15,57 @@ class HealthService:
         """Get detailed system health information"""
         try:
             system_info = await self._get_system_info()
+            services = {
+                "database": await self._check_database_health(),
+                "external_api": await self._check_external_api_health(),
+                "memory": await self._check_memory_health(),
+                "disk": await self._check_disk_health()
+            }
             
             return DetailedHealthResponse(
-                status="healthy",
+                status="unhealthy" if services["database"]["status"] == "unhealthy" else "healthy",
                 timestamp=datetime.utcnow(),
                 system_info=system_info,
-                services={
-                    "database": await self._check_database_health(),
-                    "external_api": await self._check_external_api_health(),
-                    "memory": await self._check_memory_health(),
-                    "disk": await self._check_disk_health()
+                services=services,
+                system_metrics={
+                    "latest": system_sampler.latest(),
+                    "trends": system_sampler.trends()
                 }
             )
         except Exception as e:
-            logger.error(f"Error getting detailed health: {e}")
+            logger.error("Error getting detailed health: %s", e)
             raise
     
     async def _get_system_info(self) -> SystemInfo:
-        """Get system information"""
-        return SystemInfo(
-            platform=platform.system(),
-            platform_version=platform.version(),
-            python_version=platform.python_version(),
-            cpu_count=psutil.cpu_count(),
-            memory_total=psutil.virtual_memory().total,
-            uptime=psutil.boot_time()
-        )
+        """Get system information (collected once per process)"""
+        return SystemInfo(**system_sampler.system_info())
     
     async def _check_database_health(self) -> Dict[str, Any]:
-        """Check database health"""
-        try:
-            # This would typically check actual database connectivity
-            # For now, we'll simulate a healthy database
-            return {
-                "status": "healthy",
-                "response_time": 0.001,
-                "connections": 5
-            }
-        except Exception as e:
-            logger.error(f"Database health check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+        """Database health from the background probe (no query on the request path)"""
+        return health_probes.database.snapshot()
     
     async def _check_external_api_health(self) -> Dict[str, Any]:
-        """Check external API health"""
-        try:
-            # This would typically make a request to external APIs
-            # For now, we'll simulate a healthy external API
-            return {
-                "status": "healthy",
-                "response_time": 0.05,
-                "endpoints": ["/api/v1/users"]
-            }
-        except Exception as e:
-            logger.error(f"External API health check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+        """External API health from the background probe"""
+        return health_probes.external_api.snapshot()
     
     async def _check_memory_health(self) -> Dict[str, Any]:
-        """Check memory health"""
-        try:
-            memory = psutil.virtual_memory()
-            return {
-                "status": "healthy" if memory.percent < 90 else "warning",
-                "usage_percent": memory.percent,
-                "available": memory.available,
-                "total": memory.total
-            }
-        except Exception as e:
-            logger.error(f"Memory health check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            }
+        """Memory health from the latest background sample"""
+        sample = system_sampler.latest()
+        if sample is None:
+            return {"status": "unknown", "detail": "No system sample yet"}
+        memory = sample["memory"]
+        return {
+            "status": "healthy" if memory["usage_percent"] < 90 else "warning",
+            **memory
+        }
     
     async def _check_disk_health(self) -> Dict[str, Any]:
-        """Check disk health"""
-        try:
-            disk = psutil.disk_usage('/')
-            return {
-                "status": "healthy" if disk.percent < 90 else "warning",
-                "usage_percent": disk.percent,
-                "free": disk.free,
-                "total": disk.total
-            }
-        except Exception as e:
-            logger.error(f"Disk health check failed: {e}")
-            return {
-                "status": "unhealthy",
-                "error": str(e)
-            } 
\ No newline at end of file
+        """Disk health from the latest background sample"""
+        sample = system_sampler.latest()
+        if sample is None:
+            return {"status": "unknown", "detail": "No system sample yet"}
+        disk = sample["disk"]
+        return {
+            "status": "healthy" if disk["usage_percent"] < 90 else "warning",
+            **disk
+        }
\ No newline at end of file
@@ -0,0 +1,108 @@
+import hashlib
+import json
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.core.cache import ExpiringLRU
+from app.core.config import settings
+from app.core.timestamps import utcnow
+from app.repositories.idempotency_repository import IdempotencyRepository
+from app.services.base import BaseService
+
+logger = logging.getLogger(__name__)
+
+
+def request_fingerprint(method: str, path: str, query_string: bytes, body: bytes) -> str:
+    """Hash of everything that makes two requests the same request"""
+    digest = hashlib.sha256()
+    for part in (method.encode(), path.encode(), query_string, body):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyService(BaseService):
+    """Idempotency-Key bookkeeping business logic service
+
+    Completed responses are kept in a per-worker front cache, so a retry that
+    lands on the same worker is answered without touching the database.
+    Keys whose request is running on this worker are tracked in memory too.
+    A claim is only a lease (IDEMPOTENCY_LEASE_SECONDS); the full TTL is
+    written with the response, so a claim left by a crashed worker expires.
+    """
+
+    def __init__(self):
+        self.idempotency_repository = IdempotencyRepository()
+        self.completed: ExpiringLRU[dict] = ExpiringLRU(
+            maxsize=settings.IDEMPOTENCY_CACHE_SIZE,
+            ttl=settings.IDEMPOTENCY_TTL_SECONDS
+        )
+        self._in_flight: Dict[str, Tuple[str, datetime]] = {}
+
+    async def begin(self, key: str, fingerprint: str) -> Optional[dict]:
+        """Claim key for a new request
+
+        Returns None when the caller should run the request, otherwise the
+        stored record: its fingerprint, and status_code, headers and body once
+        the original request has completed (status_code is None before that).
+        """
+        try:
+            record = self.completed.get(key)
+            if record is not None:
+                return record
+            if key in self._in_flight:
+                return {"fingerprint": self._in_flight[key][0], "status_code": None}
+
+            created_at = utcnow()
+            row = await self.idempotency_repository.claim(key, fingerprint, created_at, settings.IDEMPOTENCY_LEASE_SECONDS)
+            if row is None:
+                self._in_flight[key] = (fingerprint, created_at)
+                return None
+            record = {
+                "fingerprint": row['fingerprint'],
+                "status_code": row['status_code'],
+                "headers": [(name.encode("latin-1"), value.encode("latin-1")) for name, value in json.loads(row['headers'] or "[]")],
+                "body": row['body'] or b"",
+            }
+            if record["status_code"] is not None:
+                self.completed.set(key, record)
+            return record
+        except Exception as e:
+            logger.error("Error claiming idempotency key %s: %s", key, e)
+            raise
+
+    async def complete(self, key: str, status_code: int, headers: List[Tuple[bytes, bytes]], body: Optional[bytes]):
+        """Store the response for a claimed key
+
+        Server errors and responses too large to store release the key
+        instead, so the client's retry runs the request again.
+        """
+        fingerprint, created_at = self._in_flight.pop(key)
+        try:
+            if status_code >= 500 or body is None:
+                await self.idempotency_repository.release(key)
+                return
+            stored = json.dumps([(name.decode("latin-1"), value.decode("latin-1")) for name, value in headers])
+            applied = await self.idempotency_repository.complete(
+                key, fingerprint, created_at, status_code, stored, body, settings.IDEMPOTENCY_TTL_SECONDS
+            )
+            if not applied:
+                logger.warning("Idempotency key %s expired before its response was stored", key)
+                return
+            self.completed.set(key, {
+                "fingerprint": fingerprint,
+                "status_code": status_code,
+                "headers": headers,
+                "body": body,
+            })
+        except Exception as e:
+            # The response has already been sent; the claim expires with its lease
+            logger.error("Error storing idempotent response for key %s: %s", key, e)
+
+    async def abandon(self, key: str):
+        """Release a claimed key whose request raised or was cancelled"""
+        self._in_flight.pop(key, None)
+        try:
+            await self.idempotency_repository.release(key)
+        except Exception as e:
+            logger.error("Error releasing idempotency key %s: %s", key, e)
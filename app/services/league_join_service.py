@@ -1,71 +1,64 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from app.schemas.league_join import LeagueJoinCreate, LeagueJoinResponse, LeagueJoinUpdate
 from app.repositories.league_join_repository import LeagueJoinRepository
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
 
-class LeagueJoinService:
+class LeagueJoinService(BaseService):
     """League join business logic service"""
     
     def __init__(self):
         self.league_join_repository = LeagueJoinRepository()
     
-    async def get_league_joins(self, limit: int = 100) -> List[LeagueJoinResponse]:
+    async def get_league_joins(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all league joins with pagination"""
         try:
-            joins = await self.league_join_repository.get_all_league_joins(limit=limit)
-            return [LeagueJoinResponse(**join) for join in joins]
+            return await self.league_join_repository.get_all_league_joins(limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league joins: {e}")
+            logger.error("Error getting league joins: %s", e)
             raise
     
-    async def get_league_joins_by_league_id(self, league_id: str, limit: int = 50) -> List[LeagueJoinResponse]:
+    async def get_league_joins_by_league_id(self, league_id: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all joins for a specific league"""
         try:
-            joins = await self.league_join_repository.get_league_joins_by_league_id(league_id, limit=limit)
-            return [LeagueJoinResponse(**join) for join in joins]
+            return await self.league_join_repository.get_league_joins_by_league_id(league_id, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league joins for league {league_id}: {e}")
+            logger.error("Error getting league joins for league %s: %s", league_id, e)
             raise
     
-    async def get_league_joins_by_status(self, league_id: str, status: str, limit: int = 50) -> List[LeagueJoinResponse]:
+    async def get_league_joins_by_status(self, league_id: str, status: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get league joins by status for a specific league"""
         try:
-            joins = await self.league_join_repository.get_league_joins_by_status(league_id, status, limit=limit)
-            return [LeagueJoinResponse(**join) for join in joins]
+            return await self.league_join_repository.get_league_joins_by_status(league_id, status, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league joins by status {status} for league {league_id}: {e}")
+            logger.error("Error getting league joins by status %s for league %s: %s", status, league_id, e)
             raise
     
-    async def get_user_league_joins(self, user_id: str, limit: int = 50) -> List[LeagueJoinResponse]:
+    async def get_user_league_joins(self, user_id: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all league joins for a specific user"""
         try:
-            joins = await self.league_join_repository.get_user_league_joins(user_id, limit=limit)
-            return [LeagueJoinResponse(**join) for join in joins]
+            return await self.league_join_repository.get_user_league_joins(user_id, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league joins for user {user_id}: {e}")
+            logger.error("Error getting league joins for user %s: %s", user_id, e)
             raise
     
-    async def get_league_joins_by_invite_code(self, invite_code: str, limit: int = 50) -> List[LeagueJoinResponse]:
+    async def get_league_joins_by_invite_code(self, invite_code: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get league joins by invite code"""
         try:
-            joins = await self.league_join_repository.get_league_joins_by_invite_code(invite_code, limit=limit)
-            return [LeagueJoinResponse(**join) for join in joins]
+            return await self.league_join_repository.get_league_joins_by_invite_code(invite_code, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league joins by invite code {invite_code}: {e}")
+            logger.error("Error getting league joins by invite code %s: %s", invite_code, e)
             raise
     
-    async def get_league_join_by_user_and_league(self, user_id: str, league_id: str) -> Optional[LeagueJoinResponse]:
+    async def get_league_join_by_user_and_league(self, user_id: str, league_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get specific league join by user and league"""
         try:
-            join = await self.league_join_repository.get_league_join_by_user_and_league(user_id, league_id)
-            if join:
-                return LeagueJoinResponse(**join)
-            return None
+            return await self.league_join_repository.get_league_join_by_user_and_league(user_id, league_id, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting league join for user {user_id} in league {league_id}: {e}")
+            logger.error("Error getting league join for user %s in league %s: %s", user_id, league_id, e)
             raise
     
     async def create_league_join(self, join_data: LeagueJoinCreate) -> LeagueJoinResponse:
@@ -97,10 +90,10 @@ class LeagueJoinService:
                 raise ValueError(f"User {join_data.user_id} is already in league {join_data.league_id}")
             
             join = await self.league_join_repository.create_league_join(join_data)
-            logger.info(f"Created league join for user {join_data.user_id} in league {join_data.league_id}")
+            logger.info("Created league join for user %s in league %s", join_data.user_id, join_data.league_id)
             return LeagueJoinResponse(**join)
         except Exception as e:
-            logger.error(f"Error creating league join: {e}")
+            logger.error("Error creating league join: %s", e)
             raise
     
     async def update_league_join(self, league_id: str, status: str, user_id: str, joined_at: str, join_data: LeagueJoinUpdate) -> Optional[LeagueJoinResponse]:
@@ -123,11 +116,11 @@ class LeagueJoinService:
             
             updated_join = await self.league_join_repository.update_league_join(league_id, status, user_id, joined_at, join_data)
             if updated_join:
-                logger.info(f"Updated league join for user {user_id} in league {league_id}")
+                logger.info("Updated league join for user %s in league %s", user_id, league_id)
                 return LeagueJoinResponse(**updated_join)
             return None
         except Exception as e:
-            logger.error(f"Error updating league join: {e}")
+            logger.error("Error updating league join: %s", e)
             raise
     
     async def delete_league_join(self, league_id: str, status: str, user_id: str, joined_at: str) -> bool:
@@ -135,10 +128,10 @@ class LeagueJoinService:
         try:
             success = await self.league_join_repository.delete_league_join(league_id, status, user_id, joined_at)
             if success:
-                logger.info(f"Deleted league join for user {user_id} in league {league_id}")
+                logger.info("Deleted league join for user %s in league %s", user_id, league_id)
             return success
         except Exception as e:
-            logger.error(f"Error deleting league join: {e}")
+            logger.error("Error deleting league join: %s", e)
             raise
     
     async def update_join_status(self, league_id: str, user_id: str, new_status: str, status_id: str = None) -> Optional[LeagueJoinResponse]:
@@ -151,19 +144,19 @@ class LeagueJoinService:
             
             join = await self.league_join_repository.update_join_status(league_id, user_id, new_status, status_id)
             if join:
-                logger.info(f"Updated join status to {new_status} for user {user_id} in league {league_id}")
+                logger.info("Updated join status to %s for user %s in league %s", new_status, user_id, league_id)
                 return LeagueJoinResponse(**join)
             return None
         except Exception as e:
-            logger.error(f"Error updating join status for user {user_id} in league {league_id}: {e}")
+            logger.error("Error updating join status for user %s in league %s: %s", user_id, league_id, e)
             raise
     
     async def get_league_member_count(self, league_id: str, status: str = "active") -> int:
         """Get the count of members in a league with specific status"""
         try:
             count = await self.league_join_repository.get_league_member_count(league_id, status)
-            logger.info(f"League {league_id} has {count} members with status {status}")
+            logger.info("League %s has %s members with status %s", league_id, count, status)
             return count
         except Exception as e:
-            logger.error(f"Error getting member count for league {league_id}: {e}")
+            logger.error("Error getting member count for league %s: %s", league_id, e)
             raise 
\ No newline at end of file
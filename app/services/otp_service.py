@@ -1,53 +1,48 @@
 import logging
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from app.schemas.otp import OTPCreate, OTPResponse, OTPUpdate, OTPVerify
 from app.repositories.otp_repository import OTPRepository
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
 
-class OTPService:
+class OTPService(BaseService):
     """OTP business logic service"""
     
     def __init__(self):
         self.otp_repository = OTPRepository()
     
-    async def get_otps_by_phone_email(self, phone_or_email: str, limit: int = 50) -> List[OTPResponse]:
+    async def get_otps_by_phone_email(self, phone_or_email: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all OTPs for a phone/email"""
         try:
-            otps = await self.otp_repository.get_all_otps_by_phone_email(phone_or_email, limit=limit)
-            return [OTPResponse(**otp) for otp in otps]
+            return await self.otp_repository.get_all_otps_by_phone_email(phone_or_email, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting OTPs for {phone_or_email}: {e}")
+            logger.error("Error getting OTPs for %s: %s", phone_or_email, e)
             raise
     
-    async def get_otps_by_purpose(self, purpose: str, limit: int = 50) -> List[OTPResponse]:
+    async def get_otps_by_purpose(self, purpose: str, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all OTPs by purpose"""
         try:
-            otps = await self.otp_repository.get_otps_by_purpose(purpose, limit=limit)
-            return [OTPResponse(**otp) for otp in otps]
+            return await self.otp_repository.get_otps_by_purpose(purpose, limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting OTPs by purpose {purpose}: {e}")
+            logger.error("Error getting OTPs by purpose %s: %s", purpose, e)
             raise
     
-    async def get_verified_otps(self, limit: int = 50) -> List[OTPResponse]:
+    async def get_verified_otps(self, limit: int = 50, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all verified OTPs"""
         try:
-            otps = await self.otp_repository.get_verified_otps(limit=limit)
-            return [OTPResponse(**otp) for otp in otps]
+            return await self.otp_repository.get_verified_otps(limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting verified OTPs: {e}")
+            logger.error("Error getting verified OTPs: %s", e)
             raise
     
-    async def get_otp_by_phone_email_and_purpose(self, phone_or_email: str, purpose: str) -> Optional[OTPResponse]:
+    async def get_otp_by_phone_email_and_purpose(self, phone_or_email: str, purpose: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get OTP by phone/email and purpose"""
         try:
-            otp = await self.otp_repository.get_otp_by_phone_email_and_purpose(phone_or_email, purpose)
-            if otp:
-                return OTPResponse(**otp)
-            return None
+            return await self.otp_repository.get_otp_by_phone_email_and_purpose(phone_or_email, purpose, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting OTP for {phone_or_email} with purpose {purpose}: {e}")
+            logger.error("Error getting OTP for %s with purpose %s: %s", phone_or_email, purpose, e)
             raise
     
     async def create_otp(self, otp_data: OTPCreate) -> OTPResponse:
@@ -68,13 +63,13 @@ class OTPService:
                 otp_data.phone_or_email, otp_data.purpose
             )
             if existing_otp:
-                logger.warning(f"OTP already exists for {otp_data.phone_or_email} with purpose {otp_data.purpose}")
+                logger.warning("OTP already exists for %s with purpose %s", otp_data.phone_or_email, otp_data.purpose)
             
             otp = await self.otp_repository.create_otp(otp_data)
-            logger.info(f"Created OTP for {otp_data.phone_or_email} with purpose {otp_data.purpose}")
+            logger.info("Created OTP for %s with purpose %s", otp_data.phone_or_email, otp_data.purpose)
             return OTPResponse(**otp)
         except Exception as e:
-            logger.error(f"Error creating OTP: {e}")
+            logger.error("Error creating OTP: %s", e)
             raise
     
     async def update_otp(self, phone_or_email: str, purpose: str, created_at: str, otp_data: OTPUpdate) -> Optional[OTPResponse]:
@@ -90,11 +85,11 @@ class OTPService:
             
             updated_otp = await self.otp_repository.update_otp(phone_or_email, purpose, created_at, otp_data)
             if updated_otp:
-                logger.info(f"Updated OTP for {phone_or_email} with purpose {purpose}")
+                logger.info("Updated OTP for %s with purpose %s", phone_or_email, purpose)
                 return OTPResponse(**updated_otp)
             return None
         except Exception as e:
-            logger.error(f"Error updating OTP for {phone_or_email}: {e}")
+            logger.error("Error updating OTP for %s: %s", phone_or_email, e)
             raise
     
     async def delete_otp(self, phone_or_email: str, purpose: str, created_at: str) -> bool:
@@ -102,10 +97,10 @@ class OTPService:
         try:
             success = await self.otp_repository.delete_otp(phone_or_email, purpose, created_at)
             if success:
-                logger.info(f"Deleted OTP for {phone_or_email} with purpose {purpose}")
+                logger.info("Deleted OTP for %s with purpose %s", phone_or_email, purpose)
             return success
         except Exception as e:
-            logger.error(f"Error deleting OTP for {phone_or_email}: {e}")
+            logger.error("Error deleting OTP for %s: %s", phone_or_email, e)
             raise
     
     async def verify_otp(self, verify_data: OTPVerify) -> bool:
@@ -123,13 +118,13 @@ class OTPService:
             
             is_valid = await self.otp_repository.verify_otp(verify_data)
             if is_valid:
-                logger.info(f"OTP verified successfully for {verify_data.phone_or_email} with purpose {verify_data.purpose}")
+                logger.info("OTP verified successfully for %s with purpose %s", verify_data.phone_or_email, verify_data.purpose)
             else:
-                logger.warning(f"OTP verification failed for {verify_data.phone_or_email} with purpose {verify_data.purpose}")
+                logger.warning("OTP verification failed for %s with purpose %s", verify_data.phone_or_email, verify_data.purpose)
             
             return is_valid
         except Exception as e:
-            logger.error(f"Error verifying OTP: {e}")
+            logger.error("Error verifying OTP: %s", e)
             raise
     
     async def increment_attempt_count(self, phone_or_email: str, purpose: str) -> bool:
@@ -137,18 +132,18 @@ class OTPService:
         try:
             success = await self.otp_repository.increment_attempt_count(phone_or_email, purpose)
             if success:
-                logger.info(f"Incremented attempt count for {phone_or_email} with purpose {purpose}")
+                logger.info("Incremented attempt count for %s with purpose %s", phone_or_email, purpose)
             return success
         except Exception as e:
-            logger.error(f"Error incrementing attempt count for {phone_or_email}: {e}")
+            logger.error("Error incrementing attempt count for %s: %s", phone_or_email, e)
             raise
     
     async def delete_expired_otps(self) -> int:
         """Delete expired OTPs"""
         try:
             deleted_count = await self.otp_repository.delete_expired_otps()
-            logger.info(f"Deleted {deleted_count} expired OTPs")
+            logger.info("Deleted %s expired OTPs", deleted_count)
             return deleted_count
         except Exception as e:
-            logger.error(f"Error deleting expired OTPs: {e}")
+            logger.error("Error deleting expired OTPs: %s", e)
             raise 
\ No newline at end of file
@@ -0,0 +1,53 @@
+import logging
+from typing import List
+from app.services.base import BaseService
+from app.services.contest_service import ContestService
+from app.services.game_service import GameService
+from app.services.idempotency_service import IdempotencyService
+from app.services.league_join_service import LeagueJoinService
+from app.services.otp_service import OTPService
+from app.services.session_service import SessionService
+from app.services.user_service import UserService
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceRegistry:
+    """Services and their repositories, built once per worker
+
+    The lifespan creates the registry after the database is connected and
+    stores it on app.state; request dependencies hand out these instances
+    instead of constructing new ones per request.
+    """
+
+    def __init__(self):
+        self.users = UserService()
+        self.sessions = SessionService()
+        self.games = GameService()
+        self.contests = ContestService()
+        self.otp = OTPService()
+        self.league_joins = LeagueJoinService()
+        self.idempotency = IdempotencyService()
+
+    def services(self) -> List[BaseService]:
+        """All registered services"""
+        return [self.users, self.sessions, self.games, self.contests, self.otp, self.league_joins, self.idempotency]
+
+    async def warmup(self):
+        """Run every service's warmup hook"""
+        for service in self.services():
+            await service.warmup()
+
+    async def flush(self):
+        """Run every service's flush hook"""
+        for service in self.services():
+            await service.flush()
+
+    async def close(self):
+        """Flush, then release every service; failures are logged so shutdown continues"""
+        for service in self.services():
+            try:
+                await service.flush()
+                await service.close()
+            except Exception as e:
+                logger.error("Error closing %s: %s", type(service).__name__, e)
@@ -4,11 +4,12 @@ from datetime import datetime, timedelta
 import uuid
 from app.schemas.session import SessionCreate, SessionResponse, SessionUpdate
 from app.repositories.session_repository import SessionRepository
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
 
-class SessionService:
+class SessionService(BaseService):
     """Session business logic service"""
     
     def __init__(self):
@@ -20,7 +21,7 @@ class SessionService:
             sessions = await self.session_repository.get_sessions_by_mobile_device(mobile_no, device_id)
             return [SessionResponse(**session) for session in sessions]
         except Exception as e:
-            logger.error(f"Error getting user sessions: {e}")
+            logger.error("Error getting user sessions: %s", e)
             raise
     
     async def get_active_session(self, mobile_no: str, device_id: str) -> Optional[SessionResponse]:
@@ -31,7 +32,7 @@ class SessionService:
                 return SessionResponse(**session)
             return None
         except Exception as e:
-            logger.error(f"Error getting active session: {e}")
+            logger.error("Error getting active session: %s", e)
             raise
     
     async def create_session(self, mobile_no: str, device_id: str, user_id: str, 
@@ -55,10 +56,10 @@ class SessionService:
             )
             
             session = await self.session_repository.create_session(session_data)
-            logger.info(f"Created session for user {user_id} on device {device_id}")
+            logger.info("Created session for user %s on device %s", user_id, device_id)
             return SessionResponse(**session)
         except Exception as e:
-            logger.error(f"Error creating session: {e}")
+            logger.error("Error creating session: %s", e)
             raise
     
     async def update_session(self, mobile_no: str, device_id: str, 
@@ -67,11 +68,11 @@ class SessionService:
         try:
             session = await self.session_repository.update_session(mobile_no, device_id, session_data)
             if session:
-                logger.info(f"Updated session for {mobile_no} on device {device_id}")
+                logger.info("Updated session for %s on device %s", mobile_no, device_id)
                 return SessionResponse(**session)
             return None
         except Exception as e:
-            logger.error(f"Error updating session: {e}")
+            logger.error("Error updating session: %s", e)
             raise
     
     async def deactivate_session(self, mobile_no: str, device_id: str) -> bool:
@@ -79,10 +80,10 @@ class SessionService:
         try:
             success = await self.session_repository.deactivate_session(mobile_no, device_id)
             if success:
-                logger.info(f"Deactivated session for {mobile_no} on device {device_id}")
+                logger.info("Deactivated session for %s on device %s", mobile_no, device_id)
             return success
         except Exception as e:
-            logger.error(f"Error deactivating session: {e}")
+            logger.error("Error deactivating session: %s", e)
             raise
     
     async def refresh_session(self, mobile_no: str, device_id: str, 
@@ -94,7 +95,7 @@ class SessionService:
             )
             return await self.update_session(mobile_no, device_id, session_data)
         except Exception as e:
-            logger.error(f"Error refreshing session: {e}")
+            logger.error("Error refreshing session: %s", e)
             raise
     
     async def validate_session(self, mobile_no: str, device_id: str, 
@@ -111,15 +112,15 @@ class SessionService:
                     await self.deactivate_session(mobile_no, device_id)
             return None
         except Exception as e:
-            logger.error(f"Error validating session: {e}")
+            logger.error("Error validating session: %s", e)
             raise
     
     async def cleanup_expired_sessions(self) -> int:
         """Clean up expired sessions"""
         try:
             count = await self.session_repository.delete_expired_sessions()
-            logger.info(f"Cleaned up {count} expired sessions")
+            logger.info("Cleaned up %s expired sessions", count)
             return count
         except Exception as e:
-            logger.error(f"Error cleaning up expired sessions: {e}")
+            logger.error("Error cleaning up expired sessions: %s", e)
             raise 
\ No newline at end of file
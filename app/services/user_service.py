@@ -1,108 +1,126 @@
 import logging
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import write_timestamp
+from app.repositories.user_repository import UserRepository, new_user_id
+from app.services.base import BaseService
 
 logger = logging.getLogger(__name__)
 
+# Fields no two users may share, and the error when one is taken
+UNIQUE_FIELDS = {
+    "mobile_no": "Mobile number already registered",
+    "email": "Email already registered",
+}
 
-class UserService:
+
+class UserService(BaseService):
     """User business logic service"""
     
     def __init__(self):
         self.user_repository = UserRepository()
     
-    async def get_users(self, limit: int = 100) -> List[UserResponse]:
+    async def get_users(self, limit: int = 100, fields: Optional[Sequence[str]] = None) -> List[dict]:
         """Get all users with pagination"""
         try:
-            users = await self.user_repository.get_all_users(limit=limit)
-            return [UserResponse(**user) for user in users]
+            return await self.user_repository.get_all_users(limit=limit, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting users: {e}")
+            logger.error("Error getting users: %s", e)
             raise
     
-    async def get_user_by_id(self, user_id: str) -> Optional[UserResponse]:
+    async def get_user_by_id(self, user_id: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by ID"""
         try:
-            user = await self.user_repository.get_user_by_id(user_id)
-            if user:
-                return UserResponse(**user)
-            return None
+            return await self.user_repository.get_user_by_id(user_id, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting user {user_id}: {e}")
+            logger.error("Error getting user %s: %s", user_id, e)
             raise
     
-    async def get_user_by_mobile(self, mobile_no: str) -> Optional[UserResponse]:
+    async def get_user_by_mobile(self, mobile_no: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by mobile number"""
         try:
-            user = await self.user_repository.get_user_by_mobile(mobile_no)
-            if user:
-                return UserResponse(**user)
-            return None
+            return await self.user_repository.get_user_by_mobile(mobile_no, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting user by mobile {mobile_no}: {e}")
+            logger.error("Error getting user by mobile %s: %s", mobile_no, e)
             raise
     
-    async def get_user_by_email(self, email: str) -> Optional[UserResponse]:
+    async def get_user_by_email(self, email: str, fields: Optional[Sequence[str]] = None) -> Optional[dict]:
         """Get user by email"""
         try:
-            user = await self.user_repository.get_user_by_email(email)
-            if user:
-                return UserResponse(**user)
-            return None
+            return await self.user_repository.get_user_by_email(email, fields=fields)
         except Exception as e:
-            logger.error(f"Error getting user by email {email}: {e}")
+            logger.error("Error getting user by email %s: %s", email, e)
             raise
     
     async def create_user(self, user_data: UserCreate) -> UserResponse:
         """Create a new user"""
         try:
-            # Business logic validation
-            if await self.user_repository.get_user_by_mobile(user_data.mobile_no):
-                raise ValueError("Mobile number already registered")
-            
-            if user_data.email and await self.user_repository.get_user_by_email(user_data.email):
-                raise ValueError("Email already registered")
-            
-            user = await self.user_repository.create_user(user_data)
-            logger.info(f"Created user with ID: {user['id']}")
+            user_id = new_user_id(user_data.mobile_no)
+            claimed = await self._claim_unique(user_id, user_data.model_dump(include=set(UNIQUE_FIELDS)))
+            try:
+                user = await self.user_repository.create_user(user_data, user_id)
+            except Exception:
+                await self._release_unique(user_id, claimed)
+                raise
+            logger.info("Created user with ID: %s", user['id'])
             return UserResponse(**user)
         except Exception as e:
-            logger.error(f"Error creating user: {e}")
+            logger.error("Error creating user: %s", e)
             raise
     
     async def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[UserResponse]:
         """Update an existing user"""
         try:
+            read_at = write_timestamp()
             user = await self.user_repository.get_user_by_id(user_id)
             if not user:
                 return None
             
-            # Business logic validation
-            if user_data.mobile_no and user_data.mobile_no != user['mobile_no']:
-                if await self.user_repository.get_user_by_mobile(user_data.mobile_no):
-                    raise ValueError("Mobile number already registered")
-            
-            if user_data.email and user_data.email != user['email']:
-                if await self.user_repository.get_user_by_email(user_data.email):
-                    raise ValueError("Email already registered")
-            
-            updated_user = await self.user_repository.update_user(user_id, user_data)
-            if updated_user:
-                logger.info(f"Updated user with ID: {user_id}")
-                return UserResponse(**updated_user)
-            return None
+            # Only values that change are claimed; the lookup tables enforce uniqueness
+            changed = {
+                column: value for column, value in user_data.model_dump(include=set(UNIQUE_FIELDS)).items()
+                if value and value != user[column]
+            }
+            claimed = await self._claim_unique(user_id, changed)
+            try:
+                changes = await self.user_repository.update_user(user_id, user_data, read_at)
+            except Exception:
+                await self._release_unique(user_id, claimed)
+                raise
+            await self._release_unique(user_id, [(column, user[column]) for column, _ in claimed if user[column]])
+            logger.info("Updated user with ID: %s", user_id)
+            return UserResponse(**{**user, **changes})
         except Exception as e:
-            logger.error(f"Error updating user {user_id}: {e}")
+            logger.error("Error updating user %s: %s", user_id, e)
             raise
     
     async def delete_user(self, user_id: str) -> bool:
         """Delete a user"""
         try:
+            user = await self.user_repository.get_user_by_id(user_id, fields=tuple(UNIQUE_FIELDS))
             success = await self.user_repository.delete_user(user_id)
+            if user:
+                await self._release_unique(user_id, [(column, user[column]) for column in UNIQUE_FIELDS if user[column]])
             if success:
-                logger.info(f"Deleted user with ID: {user_id}")
+                logger.info("Deleted user with ID: %s", user_id)
             return success
         except Exception as e:
-            logger.error(f"Error deleting user {user_id}: {e}")
-            raise 
\ No newline at end of file
+            logger.error("Error deleting user %s: %s", user_id, e)
+            raise
+    
+    async def _claim_unique(self, user_id: str, values: Dict[str, Optional[str]]) -> List[Tuple[str, str]]:
+        """Claim mobile number and email values for a user, or raise ValueError if one is taken"""
+        claimed = []
+        for column, value in values.items():
+            if not value:
+                continue
+            if not await self.user_repository.claim_unique(column, value, user_id):
+                await self._release_unique(user_id, claimed)
+                raise ValueError(UNIQUE_FIELDS[column])
+            claimed.append((column, value))
+        return claimed
+    
+    async def _release_unique(self, user_id: str, values: List[Tuple[str, str]]):
+        """Give up claimed mobile number and email values"""
+        for column, value in values:
+            await self.user_repository.release_unique(column, value, user_id)
\ No newline at end of file
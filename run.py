@@ -1,15 +1,23 @@
 #!/usr/bin/env python3
 """
 Main entry point for the FastAPI application
+
+    python run.py               # development: one process, reload when RELOAD=true
+    python run.py --production  # production: one worker per CPU, uvloop/httptools
+
+ENVIRONMENT=production selects production mode without the flag.
 """
+import argparse
 import uvicorn
 from app.core.config import settings
+from app.core.server import APP, prepare_metrics_dir, uvicorn_options
 
 if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host=settings.HOST,
-        port=settings.PORT,
-        reload=settings.RELOAD,
-        log_level=settings.LOG_LEVEL.lower()
-    ) 
\ No newline at end of file
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--production", action="store_true", help="multi-worker production launcher")
+    args = parser.parse_args()
+
+    production = args.production or settings.ENVIRONMENT == "production"
+    options = uvicorn_options(production)
+    prepare_metrics_dir(options.get("workers", 1))
+    uvicorn.run(APP, **options)
\ No newline at end of file
@@ -0,0 +1,100 @@
+import asyncio
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from app.api.v1.endpoints import batch
+from app.core.config import settings
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(batch.router, prefix=f"{settings.API_V1_STR}/batch")
+    running = {"now": 0, "max": 0}
+
+    @app.get("/api/v1/users/{user_id}")
+    async def get_user(user_id: str):
+        if user_id == "missing":
+            raise HTTPException(status_code=404, detail="User not found")
+        running["now"] += 1
+        running["max"] = max(running["max"], running["now"])
+        await asyncio.sleep(0.01)
+        running["now"] -= 1
+        return {"id": user_id, "league": {"id": f"league-of-{user_id}", "size": 3}}
+
+    @app.post("/api/v1/echo")
+    async def echo(payload: dict):
+        return payload
+
+    client = TestClient(app)
+    client.running = running
+    return client
+
+
+def test_references_and_concurrency(client):
+    """Independent calls overlap; dependent ones get earlier results substituted"""
+    response = client.post("/api/v1/batch", json={"requests": [
+        {"id": "a", "path": "/api/v1/users/a"},
+        {"id": "b", "path": "/api/v1/users/b"},
+        {"id": "echo", "method": "POST", "path": "/api/v1/echo", "body": {
+            "size": "${a.body.league.size}",
+            "label": "${a.body.league.id} and ${b.body.id}",
+        }},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["responses"]
+    assert [result["status"] for result in results] == [200, 200, 200]
+    assert results[2]["body"] == {"size": 3, "label": "league-of-a and b"}
+    assert client.running["max"] == 2
+
+
+def test_failed_dependency_is_not_run(client):
+    """A call that references a failed one gets 424; other calls are unaffected"""
+    results = client.post("/api/v1/batch", json={"requests": [
+        {"id": "user", "path": "/api/v1/users/missing"},
+        {"id": "league", "path": "/api/v1/users/${user.body.id}"},
+        {"id": "other", "path": "/api/v1/users/c"},
+    ]}).json()["responses"]
+    assert [result["status"] for result in results] == [404, 424, 200]
+
+
+def test_invalid_batches_are_rejected(client):
+    """Forward references and nested batches are refused"""
+    forward = client.post("/api/v1/batch", json={"requests": [
+        {"id": "a", "path": "/api/v1/users/${b.body.id}"},
+        {"id": "b", "path": "/api/v1/users/b"},
+    ]})
+    assert forward.status_code == 400
+    nested = client.post("/api/v1/batch", json={"requests": [
+        {"id": "inner", "method": "POST", "path": "/api/v1/batch", "body": {"requests": []}},
+    ]}).json()["responses"]
+    assert nested[0]["status"] == 400
+
+
+def test_encoded_batch_paths_are_not_nested(client, monkeypatch):
+    """Percent-encoded or doubled-slash spellings of the batch path are refused too"""
+    results = client.post("/api/v1/batch", json={"requests": [
+        {"id": "encoded", "method": "POST", "path": "/api/v1/%62atch", "body": {"requests": []}},
+        {"id": "slashes", "method": "POST", "path": "//api//v1/batch/", "body": {"requests": []}},
+    ]}).json()["responses"]
+    assert [result["status"] for result in results] == [400, 400]
+
+    # Past the path check, the mark on the sub-request's scope still stops it
+    monkeypatch.setattr("app.core.batch.normalize_path", lambda path: path)
+    inner = client.post("/api/v1/batch", json={"requests": [
+        {"id": "encoded", "method": "POST", "path": "/api/v1/%62atch", "body": {"requests": [
+            {"id": "a", "path": "/api/v1/users/a"},
+        ]}},
+    ]}).json()["responses"][0]
+    assert inner == {"id": "encoded", "status": 400, "body": {"detail": "Batches cannot be nested"}}
+
+
+def test_non_latin1_input_fails_only_its_own_request(client):
+    """Non-ASCII paths are percent-encoded; unencodable headers get a 400 for that request alone"""
+    results = client.post("/api/v1/batch", json={"requests": [
+        {"id": "path", "path": "/api/v1/users/ü✓?q=✓"},
+        {"id": "header", "path": "/api/v1/users/a", "headers": {"X-Note": "✓"}},
+        {"id": "other", "path": "/api/v1/users/b"},
+    ]}).json()["responses"]
+    assert [result["status"] for result in results] == [200, 400, 200]
+    assert results[0]["body"]["id"] == "ü✓"
@@ -0,0 +1,106 @@
+import gzip
+import pytest
+from fastapi import FastAPI, Header
+from fastapi.testclient import TestClient
+from starlette.responses import Response, StreamingResponse
+from app.core import compression
+from app.core.compression import available_codecs, negotiate
+from app.core.config import settings
+from app.core.middleware import CompressionMiddleware
+
+CATALOG = b'{"games":[' + b",".join(b'{"id":"game-%d","name":"Chess"}' % index for index in range(200)) + b"]}"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/small")
+    async def small():
+        return Response(b'{"ok":true}', media_type="application/json")
+
+    @app.get("/catalog")
+    async def catalog(if_none_match: str = Header(None)):
+        if if_none_match == '"v1"':
+            return Response(status_code=304, headers={"etag": '"v1"'})
+        return Response(CATALOG, media_type="application/json", headers={"etag": '"v1"'})
+
+    @app.get("/export")
+    async def export():
+        async def rows():
+            for index in range(50):
+                yield b"%d,user-%d,active\n" % (index, index) * 20
+        return StreamingResponse(rows(), media_type="text/csv")
+
+    return TestClient(app)
+
+
+def test_small_bodies_are_not_compressed(client):
+    """Below COMPRESSION_MIN_BYTES the body is sent as is, but still varies by coding"""
+    response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+
+def test_catalog_is_compressed_once_and_tagged_per_coding(client, monkeypatch):
+    """Repeated reads of an unchanged tagged response reuse the compressed body"""
+    calls = []
+    codec = compression.available_codecs()["gzip"]
+    compress = codec.compress
+    monkeypatch.setattr(codec, "compress", lambda data: calls.append(data) or compress(data))
+
+    for _ in range(3):
+        response = client.get("/catalog", headers={"Accept-Encoding": "br;q=0.9, gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["etag"] == '"v1-gzip"'
+        assert response.content == CATALOG
+    assert len(calls) == 1
+
+    revalidated = client.get("/catalog", headers={"Accept-Encoding": "gzip", "If-None-Match": '"v1-gzip"'})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == '"v1-gzip"'
+
+
+def test_streamed_exports_are_compressed_as_they_go(client):
+    """A streamed body is compressed chunk by chunk, without a content-length"""
+    with client.stream("GET", "/export", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == b"".join(b"%d,user-%d,active\n" % (index, index) * 20 for index in range(50))
+
+
+def test_negotiation(monkeypatch):
+    """The client's preference wins; q=0 refuses a coding; * covers the rest"""
+    monkeypatch.setattr(settings, "COMPRESSION_ENCODINGS", ["zstd", "br", "gzip"])
+    installed = [name for name in settings.COMPRESSION_ENCODINGS if name in available_codecs()]
+    assert negotiate("*").name == installed[0]
+    assert negotiate("gzip;q=0.5, identity").name == "gzip"
+    monkeypatch.setattr(settings, "COMPRESSION_ENCODINGS", ["gzip"])
+    assert negotiate("*").name == "gzip"
+    assert negotiate("br, zstd") is None
+    assert negotiate("gzip;q=0") is None
+    assert negotiate("identity") is None
+    assert negotiate(None) is None
+
+
+@pytest.mark.parametrize("name, module, decompress", [
+    ("gzip", "zlib", lambda module, data: module.decompressobj(16 + module.MAX_WBITS).decompress(data)),
+    ("br", "brotli", lambda module, data: module.Decompressor().process(data)),
+    ("zstd", "zstandard", lambda module, data: module.ZstdDecompressor().decompressobj().decompress(data)),
+])
+def test_codecs_round_trip(name, module, decompress):
+    """One-shot and streamed output of each installed codec decodes to the input"""
+    module = pytest.importorskip(module)
+    codec = available_codecs()[name]
+    assert decompress(module, codec.compress(CATALOG)) == CATALOG
+
+    stream = codec.stream()
+    chunks = [CATALOG[start:start + 1000] for start in range(0, len(CATALOG), 1000)]
+    flushed = b""
+    for index, chunk in enumerate(chunks):
+        flushed += stream.compress(chunk)
+        # Every chunk is flushed, so what was sent so far already decodes
+        assert decompress(module, flushed) == b"".join(chunks[:index + 1])
+    assert decompress(module, flushed + stream.finish()) == CATALOG
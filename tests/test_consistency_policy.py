@@ -0,0 +1,29 @@
+from cassandra import ConsistencyLevel
+from app.core.execution_profiles import resolve_consistency
+from app.core.query_metrics import QueryMetrics
+
+
+def test_exact_operation_and_patterns_resolve():
+    """Exact keys and glob patterns map to driver consistency levels"""
+    assert resolve_consistency("users.get_user_by_mobile") == ConsistencyLevel.LOCAL_QUORUM
+    assert resolve_consistency("otp_store.verify_otp") == ConsistencyLevel.LOCAL_QUORUM
+    assert resolve_consistency("games.get_all_games") == ConsistencyLevel.LOCAL_ONE
+
+
+def test_unlisted_operation_uses_profile_level():
+    """Operations missing from the policy keep their execution profile's level"""
+    assert resolve_consistency("games.update_game") is None
+
+
+def test_query_metrics_record_effective_level():
+    """Snapshots aggregate latency and report the level each operation ran at"""
+    metrics = QueryMetrics()
+    metrics.record("users.get_user_by_id", 2.0, consistency_level="LOCAL_ONE", profile="default")
+    metrics.record("users.get_user_by_id", 4.0, consistency_level="LOCAL_ONE", profile="default", error=True)
+
+    stats = metrics.snapshot()["users.get_user_by_id"]
+    assert stats["count"] == 2
+    assert stats["errors"] == 1
+    assert stats["avg_ms"] == 3.0
+    assert stats["max_ms"] == 4.0
+    assert stats["consistency_level"] == "LOCAL_ONE"
@@ -0,0 +1,83 @@
+from datetime import datetime
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import app.core.responses as responses
+from app.api.v1.endpoints import contests, users
+from app.core.config import settings
+from app.core.dependencies import get_contest_service, get_user_service
+from app.core.responses import content_etag, etag_matches
+from tests.test_responses import user_row
+
+
+def contest_row() -> dict:
+    return {
+        "contest_id": "contest-1",
+        "contest_name": "Weekend Cup",
+        "contest_win_price": "1000",
+        "contest_entryfee": "10",
+        "contest_joinuser": 5,
+        "contest_activeuser": 2,
+        "contest_starttime": datetime(2024, 1, 1),
+        "contest_endtime": datetime(2024, 1, 2),
+    }
+
+
+@pytest.fixture
+def client():
+    user = user_row(1)
+
+    class FakeUserService:
+        async def get_user_by_id(self, user_id, fields=None):
+            return dict(user)
+
+    class FakeContestService:
+        async def get_contest_by_id(self, contest_id, fields=None):
+            return contest_row()
+
+    app = FastAPI()
+    app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users")
+    app.include_router(contests.router, prefix=f"{settings.API_V1_STR}/contests")
+    app.dependency_overrides[get_user_service] = FakeUserService
+    app.dependency_overrides[get_contest_service] = FakeContestService
+    client = TestClient(app)
+    client.user = user
+    return client
+
+
+def test_unchanged_version_is_not_encoded(client, monkeypatch):
+    """A matching tag from updated_at answers 304 without serializing the row"""
+    first = client.get("/api/v1/users/user-1")
+    etag = first.headers["etag"]
+
+    def fail(*args, **kwargs):
+        raise AssertionError("row was serialized")
+
+    monkeypatch.setattr(responses, "serialize_rows", fail)
+    cached = client.get("/api/v1/users/user-1", headers={"If-None-Match": f'W/"other", {etag}'})
+    assert cached.status_code == 304
+    assert cached.content == b""
+    assert cached.headers["etag"] == etag
+    monkeypatch.undo()
+
+    client.user["updated_at"] = datetime(2024, 2, 1)
+    changed = client.get("/api/v1/users/user-1", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    projected = client.get("/api/v1/users/user-1", params={"fields": "id"})
+    assert projected.headers["etag"] not in (etag, changed.headers["etag"])
+
+
+def test_rows_without_versions_use_a_content_hash(client):
+    """Contests have no updated_at, so the tag hashes the encoded body"""
+    first = client.get("/api/v1/contests/contest-1")
+    assert first.headers["etag"] == content_etag(first.content)
+    assert client.get("/api/v1/contests/contest-1", headers={"If-None-Match": first.headers["etag"]}).status_code == 304
+
+
+def test_if_none_match_parsing():
+    """Lists and weak validators match; a missing header never does"""
+    assert etag_matches("*", '"a"')
+    assert etag_matches('"b", W/"a"', '"a"')
+    assert not etag_matches('"b"', '"a"')
+    assert not etag_matches(None, '"a"')
@@ -0,0 +1,29 @@
+import asyncio
+from app.core.config import settings
+from app.core.database import cassandra_manager
+from app.core.health_probes import DatabaseProbe, percentile
+
+
+def test_percentile_nearest_rank():
+    """Percentiles use nearest rank over the rolling window"""
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) is None
+
+
+def test_failed_probes_mark_database_unhealthy(monkeypatch):
+    """Consecutive probe failures turn the cached state unhealthy"""
+    def unreachable():
+        raise ConnectionError("no hosts available")
+
+    monkeypatch.setattr(cassandra_manager, "get_session", unreachable)
+    probe = DatabaseProbe()
+    assert probe.snapshot()["status"] == "unknown"
+
+    for _ in range(settings.HEALTH_PROBE_FAILURE_THRESHOLD):
+        asyncio.run(probe.run_once())
+    snapshot = probe.snapshot()
+    assert snapshot["status"] == "unhealthy"
+    assert snapshot["last_error"] == "no hosts available"
+    assert snapshot["consecutive_failures"] == settings.HEALTH_PROBE_FAILURE_THRESHOLD
@@ -0,0 +1,142 @@
+import asyncio
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import app.repositories.base as repository_base
+from app.core.config import settings
+from app.core.middleware import IdempotencyMiddleware
+from app.services.idempotency_service import IdempotencyService
+
+
+class FakeIdempotencyRepository:
+    """In-memory stand-in for the idempotency_keys table"""
+
+    def __init__(self):
+        self.rows = {}
+        self.ttls = {}
+
+    async def claim(self, key, fingerprint, created_at, ttl):
+        if key in self.rows:
+            return self.rows[key]
+        self.rows[key] = {"fingerprint": fingerprint, "status_code": None, "headers": None, "body": None}
+        self.ttls[key] = ttl
+        return None
+
+    async def complete(self, key, fingerprint, created_at, status_code, headers, body, ttl):
+        if self.rows.get(key, {}).get("fingerprint") != fingerprint:
+            return False
+        self.rows[key].update(status_code=status_code, headers=headers, body=body)
+        self.ttls[key] = ttl
+        return True
+
+    async def release(self, key):
+        self.rows.pop(key, None)
+        return True
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: object())
+    service = IdempotencyService()
+    service.idempotency_repository = FakeIdempotencyRepository()
+    calls = []
+
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware)
+    app.state.services = type("Services", (), {"idempotency": service})()
+
+    @app.post("/api/v1/otp/", status_code=201)
+    async def create(payload: dict):
+        calls.append(payload)
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+        return {"call": len(calls)}
+
+    client = TestClient(app, raise_server_exceptions=False)
+    client.calls = calls
+    client.service = service
+    return client
+
+
+def test_retry_replays_the_stored_response(client):
+    """A repeated key is answered from the store without running the handler"""
+    first = client.post("/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k1"})
+    # A new worker would have an empty front cache and read the table
+    client.service.completed.pop("k1")
+    second = client.post("/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k1"})
+    third = client.post("/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k1"})
+    assert len(client.calls) == 1
+    assert first.status_code == second.status_code == third.status_code == 201
+    assert second.json() == third.json() == {"call": 1}
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+
+def test_key_reused_for_another_request_is_rejected(client):
+    """The same key with a different body is a client error"""
+    client.post("/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k2"})
+    response = client.post("/api/v1/otp/", json={"to": "b"}, headers={"Idempotency-Key": "k2"})
+    assert response.status_code == 422
+    assert len(client.calls) == 1
+
+
+def test_failures_are_not_stored(client):
+    """A request that errors can be retried with the same key"""
+    for _ in range(2):
+        response = client.post("/api/v1/otp/", json={"fail": True}, headers={"Idempotency-Key": "k3"})
+        assert response.status_code == 500
+    assert len(client.calls) == 2
+    assert "k3" not in client.service.idempotency_repository.rows
+
+
+def test_claim_is_a_lease_until_completed(client):
+    """The claim expires quickly unless the response is stored under the full TTL"""
+    repository = client.service.idempotency_repository
+    original = repository.claim
+    claimed = []
+
+    async def claim(key, fingerprint, created_at, ttl):
+        claimed.append(ttl)
+        return await original(key, fingerprint, created_at, ttl)
+
+    repository.claim = claim
+    client.post("/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k4"})
+    assert claimed == [settings.IDEMPOTENCY_LEASE_SECONDS]
+    assert repository.ttls["k4"] == settings.IDEMPOTENCY_TTL_SECONDS
+
+
+def test_cancelled_request_releases_its_key(client):
+    """A request cancelled mid-flight leaves neither a stored claim nor an in-memory one"""
+    async def cancelled(scope, receive, send):
+        raise asyncio.CancelledError()
+
+    middleware = IdempotencyMiddleware(cancelled)
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/api/v1/otp/",
+        "query_string": b"",
+        "headers": [(b"idempotency-key", b"k5")],
+        "app": client.app,
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"{}", "more_body": False}
+
+    async def send(message):
+        pass
+
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(middleware(scope, receive, send))
+    assert "k5" not in client.service.idempotency_repository.rows
+    assert "k5" not in client.service._in_flight
+
+
+def test_keys_are_scoped_to_the_caller(client):
+    """Two callers using the same key each get their own request run"""
+    for token in ("Bearer a", "Bearer b"):
+        response = client.post(
+            "/api/v1/otp/", json={"to": "a"}, headers={"Idempotency-Key": "k6", "Authorization": token}
+        )
+        assert response.status_code == 201
+    assert len(client.calls) == 2
@@ -0,0 +1,41 @@
+import json
+import logging
+import queue
+from app.core.logging import AccessLogSampler, BoundedQueueHandler, JsonFormatter
+
+
+def _record(level=logging.INFO, msg="hello %s", args=("world",)):
+    return logging.LogRecord("app.test", level, __file__, 1, msg, args, None)
+
+
+def test_full_queue_drops_and_reports():
+    """A full queue drops records, then reports the count once it drains"""
+    log_queue = queue.Queue(maxsize=4)
+    handler = BoundedQueueHandler(log_queue, error_put_timeout=0)
+    for _ in range(6):
+        handler.handle(_record())
+    assert handler.dropped == 2
+
+    while not log_queue.empty():
+        log_queue.get_nowait()
+    handler.handle(_record())
+    messages = [log_queue.get_nowait().getMessage() for _ in range(log_queue.qsize())]
+    assert messages == ["hello world", "Log queue full, dropped 2 records"]
+
+
+def test_json_formatter_includes_extra_fields():
+    """JSON lines carry the rendered message and any extra attributes"""
+    record = _record()
+    record.request_id = "abc"
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc"
+
+
+def test_access_sampler_keeps_errors():
+    """Sampling never drops 4xx/5xx access lines"""
+    sampler = AccessLogSampler(rate=0.0)
+    access = '%s - "%s %s HTTP/%s" %d'
+    assert sampler.filter(_record(msg=access, args=("1.2.3.4", "GET", "/x", "1.1", 500)))
+    assert not sampler.filter(_record(msg=access, args=("1.2.3.4", "GET", "/x", "1.1", 200)))
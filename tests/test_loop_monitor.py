@@ -0,0 +1,41 @@
+import asyncio
+import logging
+import time
+from app.core.loop_monitor import LoopMonitor
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def blocking_repository_call():
+    time.sleep(0.3)
+
+
+def test_blocked_loop_stack_is_captured():
+    """A synchronous call on the loop is reported with the blocking function's stack"""
+    capture = _Capture()
+    diagnostics = logging.getLogger("app.diagnostics")
+    diagnostics.addHandler(capture)
+
+    async def scenario():
+        monitor = LoopMonitor(interval=0.02, block_threshold=0.05)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        blocking_repository_call()
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor
+
+    try:
+        monitor = asyncio.run(scenario())
+    finally:
+        diagnostics.removeHandler(capture)
+
+    assert monitor.max_lag >= 0.2
+    assert any("blocking_repository_call" in message for message in capture.messages)
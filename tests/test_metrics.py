@@ -0,0 +1,17 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_metrics_label_requests_by_route_template():
+    """Request latency is exported per route template and status"""
+    client.get("/api/v1/health/detailed")
+    client.get("/no-such-route")
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    body = response.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/api/v1/health/detailed",status="200"}' in body
+    assert 'route="unmatched",status="404"' in body
+    assert "http_requests_in_progress" in body
@@ -0,0 +1,42 @@
+import pytest
+from app.migrations.runner import SchemaVersionError, check_schema_version, load_migrations
+
+class FakeResult:
+    def __init__(self, row):
+        self.row = row
+
+    def one(self):
+        return self.row
+
+
+class FakeSession:
+    """Session stub that only answers the schema version query"""
+
+    def __init__(self, version):
+        self.version = version
+        self.queries = []
+
+    def execute(self, query, params=None):
+        self.queries.append(query)
+        return FakeResult({"version": self.version} if self.version else None)
+
+
+def test_migrations_are_ordered_and_contiguous():
+    """Test migration files load in version order without gaps"""
+    versions = [migration.version for migration in load_migrations()]
+    assert versions == list(range(1, len(versions) + 1))
+
+
+def test_startup_check_runs_no_ddl():
+    """Test the startup check is a single version read"""
+    latest = load_migrations()[-1].version
+    session = FakeSession(latest)
+    assert check_schema_version(session) == latest
+    assert len(session.queries) == 1
+    assert session.queries[0].lstrip().upper().startswith("SELECT")
+
+
+def test_startup_check_rejects_stale_schema():
+    """Test workers refuse to start against an older schema"""
+    with pytest.raises(SchemaVersionError):
+        check_schema_version(FakeSession(0))
@@ -0,0 +1,38 @@
+import logging
+from app.core.config import Settings
+from app.core.database import CassandraManager
+import app.core.database as database
+
+
+class FakeCluster:
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.calls.append(name)
+
+
+def configure(monkeypatch, **env) -> FakeCluster:
+    for name, value in env.items():
+        monkeypatch.setenv(name, value)
+    monkeypatch.setattr(database, "settings", Settings())
+    manager = CassandraManager()
+    manager.cluster = FakeCluster()
+    manager._configure_pools()
+    return manager.cluster
+
+
+def test_pool_settings_ignored_on_v3_are_reported(monkeypatch, caplog):
+    """Explicit pool sizing on a multiplexed protocol is logged, not applied"""
+    with caplog.at_level(logging.WARNING, logger="app.core.database"):
+        cluster = configure(monkeypatch, CASSANDRA_PROTOCOL_VERSION="5", CASSANDRA_MAX_CONNECTIONS_PER_HOST="16")
+    assert cluster.calls == []
+    assert "CASSANDRA_MAX_CONNECTIONS_PER_HOST" in caplog.text
+
+
+def test_default_pool_settings_stay_quiet(monkeypatch, caplog):
+    """Defaults are not reported; v2 still applies them to the cluster"""
+    with caplog.at_level(logging.WARNING, logger="app.core.database"):
+        assert configure(monkeypatch, CASSANDRA_PROTOCOL_VERSION="5").calls == []
+        assert len(configure(monkeypatch, CASSANDRA_PROTOCOL_VERSION="2").calls) == 3
+    assert caplog.text == ""
@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.main import app
+
+client = TestClient(app)
+ADMIN = {"X-Admin-Token": "secret"}
+
+
+def test_profile_endpoint_returns_collapsed_stacks(monkeypatch):
+    """The admin profile endpoint samples the loop and returns folded stacks"""
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "secret")
+    response = client.get("/api/v1/admin/profile", params={"seconds": 0.2}, headers=ADMIN)
+    assert response.status_code == 200
+    assert int(response.headers["x-profile-samples"]) > 0
+    stack, count = response.text.splitlines()[0].rsplit(" ", 1)
+    assert int(count) > 0
+    assert ";" in stack
+
+    assert client.get("/api/v1/admin/profile", params={"seconds": 3600}, headers=ADMIN).status_code == 400
+
+
+def test_request_profile_via_header(monkeypatch):
+    """X-Profile with an admin token profiles that request and returns its id"""
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "secret")
+    response = client.get("/api/v1/health/detailed", headers={"X-Profile": "1", **ADMIN})
+    profile_id = response.headers["x-profile-id"]
+    assert client.get(f"/api/v1/admin/profile/requests/{profile_id}", headers=ADMIN).status_code == 200
+
+    assert "x-profile-id" not in client.get("/api/v1/health/detailed", headers={"X-Profile": "1"}).headers
+
+
+def test_kill_switch(monkeypatch):
+    """PROFILER_ENABLED=false refuses profiles"""
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "secret")
+    monkeypatch.setattr(settings, "PROFILER_ENABLED", False)
+    assert client.get("/api/v1/admin/profile", params={"seconds": 0.1}, headers=ADMIN).status_code == 403
@@ -0,0 +1,70 @@
+import asyncio
+import json
+from datetime import datetime
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import app.repositories.base as repository_base
+from app.api.v1.endpoints import users
+from app.core.config import settings
+from app.core.database import cassandra_manager
+from app.core.dependencies import get_user_service
+from app.repositories.league_join_repository import LeagueJoinRepository
+from app.repositories.otp_repository import OTPRepository
+from tests.test_responses import user_row
+from tests.test_updates import FakeSession, FakeStatement, fake_execute_async
+
+
+def make_repository(monkeypatch, repository_class, session=None):
+    class FakePrepared:
+        def __init__(self, query):
+            self.query = query
+
+        def bind(self, params):
+            return FakeStatement(self.query, params)
+
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: session)
+    monkeypatch.setattr(cassandra_manager, "prepare", FakePrepared)
+    monkeypatch.setattr(repository_base, "execute_async", fake_execute_async)
+    monkeypatch.setattr(repository_base, "_projections", {})
+    return repository_class()
+
+
+def test_projected_read_selects_and_converts_only_requested_columns(monkeypatch):
+    """Timestamp fields read both copies; columns not selected are not added back"""
+    session = FakeSession({"user_id": "user-1", "updated_at": "2024-01-02T03:04:05", "updated_at_ts": None})
+    repository = make_repository(monkeypatch, LeagueJoinRepository, session)
+    join = asyncio.run(repository.get_league_join_by_user_and_league("user-1", "league-1", fields=("user_id", "updated_at")))
+    assert session.executed[0].query.startswith("SELECT user_id, updated_at, updated_at_ts FROM league_joins")
+    assert join == {"user_id": "user-1", "updated_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+
+def test_projected_statements_are_capped_per_table(monkeypatch):
+    """Past the limit, new column lists fall back to reading every column"""
+    monkeypatch.setattr(settings, "FIELD_PROJECTION_MAX_STATEMENTS", 1)
+    repository = make_repository(monkeypatch, OTPRepository)
+    assert repository._columns(None) == "*"
+    assert repository._columns(("otp_code",)) == "otp_code"
+    assert repository._columns(("purpose",)) == "*"
+    assert repository._columns(("otp_code",)) == "otp_code"
+
+
+def test_fields_parameter(monkeypatch):
+    """Responses carry only the requested fields, in schema order; unknown ones are refused"""
+    class FakeUserService:
+        async def get_users(self, limit=100, fields=None):
+            # Full rows, as a cached or unprojected read returns them
+            return [user_row(index) for index in range(2)]
+
+    app = FastAPI()
+    app.include_router(users.router, prefix=f"{settings.API_V1_STR}/users")
+    app.dependency_overrides[get_user_service] = FakeUserService
+    client = TestClient(app)
+
+    response = client.get("/api/v1/users/", params={"fields": "status, id"})
+    assert response.status_code == 200
+    assert response.content == json.dumps(
+        [{"id": "user-0", "status": "active"}, {"id": "user-1", "status": "active"}], separators=(",", ":")
+    ).encode()
+    unknown = client.get("/api/v1/users/", params={"fields": "id,password"})
+    assert unknown.status_code == 400
+    assert unknown.json()["detail"] == "Unknown field(s): password"
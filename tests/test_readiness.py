@@ -0,0 +1,98 @@
+import asyncio
+import pytest
+from fastapi.testclient import TestClient
+import app.repositories.base as repository_base
+from app.core.cache import RefreshingValue
+from app.core.database import cassandra_manager
+from app.core.readiness import Readiness, readiness
+from app.main import app
+from app.repositories.user_repository import UserRepository
+
+client = TestClient(app)
+
+
+async def fake_execute_async(session, statement, **kwargs):
+    return session.execute(statement, **kwargs)
+
+
+class FakeServices:
+    def __init__(self):
+        self.warmed = 0
+
+    async def warmup(self):
+        self.warmed += 1
+
+
+def test_ready_is_unavailable_until_warmup_completes(monkeypatch):
+    """/ready answers 503 while warming up and 200 afterwards; /health is always live"""
+    monkeypatch.setattr(readiness, "ready", False)
+    assert client.get("/ready").status_code == 503
+    assert client.get("/health").status_code == 200
+
+    monkeypatch.setattr(cassandra_manager, "open_pools", lambda timeout: {"10.0.0.1:9042": 1})
+    services = FakeServices()
+    asyncio.run(readiness.warmup(services))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["hosts"] == {"10.0.0.1:9042": 1}
+    assert services.warmed == 1
+
+
+def test_warmup_fails_without_open_connections(monkeypatch):
+    """A worker with no open pool never reports ready"""
+    monkeypatch.setattr(cassandra_manager, "open_pools", lambda timeout: {"10.0.0.1:9042": 0})
+    state = Readiness()
+    with pytest.raises(RuntimeError):
+        asyncio.run(state.warmup(FakeServices()))
+    assert not state.ready
+
+
+def test_prepare_only_warmup_does_not_execute(monkeypatch):
+    """Statements are prepared for every read; only the synthetic lookup runs"""
+    prepared, executed = [], []
+
+    class FakeSession:
+        def execute(self, statement, **kwargs):
+            executed.append(statement)
+            return FakeResult()
+
+        def get_execution_profile(self, profile):
+            return type("Profile", (), {"consistency_level": 1})()
+
+    class FakeResult(list):
+        def one(self):
+            return None
+
+    class FakePrepared:
+        def __init__(self, query):
+            prepared.append(query)
+
+        def bind(self, params):
+            return self
+
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: FakeSession())
+    monkeypatch.setattr(cassandra_manager, "prepare", FakePrepared)
+    monkeypatch.setattr(repository_base, "execute_async", fake_execute_async)
+    asyncio.run(UserRepository().warmup())
+    assert len(prepared) == 8
+    assert len(executed) == 1
+
+
+def test_refreshing_value_shares_loads_and_invalidates():
+    """Concurrent gets share one load; invalidate forces a reload"""
+    loads = []
+
+    async def loader():
+        loads.append(1)
+        await asyncio.sleep(0)
+        return len(loads)
+
+    async def scenario():
+        value = RefreshingValue(loader, ttl=60)
+        first = await asyncio.gather(value.get(), value.get(), value.get())
+        value.invalidate()
+        return first, await value.get()
+
+    first, second = asyncio.run(scenario())
+    assert first == [1, 1, 1]
+    assert second == 2
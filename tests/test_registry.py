@@ -0,0 +1,56 @@
+import asyncio
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+import app.repositories.base as repository_base
+from app.core.dependencies import get_services, get_user_service
+from app.main import app
+from app.services.registry import ServiceRegistry
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: object())
+    return ServiceRegistry()
+
+
+def make_request() -> Request:
+    return Request({"type": "http", "app": app, "headers": []})
+
+
+def test_dependencies_hand_out_registry_instances(registry, monkeypatch):
+    """Every request gets the same application-scoped service"""
+    monkeypatch.setattr(app.state, "services", registry, raising=False)
+    assert get_user_service(make_request()) is registry.users
+    assert get_user_service(make_request()) is get_user_service(make_request())
+
+
+def test_missing_registry_is_unavailable(monkeypatch):
+    """Before the lifespan has built the registry, requests get 503"""
+    monkeypatch.setattr(app.state, "services", None, raising=False)
+    with pytest.raises(HTTPException) as error:
+        get_services(make_request())
+    assert error.value.status_code == 503
+
+
+def test_lifecycle_hooks_reach_every_repository(registry):
+    """warmup and close run once on each service's repository"""
+    calls = []
+
+    async def skip_load():
+        return []
+
+    # Cache loads would query the database
+    registry.games.catalog.load = skip_load
+    registry.contests.live_contests.load = skip_load
+    for service in registry.services():
+        for repository in service.repositories():
+            for hook in ("warmup", "flush", "close"):
+                async def record(hook=hook, name=type(repository).__name__):
+                    calls.append((hook, name))
+                setattr(repository, hook, record)
+
+    asyncio.run(registry.warmup())
+    asyncio.run(registry.close())
+    assert [hook for hook, _ in calls].count("warmup") == len(registry.services())
+    assert [hook for hook, _ in calls[len(registry.services()):]] == ["flush", "close"] * len(registry.services())
@@ -0,0 +1,74 @@
+import asyncio
+from datetime import datetime
+import app.repositories.base as repository_base
+from app.core import timestamps
+from app.core.database import cassandra_manager
+from app.repositories.contest_repository import ContestRepository
+from app.repositories.league_join_repository import LeagueJoinRepository
+from app.repositories.otp_repository import OTPRepository
+from app.schemas.contest import ContestCreate
+from tests.test_updates import FakeSession, FakeStatement, fake_execute_async
+
+
+def make_repository(monkeypatch, repository_class, session):
+    class FakePrepared:
+        def __init__(self, query):
+            self.query = query
+
+        def bind(self, params):
+            return FakeStatement(self.query, params)
+
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: session)
+    monkeypatch.setattr(cassandra_manager, "prepare", FakePrepared)
+    monkeypatch.setattr(repository_base, "execute_async", fake_execute_async)
+    return repository_class()
+
+
+def test_create_contest_writes_both_timestamp_copies(monkeypatch):
+    """The start and end times are written as TEXT and TIMESTAMP during dual-write"""
+    monkeypatch.setattr(timestamps.settings, "TIMESTAMP_MIGRATION_PHASE", "dual_write")
+    session = FakeSession({})
+    repository = make_repository(monkeypatch, ContestRepository, session)
+    contest = asyncio.run(repository.create_contest(ContestCreate(
+        contest_name="Weekend Cup",
+        contest_win_price="1000",
+        contest_entryfee="10",
+        contest_starttime=datetime(2024, 1, 1, 10, 0, 0, 123456),
+        contest_endtime=datetime(2024, 1, 2, 10, 0, 0),
+    )))
+    insert = session.executed[0]
+    assert insert.query.split()[0] == "INSERT"
+    assert datetime(2024, 1, 1, 10, 0, 0, 123000) in insert.params
+    assert "2024-01-02T10:00:00" in insert.params
+    assert contest["contest_starttime"] == datetime(2024, 1, 1, 10, 0, 0, 123000)
+    assert contest["contest_endtime"] == datetime(2024, 1, 2, 10, 0, 0)
+
+
+def test_update_join_status_addresses_the_stored_row(monkeypatch):
+    """The current status and TEXT joined_at key are read from the dict row"""
+    session = FakeSession({
+        "league_id": "league-1",
+        "status": "pending",
+        "user_id": "user-1",
+        "joined_at": "2024-01-01T10:00:00.123456",
+        "joined_at_ts": datetime(2024, 1, 1, 10, 0, 0, 123000),
+    })
+    repository = make_repository(monkeypatch, LeagueJoinRepository, session)
+    asyncio.run(repository.update_join_status("league-1", "user-1", "active"))
+    update = session.executed[1]
+    assert update.query.split()[0] == "UPDATE"
+    assert update.params[-4:] == ["league-1", "pending", "user-1", "2024-01-01T10:00:00.123456"]
+
+
+def test_delete_expired_otps_deletes_each_row_by_key(monkeypatch):
+    """Expired rows are deleted by their full primary key"""
+    session = FakeSession({
+        "phone_or_email": "a@example.com",
+        "purpose": "login",
+        "created_at": "2024-01-01T10:00:00.123456",
+    })
+    repository = make_repository(monkeypatch, OTPRepository, session)
+    assert asyncio.run(repository.delete_expired_otps()) == 1
+    delete = session.executed[1]
+    assert delete.query.split()[0] == "DELETE"
+    assert delete.params == ("a@example.com", "login", "2024-01-01T10:00:00.123456")
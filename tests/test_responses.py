@@ -0,0 +1,87 @@
+import asyncio
+import json
+import uuid
+from datetime import datetime
+from typing import List
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from starlette.responses import StreamingResponse
+from app.core.config import settings
+from app.core.responses import TrustedResponse, get_json_encoder, rows_response, serialize_rows
+from app.schemas.league_join import LeagueJoinResponse
+from app.schemas.user import UserResponse
+
+
+def user_row(index: int) -> dict:
+    return {
+        "id": f"user-{index}",
+        "mobile_no": f"98765{index:05d}",
+        "email": None,
+        "full_name": "Test User",
+        "state": "KA",
+        "referral_code": None,
+        "referred_by": None,
+        "profile_data": "{}",
+        "language_code": "en",
+        "language_name": "English",
+        "region_code": None,
+        "timezone": "Asia/Kolkata",
+        "user_preferences": None,
+        "status": "active",
+        "created_at": datetime(2024, 1, 2, 3, 4, 5, 678000),
+        "updated_at": datetime(2024, 1, 2, 3, 4, 5),
+    }
+
+
+def test_rows_serialize_like_the_model():
+    """Trusted serialization produces the same bytes as validating into models"""
+    rows = [user_row(index) for index in range(3)]
+    expected = TypeAdapter(List[UserResponse]).dump_json([UserResponse(**row) for row in rows])
+    assert serialize_rows(UserResponse, rows) == expected
+    assert serialize_rows(UserResponse, rows[0]) == UserResponse(**rows[0]).model_dump_json().encode()
+
+
+def test_uuid_and_undeclared_columns():
+    """UUIDs render as strings and columns outside the schema are dropped"""
+    join_id = uuid.uuid4()
+    row = {
+        "league_id": "league-1",
+        "status": "active",
+        "user_id": "user-1",
+        "invite_code": None,
+        "role": "member",
+        "extra_data": None,
+        "id": join_id,
+        "joined_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+        "status_id": None,
+        "internal_column": "hidden",
+    }
+    body = json.loads(TrustedResponse(LeagueJoinResponse, [row]).body)
+    assert body[0]["id"] == str(join_id)
+    assert "internal_column" not in body[0]
+
+
+def test_encoders_match_jsonable_encoder():
+    """orjson and stdlib backends render datetimes and UUIDs like jsonable_encoder"""
+    content = {"at": datetime(2024, 1, 2, 3, 4, 5, 6), "id": uuid.UUID(int=1), "n": [1, 2.5, None]}
+    expected = json.dumps(jsonable_encoder(content), separators=(",", ":")).encode()
+    assert get_json_encoder("orjson")(content) == expected
+    assert get_json_encoder("json")(content) == expected
+
+
+def test_large_lists_stream_in_chunks(monkeypatch):
+    """Lists over the threshold are sent chunked and still form one JSON array"""
+    monkeypatch.setattr(settings, "JSON_STREAM_MIN_ROWS", 4)
+    monkeypatch.setattr(settings, "JSON_STREAM_CHUNK_ROWS", 2)
+    rows = [user_row(index) for index in range(5)]
+    response = rows_response(UserResponse, rows)
+    assert isinstance(response, StreamingResponse)
+
+    async def collect():
+        return [chunk async for chunk in response.body_iterator]
+
+    chunks = asyncio.run(collect())
+    assert len(chunks) == 5
+    assert b"".join(chunks) == serialize_rows(UserResponse, rows)
+    assert isinstance(rows_response(UserResponse, rows[:4]), TrustedResponse)
@@ -0,0 +1,33 @@
+import uvicorn
+from app.core import server
+from app.core.config import settings
+
+
+def test_production_options(monkeypatch):
+    """Production runs several workers on uvloop/httptools with jittered recycling and no reload"""
+    monkeypatch.setattr(settings, "WORKERS", None)
+    monkeypatch.setattr(settings, "RELOAD", True)
+    monkeypatch.setattr(server, "available_cpus", lambda: 6)
+    options = server.uvicorn_options(production=True)
+    assert options["workers"] == 6
+    assert (options["loop"], options["http"]) == ("uvloop", "httptools")
+    assert options["reload"] is False
+    assert options["limit_max_requests_jitter"] == settings.LIMIT_MAX_REQUESTS_JITTER
+    # Every option is one uvicorn understands
+    uvicorn.Config(server.APP, **options)
+
+
+def test_reload_only_in_development(monkeypatch):
+    """RELOAD is ignored outside the development environment"""
+    monkeypatch.setattr(settings, "RELOAD", True)
+    monkeypatch.setattr(settings, "ENVIRONMENT", "staging")
+    assert server.uvicorn_options(production=False)["reload"] is False
+    monkeypatch.setattr(settings, "ENVIRONMENT", "development")
+    assert server.uvicorn_options(production=False)["reload"] is True
+
+
+def test_workers_setting_overrides_cpu_count(monkeypatch):
+    """WORKERS pins the worker count"""
+    monkeypatch.setattr(settings, "WORKERS", 3)
+    assert server.worker_count() == 3
+    assert server.available_cpus() >= 1
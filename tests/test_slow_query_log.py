@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from app.core.config import settings
+from app.core.slow_query_log import SlowQueryLog, param_shapes
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_param_shapes_hide_values():
+    """Bound parameters are described by type and length only"""
+    assert param_shapes(("9876543210", 5, None)) == ["str[10]", "int", "NoneType"]
+
+
+def test_records_over_threshold(monkeypatch):
+    """Only statements at or over the threshold are logged"""
+    monkeypatch.setattr(settings, "SLOW_QUERY_LOG_ENABLED", True)
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD_MS", 50.0)
+    log = SlowQueryLog(capacity=10)
+
+    assert not log.is_slow(10.0)
+    assert log.is_slow(75.0)
+    entry = log.record("users.get_user_by_id", "SELECT *\n  FROM users WHERE id = ?", ("abc",), 75.0, "LOCAL_ONE")
+    assert entry["statement"] == "SELECT * FROM users WHERE id = ?"
+    assert entry["param_shapes"] == ["str[3]"]
+    assert log.recent() == [entry]
+
+
+def test_admin_endpoint_requires_token(monkeypatch):
+    """Admin endpoints are hidden without a configured token and reject bad tokens"""
+    assert client.get("/api/v1/admin/slow-queries").status_code == 404
+
+    monkeypatch.setattr(settings, "ADMIN_API_TOKEN", "secret")
+    assert client.get("/api/v1/admin/slow-queries", headers={"X-Admin-Token": "wrong"}).status_code == 401
+    response = client.get("/api/v1/admin/slow-queries", headers={"X-Admin-Token": "secret"})
+    assert response.status_code == 200
+    assert "records" in response.json()
@@ -0,0 +1,16 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+from app.core.startup_benchmark import DEFERRED_MODULES
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_import_is_lazy(tmp_path):
+    """Importing the app loads no deferred modules and opens no log files"""
+    probe = f"import sys, app.main; print(','.join(name for name in {DEFERRED_MODULES!r} if name in sys.modules))"
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run([sys.executable, "-c", probe], cwd=tmp_path, env=env, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+    assert not (tmp_path / "logs").exists()
@@ -0,0 +1,19 @@
+from app.core.system_sampler import SystemSampler
+
+
+def test_trends_over_buffered_samples():
+    """Trends summarise the ring buffer, which keeps only the newest samples"""
+    sampler = SystemSampler(history=3)
+    for index in range(4):
+        sample = sampler.collect()
+        sample["process"]["rss"] = 100 * (index + 1)
+        sample["loop_lag_max_ms"] = float(index)
+        sampler._samples.append(sample)
+
+    assert len(sampler.samples()) == 3
+    assert sampler.latest()["process"]["rss"] == 400
+    trends = sampler.trends()
+    assert trends["rss"]["min"] == 200
+    assert trends["rss"]["change"] == 200
+    assert trends["loop_lag_max_ms"]["max"] == 3.0
+    assert trends["samples"] == 3
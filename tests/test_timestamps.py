@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+from app.core import timestamp_migration, timestamps
+from app.core.timestamps import (
+    resolve_row_timestamps,
+    timestamp_write_values,
+    to_timestamp,
+)
+
+
+def test_to_timestamp_normalizes_to_naive_utc_milliseconds():
+    """Test that ISO strings and aware datetimes become naive UTC at ms precision"""
+    aware = datetime(2024, 1, 1, 12, 0, 0, 123456, tzinfo=timezone(timedelta(hours=2)))
+    assert to_timestamp(aware) == datetime(2024, 1, 1, 10, 0, 0, 123000)
+    assert to_timestamp("2024-01-01T10:00:00.123456") == datetime(2024, 1, 1, 10, 0, 0, 123000)
+    assert to_timestamp(None) is None
+
+
+def test_write_values_follow_phase(monkeypatch):
+    """Test dual writes and that key TEXT columns survive the typed phase"""
+    now = datetime(2024, 1, 1, 10, 0, 0)
+    monkeypatch.setattr(timestamps.settings, "TIMESTAMP_MIGRATION_PHASE", "dual_write")
+    assert timestamp_write_values("games", {"updated_at": now}) == {
+        "updated_at_ts": now,
+        "updated_at": "2024-01-01T10:00:00",
+    }
+
+    monkeypatch.setattr(timestamps.settings, "TIMESTAMP_MIGRATION_PHASE", "typed")
+    assert timestamp_write_values("games", {"updated_at": now}) == {"updated_at_ts": now}
+    assert timestamp_write_values("otp_store", {"created_at": now}) == {
+        "created_at_ts": now,
+        "created_at": "2024-01-01T10:00:00",
+    }
+
+
+def test_resolve_prefers_typed_column_with_text_fallback(monkeypatch):
+    """Test reads use typed values and parse TEXT only for rows not yet backfilled"""
+    monkeypatch.setattr(timestamps.settings, "TIMESTAMP_MIGRATION_PHASE", "read_typed")
+    typed = datetime(2024, 1, 2)
+    row = resolve_row_timestamps("contests", {
+        "contest_starttime": "2024-01-01T00:00:00",
+        "contest_starttime_ts": typed,
+        "contest_endtime": "2024-01-03T00:00:00",
+        "contest_endtime_ts": None,
+    })
+    assert row == {
+        "contest_starttime": typed,
+        "contest_endtime": datetime(2024, 1, 3),
+    }
+
+
+def test_resolve_keeps_stored_key_text(monkeypatch):
+    """Test key columns are returned as stored, microseconds included, in every phase"""
+    for phase in ("dual_write", "read_typed", "typed"):
+        monkeypatch.setattr(timestamps.settings, "TIMESTAMP_MIGRATION_PHASE", phase)
+        row = resolve_row_timestamps("otp_store", {
+            "created_at": "2024-01-01T10:00:00.123456",
+            "created_at_ts": datetime(2024, 1, 1, 10, 0, 0, 123000),
+            "expires_at": "2024-01-01T10:05:00",
+            "expires_at_ts": None,
+        })
+        assert row == {"created_at": "2024-01-01T10:00:00.123456", "expires_at": datetime(2024, 1, 1, 10, 5)}
+
+
+def test_backfill_is_conditional_on_the_scanned_row(monkeypatch):
+    """Test backfill writes only apply while the typed copy is null and the TEXT values are unchanged"""
+    rows = [
+        {"phone_or_email": "a", "purpose": "login", "created_at": "2024-01-01T10:00:00.123456",
+         "expires_at": "2024-01-01T10:05:00", "created_at_ts": None, "expires_at_ts": None},
+        {"phone_or_email": "b", "purpose": "login", "created_at": "2024-01-01T11:00:00",
+         "expires_at": "2024-01-01T11:05:00", "created_at_ts": None, "expires_at_ts": None},
+    ]
+    monkeypatch.setattr(timestamp_migration, "scan_table", lambda *args, **kwargs: iter(rows))
+
+    class FakeSession:
+        def __init__(self):
+            self.executed = []
+
+        def prepare(self, query):
+            return query
+
+        def execute(self, query, values):
+            self.executed.append((query, values))
+            # The second row changed or was deleted after the scan
+            return type("Result", (), {"was_applied": values[2] == "a"})()
+
+    session = FakeSession()
+    stats = timestamp_migration.backfill_table(session, "otp_store")
+    query, values = session.executed[0]
+    assert query.endswith("IF created_at_ts = null AND expires_at_ts = null AND expires_at = ?")
+    assert values == [
+        datetime(2024, 1, 1, 10, 0, 0, 123000), datetime(2024, 1, 1, 10, 5),
+        "a", "login", "2024-01-01T10:00:00.123456", "2024-01-01T10:05:00",
+    ]
+    assert stats == {"scanned": 2, "updated": 1, "skipped": 1, "unparseable": 0}
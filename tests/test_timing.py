@@ -0,0 +1,34 @@
+from fastapi.testclient import TestClient
+from app.main import app
+
+client = TestClient(app)
+
+
+def test_server_timing_breakdown():
+    """Responses carry a Server-Timing split into db, serialize and app time"""
+    response = client.get("/api/v1/health/detailed")
+    assert response.status_code == 200
+    parts = dict(part.split(";dur=") for part in response.headers["server-timing"].split(", "))
+    assert set(parts) == {"db", "serialize", "app", "total"}
+    assert float(parts["db"]) == 0.0
+    assert float(parts["total"]) >= float(parts["serialize"]) + float(parts["app"]) - 0.01
+    assert float(response.headers["x-process-time"]) > 0
+
+
+def test_rows_encoded_in_the_endpoint_count_as_serialize():
+    """rows_response encodes before the endpoint returns; that time is still serialize, not app"""
+    from app.core.responses import serialize_rows
+    from app.core.timing import reset_request_timings, server_timing_header, start_request_timings
+    from app.schemas.user import UserResponse
+    from tests.test_responses import user_row
+
+    timings, token = start_request_timings()
+    try:
+        serialize_rows(UserResponse, [user_row(index) for index in range(200)])
+    finally:
+        reset_request_timings(token)
+    assert timings.serialize_ns > 0
+    timings.endpoint_done_ns = timings.started_ns + timings.serialize_ns
+    header = server_timing_header(timings, timings.endpoint_done_ns + 1_000_000)
+    parts = dict(part.split(";dur=") for part in header.split(", "))
+    assert float(parts["serialize"]) >= 1.0 + timings.serialize_ns / 1_000_000 - 0.001
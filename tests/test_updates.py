@@ -0,0 +1,163 @@
+import asyncio
+import time
+from datetime import datetime
+import pytest
+from cassandra import ConsistencyLevel
+import app.repositories.base as repository_base
+from app.core.database import cassandra_manager
+from app.repositories.user_repository import UserRepository
+from app.schemas.user import UserUpdate
+from app.services.game_service import GameService
+from app.services.user_service import UserService
+from tests.test_responses import user_row
+
+
+async def fake_execute_async(session, statement, **kwargs):
+    return session.execute(statement, **kwargs)
+
+
+class FakeResult(list):
+    def __init__(self, rows=(), applied=True):
+        super().__init__(rows)
+        self.was_applied = applied
+
+    def one(self):
+        return self[0] if self else None
+
+
+class FakeStatement:
+    def __init__(self, query, params):
+        self.query = query
+        self.params = params
+
+
+class FakeSession:
+    def __init__(self, row, applied=True):
+        self.row = row
+        self.applied = applied
+        self.executed = []
+
+    def execute(self, statement, **kwargs):
+        self.executed.append(statement)
+        if statement.query.startswith("SELECT"):
+            return FakeResult([dict(self.row)])
+        return FakeResult(applied=self.applied)
+
+    def get_execution_profile(self, profile):
+        return type("Profile", (), {"consistency_level": 1})()
+
+
+def game_row() -> dict:
+    return {
+        "id": "game-1",
+        "name": "Chess",
+        "description": None,
+        "category": "board",
+        "icon": None,
+        "banner": None,
+        "min_players": 2,
+        "max_players": 2,
+        "difficulty": "hard",
+        "rating": 4.5,
+        "is_active": True,
+        "is_featured": False,
+        "tags": [],
+        "metadata": {},
+        "created_at": datetime(2024, 1, 1),
+        "updated_at": datetime(2024, 1, 1),
+    }
+
+
+def make_service(monkeypatch, session) -> GameService:
+    class FakePrepared:
+        def __init__(self, query):
+            self.query = query
+
+        def bind(self, params):
+            return FakeStatement(self.query, params)
+
+    monkeypatch.setattr(repository_base, "get_cassandra_session", lambda: session)
+    monkeypatch.setattr(cassandra_manager, "prepare", FakePrepared)
+    monkeypatch.setattr(repository_base, "execute_async", fake_execute_async)
+    return GameService()
+
+
+def test_toggle_is_one_read_and_one_write(monkeypatch):
+    """The response is the row read merged with the patch; nothing is re-read"""
+    session = FakeSession(game_row())
+    game = asyncio.run(make_service(monkeypatch, session).toggle_game_status("game-1"))
+    assert [statement.query.split()[0] for statement in session.executed] == ["SELECT", "UPDATE"]
+    assert game.is_active is False
+    assert game.name == "Chess"
+    assert game.updated_at > datetime(2024, 1, 1)
+
+
+def test_update_is_stamped_with_the_read_time(monkeypatch):
+    """A plain write timestamped at the read, so a later delete still wins"""
+    session = FakeSession(game_row())
+    before = time.time_ns() // 1000
+    asyncio.run(make_service(monkeypatch, session).toggle_featured_status("game-1"))
+    update = session.executed[1]
+    assert update.query.startswith("UPDATE games USING TIMESTAMP ? SET ")
+    assert " IF " not in update.query
+    assert before <= update.params[0] <= time.time_ns() // 1000
+
+
+class FakeUserSession(FakeSession):
+    """Users plus the mobile/email lookup tables, each value owned by one user"""
+
+    def __init__(self, row, owners):
+        super().__init__(row)
+        self.owners = owners
+
+    def execute(self, statement, **kwargs):
+        verb, query = statement.query.split()[0], statement.query
+        if "users_by_" not in query:
+            return super().execute(statement, **kwargs)
+        self.executed.append(statement)
+        if verb == "SELECT":
+            owner = self.owners.get(statement.params[0])
+            return FakeResult([{"user_id": owner}] if owner else [])
+        if verb == "INSERT" and "IF NOT EXISTS" in query:
+            owner = self.owners.setdefault(statement.params[0], statement.params[1])
+            applied = owner == statement.params[1]
+            return FakeResult([] if applied else [{"user_id": owner}], applied=applied)
+        if self.owners.get(statement.params[0]) == statement.params[1]:
+            del self.owners[statement.params[0]]
+        return FakeResult()
+
+
+def make_user_service(monkeypatch, session) -> UserService:
+    make_service(monkeypatch, session)
+    return UserService()
+
+
+def test_user_update_claims_the_new_email_without_scanning(monkeypatch):
+    """A changed email is claimed in its lookup table and the old one released"""
+    row = {**user_row(1), "email": "old@example.com"}
+    session = FakeUserSession(row, {"old@example.com": "user-1"})
+    user = asyncio.run(make_user_service(monkeypatch, session).update_user(
+        "user-1", UserUpdate(email="new@example.com", full_name="Renamed")
+    ))
+    assert user.email == "new@example.com"
+    assert session.owners == {"new@example.com": "user-1"}
+    assert [statement.query.split()[0] for statement in session.executed] == ["SELECT", "INSERT", "UPDATE", "DELETE"]
+    assert not any("ALLOW FILTERING" in statement.query for statement in session.executed)
+
+
+def test_user_update_to_a_taken_email_writes_nothing(monkeypatch):
+    """An email owned by another user is refused before the user row is written"""
+    session = FakeUserSession(user_row(1), {"taken@example.com": "user-2"})
+    with pytest.raises(ValueError, match="Email already registered"):
+        asyncio.run(make_user_service(monkeypatch, session).update_user("user-1", UserUpdate(email="taken@example.com")))
+    assert "UPDATE" not in [statement.query.split()[0] for statement in session.executed]
+    assert session.owners == {"taken@example.com": "user-2"}
+
+def test_lookup_reads_run_under_the_public_operation(monkeypatch):
+    """Both reads behind get_user_by_mobile take its consistency policy entry"""
+    session = FakeUserSession(user_row(1), {user_row(1)["mobile_no"]: "user-1"})
+    make_service(monkeypatch, session)
+    user = asyncio.run(UserRepository().get_user_by_mobile(user_row(1)["mobile_no"]))
+    assert user["id"] == "user-1"
+    assert len(session.executed) == 2
+    assert all(statement.consistency_level == ConsistencyLevel.LOCAL_QUORUM for statement in session.executed)